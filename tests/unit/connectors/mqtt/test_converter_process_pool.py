@@ -0,0 +1,124 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import logging
+import pickle
+from threading import Event
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from thingsboard_gateway.connectors.mqtt.converter_process_pool import ConverterProcessPool, pack_converted_data, \
+    unpack_converted_data
+from thingsboard_gateway.connectors.mqtt.json_mqtt_uplink_converter import JsonMqttUplinkConverter
+from thingsboard_gateway.connectors.mqtt.mqtt_connector import MqttConnector
+from thingsboard_gateway.gateway.constants import CONVERTED_TS_PARAMETER
+
+MAPPING = {
+    "topicFilter": "sensor/+/data",
+    "reportStrategy": {"type": "ON_REPORT_PERIOD", "reportPeriod": 5000},
+    "converter": {
+        "type": "json",
+        "deviceInfo": {
+            "deviceNameExpressionSource": "message",
+            "deviceNameExpression": "${serialNumber}",
+            "deviceProfileExpressionSource": "constant",
+            "deviceProfileExpression": "thermometer"
+        },
+        "attributes": [{"type": "string", "key": "model", "value": "${sensorModel}"}],
+        "timeseries": [
+            {"type": "double", "key": "temperature", "value": "${temp}"},
+            {"type": "double", "key": "humidity", "value": "${hum}",
+             "reportStrategy": {"type": "ON_CHANGE"}}
+        ]
+    }
+}
+
+PAYLOAD = {"serialNumber": "SN-001", "sensorModel": "T1000", "temp": 42.5, "hum": 65}
+
+
+class ConverterProcessPoolTests(TestCase):
+    def setUp(self):
+        self.converter = JsonMqttUplinkConverter(MAPPING, logging.getLogger("converter"))
+
+    def test_packed_converted_data_keeps_keys_and_report_strategies(self):
+        converted_data = self.converter.convert("sensor/SN-001/data", PAYLOAD)
+
+        unpacked_data = unpack_converted_data(pickle.loads(pickle.dumps(pack_converted_data(converted_data))))
+
+        self.assertEqual(unpacked_data, converted_data)
+        self.assertEqual(unpacked_data.device_type, "thermometer")
+        self.assertEqual(unpacked_data.metadata, converted_data.metadata)
+        self.assertEqual(unpacked_data.telemetry_datapoints_count, 2)
+        self.assertEqual(set(unpacked_data.telemetry[0].values), set(converted_data.telemetry[0].values))
+        self.assertEqual({key: key.report_strategy for key in unpacked_data.telemetry[0].values},
+                         {key: key.report_strategy for key in converted_data.telemetry[0].values})
+        self.assertEqual(set(unpacked_data.attributes), set(converted_data.attributes))
+
+    def test_messages_are_converted_in_worker_process(self):
+        converted = []
+        all_converted = Event()
+
+        def send_result(topic, data):
+            converted.append((topic, data))
+            if len(converted) == 3:
+                all_converted.set()
+
+        pool = ConverterProcessPool("mqtt", 1, send_result, logging.getLogger("mqtt.tests"))
+        try:
+            pool.start([(self.converter, "JsonMqttUplinkConverter", MAPPING)])
+            for index in range(3):
+                self.assertTrue(pool.put(self.converter, "sensor/SN-00%i/data" % index,
+                                         {**PAYLOAD, "serialNumber": "SN-00%i" % index}))
+            self.assertFalse(pool.put(object(), "sensor/SN-001/data", PAYLOAD))
+
+            self.assertTrue(all_converted.wait(60))
+        finally:
+            pool.stop()
+
+        self.assertEqual(sorted(data.device_name for _, data in converted), ["SN-000", "SN-001", "SN-002"])
+        for topic, data in converted:
+            self.assertEqual(topic, "sensor/%s/data" % data.device_name)
+            self.assertEqual(data.telemetry_datapoints_count, 2)
+            self.assertIn(CONVERTED_TS_PARAMETER, data.metadata)
+
+    def test_shared_converter_is_started_once(self):
+        connector = MqttConnector.__new__(MqttConnector)
+        connector.get_name = MagicMock(return_value="MQTT")
+        connector._connector_type = "mqtt"
+        connector._client = MagicMock()
+        connector._client.subscribe.return_value = (0, 1)
+        connector._MqttConnector__log = logging.getLogger("mqtt.tests")
+        connector._MqttConnector__converter_log = logging.getLogger("converter")
+        connector._MqttConnector__broker = {"host": "localhost"}
+        connector._MqttConnector__subscribes_sent = {}
+        connector._MqttConnector__shared_custom_converters = {}
+        connector._MqttConnector__mapping = [
+            {"topicFilter": "sensor/%i/data" % index,
+             "converter": {"type": "custom", "extension": "CustomConverter", "sharedGlobal": True}}
+            for index in range(3)]
+        for request_type in ("connect", "disconnect", "attribute"):
+            setattr(connector, "_MqttConnector__%s_requests" % request_type, [])
+            setattr(connector, "_MqttConnector__%s_requests_sub_topics" % request_type, {})
+        connector._MqttConnector__build_topic_trie = MagicMock()
+        connector._MqttConnector__setup_rpc_response_subscriptions = MagicMock()
+        connector._MqttConnector__converter_process_pool = MagicMock()
+
+        with patch("thingsboard_gateway.connectors.mqtt.mqtt_connector.TBModuleLoader.import_module",
+                   return_value=lambda config, logger: MagicMock()) as import_module:
+            connector._on_connect(connector._client, None, None, 0)
+
+        import_module.assert_called_once()
+        process_pool_converters = connector._MqttConnector__converter_process_pool.start.call_args[0][0]
+        self.assertEqual(len(process_pool_converters), 1)
+        self.assertEqual(process_pool_converters[0][1], "CustomConverter")
@@ -0,0 +1,95 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from queue import Queue
+from threading import Thread
+from time import sleep
+from unittest.mock import MagicMock, patch
+
+from paho.mqtt.client import MQTTMessage
+
+from tests.unit.connectors.mqtt.mqtt_base_test import MqttBaseTest
+from thingsboard_gateway.connectors.mqtt.topic_trie import TopicTrie
+from thingsboard_gateway.tb_utility.tb_utility import TBUtility
+
+
+class JsonConverter:
+    pass
+
+
+class BytesConverter:
+    SUPPORTS_BYTES_PAYLOAD = True
+
+
+class OnMessageDispatchTests(MqttBaseTest):
+    def setUp(self):
+        super().setUp()
+        Thread.__init__(self.connector, name='Test MQTT Connector')
+        self.connector._on_message_queues = [Queue() for _ in range(4)]
+
+    @staticmethod
+    def create_message(topic, payload):
+        message = MQTTMessage(topic=topic.encode('utf-8'))
+        message.payload = payload
+        return message
+
+    def test_messages_of_topic_are_dispatched_by_one_thread_in_order(self):
+        for index in range(50):
+            for topic in ('sensor/SN-001/data', 'sensor/SN-002/data', 'sensor/SN-003/data'):
+                self.connector._on_message(None, None, self.create_message(topic, b'%i' % index))
+
+        dispatched_topics = set()
+        for on_message_queue in self.connector._on_message_queues:
+            payloads_by_topic = {}
+            while not on_message_queue.empty():
+                _, _, message = on_message_queue.get_nowait()
+                payloads_by_topic.setdefault(message.topic, []).append(int(message.payload))
+            for topic, payloads in payloads_by_topic.items():
+                self.assertNotIn(topic, dispatched_topics)
+                dispatched_topics.add(topic)
+                self.assertEqual(payloads, list(range(50)))
+
+        self.assertEqual(dispatched_topics, {'sensor/SN-001/data', 'sensor/SN-002/data', 'sensor/SN-003/data'})
+
+    def test_payload_is_decoded_once_for_all_converters(self):
+        json_converters = [JsonConverter(), JsonConverter()]
+        bytes_converter = BytesConverter()
+        self.connector._MqttConnector__mapping_sub_topics = {
+            'sensor/[^/]+/data': json_converters[:1] + [bytes_converter],
+            'sensor/.+': json_converters[1:]
+        }
+        topic_trie = TopicTrie()
+        for regex_topic in self.connector._MqttConnector__mapping_sub_topics:
+            topic_trie.add(regex_topic, self.connector.MAPPING_HANDLERS)
+        self.connector._MqttConnector__topic_trie = topic_trie
+        self.connector.statistics = {'MessagesReceived': 0}
+        self.connector.put_data_to_convert = MagicMock(return_value=True)
+        self.connector._MqttConnector__stopped = False
+        self.connector.QUEUE_GET_TIMEOUT = .1
+
+        on_message_queue = self.connector._on_message_queues[0]
+        on_message_queue.put((None, None, self.create_message('sensor/SN-001/data', b'{"temperature": 42}')))
+        with patch.object(TBUtility, 'decode', wraps=TBUtility.decode) as decode:
+            dispatcher = Thread(target=self.connector._process_on_message, args=(on_message_queue,), daemon=True)
+            dispatcher.start()
+            while self.connector.put_data_to_convert.call_count < 3:
+                sleep(.01)
+            self.connector._MqttConnector__stopped = True
+            dispatcher.join()
+
+        self.assertEqual(decode.call_count, 1)
+        contents = {id(call.args[0]): call.args[2] for call in self.connector.put_data_to_convert.call_args_list}
+        self.assertEqual(contents[id(bytes_converter)], b'{"temperature": 42}')
+        self.assertEqual(contents[id(json_converters[0])], {"temperature": 42})
+        self.assertIs(contents[id(json_converters[0])], contents[id(json_converters[1])])
@@ -0,0 +1,140 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from itertools import count
+from os import path
+from queue import Queue
+from threading import Thread
+from time import sleep, time
+
+from paho.mqtt.client import MQTTMessage
+
+from tests.unit.connectors.mqtt.mqtt_base_test import MqttBaseTest
+from thingsboard_gateway.connectors.mqtt.pending_rpc_requests import PendingRpcRequests
+from thingsboard_gateway.connectors.mqtt.topic_trie import TopicTrie
+
+
+class ServerSideRpcTests(MqttBaseTest):
+    def setUp(self):
+        super().setUp()
+        Thread.__init__(self.connector, name='Test MQTT Connector')
+        config = self.convert_json(path.join(self.CONFIG_PATH, 'server_side_rpc', 'new_config.json'))
+        self.connector._MqttConnector__server_side_rpc = config['requestsMapping']['serverSideRpc']
+        self.connector._MqttConnector__subscribes_sent = {}
+        message_ids = count(1)
+        self.connector._client.subscribe.side_effect = lambda topic, qos: (0, next(message_ids))
+        self.connector._MqttConnector__pending_rpc_requests = PendingRpcRequests()
+        self.connector._MqttConnector__setup_rpc_response_subscriptions()
+        self.connector._MqttConnector__topic_trie = TopicTrie()
+        self.connector.statistics = {'MessagesReceived': 0}
+        self.connector._MqttConnector__stopped = False
+        self.connector.QUEUE_GET_TIMEOUT = .1
+        self.on_message_queue = Queue()
+        self.dispatcher = Thread(target=self.connector._process_on_message, args=(self.on_message_queue,),
+                                 daemon=True)
+        self.dispatcher.start()
+
+    def tearDown(self):
+        self.connector._MqttConnector__stopped = True
+        self.dispatcher.join()
+        super().tearDown()
+
+    @staticmethod
+    def create_rpc_request(request_id, method='echo'):
+        return {'device': 'SN-001', 'data': {'id': request_id, 'method': method, 'params': {'value': request_id}}}
+
+    def receive_message(self, topic, payload):
+        message = MQTTMessage(topic=topic.encode('utf-8'))
+        message.payload = payload
+        self.on_message_queue.put((None, None, message))
+
+    def wait_for_rpc_replies(self, count, timeout=10):
+        send_rpc_reply = self.connector._MqttConnector__gateway.send_rpc_reply
+        deadline = time() + timeout
+        while send_rpc_reply.call_count < count and time() < deadline:
+            sleep(.01)
+        return send_rpc_reply.call_args_list
+
+    def acknowledge_response_subscription(self, reason_code):
+        subscription_id = next(iter(self.connector._MqttConnector__subscribes_sent))
+        self.connector._on_subscribe(None, None, subscription_id, [reason_code])
+
+    def test_response_topics_are_subscribed_once_with_wildcards(self):
+        self.connector._client.subscribe.assert_called_once_with('sensor/+/response/+/+', 1)
+        self.acknowledge_response_subscription(1)
+
+        for request_id in range(5):
+            self.connector.server_side_rpc_handler(self.create_rpc_request(request_id))
+
+        self.connector._client.subscribe.assert_called_once()
+        self.assertEqual(len(self.connector._MqttConnector__pending_rpc_requests), 5)
+        self.assertEqual([call.args[0] for call in self.connector._publish.call_args_list],
+                         ['sensor/SN-001/request/echo/%i' % request_id for request_id in range(5)])
+
+    def test_responses_are_correlated_with_requests(self):
+        for request_id in range(3):
+            self.connector.server_side_rpc_handler(self.create_rpc_request(request_id))
+
+        for request_id in (2, 0, 1):
+            self.receive_message('sensor/SN-001/response/echo/%i' % request_id, b'{"result": %i}' % request_id)
+        self.receive_message('sensor/SN-001/response/echo/7', b'{"result": 7}')
+
+        replies = self.wait_for_rpc_replies(3)
+        self.assertEqual([call.args for call in replies],
+                         [('SN-001', request_id, {'result': request_id}) for request_id in (2, 0, 1)])
+        self.assertEqual(len(self.connector._MqttConnector__pending_rpc_requests), 0)
+
+    def test_response_topic_not_matching_wildcard_is_subscribed_exactly(self):
+        self.connector.server_side_rpc_handler({'device': 'floor1/dev42',
+                                                'data': {'id': 1, 'method': 'echo', 'params': {'value': 1}}})
+
+        self.connector._client.subscribe.assert_called_with('sensor/floor1/dev42/response/echo/1', 1)
+        self.receive_message('sensor/floor1/dev42/response/echo/1', b'{"result": 1}')
+        self.assertEqual(self.wait_for_rpc_replies(1)[0].args, ('floor1/dev42', 1, {'result': 1}))
+
+    def test_response_topics_are_subscribed_exactly_until_wildcard_subscription_is_acknowledged(self):
+        self.connector.server_side_rpc_handler(self.create_rpc_request(1))
+        self.connector._client.subscribe.assert_called_with('sensor/SN-001/response/echo/1', 1)
+
+        self.acknowledge_response_subscription(1)
+        self.connector.server_side_rpc_handler(self.create_rpc_request(2))
+
+        self.assertEqual(self.connector._client.subscribe.call_count, 2)
+
+    def test_response_topics_are_subscribed_exactly_when_wildcard_subscription_fails(self):
+        self.acknowledge_response_subscription(128)
+
+        self.connector.server_side_rpc_handler(self.create_rpc_request(1))
+
+        self.connector._client.subscribe.assert_called_with('sensor/SN-001/response/echo/1', 1)
+        self.receive_message('sensor/SN-001/response/echo/1', b'{"result": 1}')
+        self.assertEqual(self.wait_for_rpc_replies(1)[0].args, ('SN-001', 1, {'result': 1}))
+
+    def test_request_without_response_is_cancelled_on_timeout(self):
+        self.connector.server_side_rpc_handler(self.create_rpc_request(1))
+
+        self.assertEqual(self.connector._MqttConnector__pending_rpc_requests.cancel_expired(time() * 1000), 0)
+        self.assertEqual(self.connector._MqttConnector__pending_rpc_requests.cancel_expired(time() * 1000 + 1000), 1)
+
+        replies = self.wait_for_rpc_replies(1)
+        self.assertEqual(replies[0].kwargs, {'device': 'SN-001', 'req_id': 1, 'success_sent': False})
+        self.receive_message('sensor/SN-001/response/echo/1', b'{"result": 1}')
+        self.assertEqual(len(self.wait_for_rpc_replies(2, timeout=.5)), 1)
+
+    def test_one_way_request_is_acknowledged_immediately(self):
+        self.connector.server_side_rpc_handler(self.create_rpc_request(1, method='no-reply'))
+
+        self.connector._publish.assert_called_once()
+        self.assertEqual(len(self.connector._MqttConnector__pending_rpc_requests), 0)
+        self.assertEqual(self.wait_for_rpc_replies(1)[0].kwargs['success_sent'], True)
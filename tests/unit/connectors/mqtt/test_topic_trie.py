@@ -0,0 +1,58 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from random import Random
+from re import fullmatch
+from unittest import TestCase
+
+from thingsboard_gateway.connectors.mqtt.topic_trie import TopicTrie
+from thingsboard_gateway.tb_utility.tb_utility import TBUtility
+
+
+class TestTopicTrie(TestCase):
+    def test_wildcards(self):
+        trie = TopicTrie()
+        trie.add(TBUtility.topic_to_regex("sensor/+/data"), "mapping")
+        trie.add(TBUtility.topic_to_regex("sensor/#"), "mapping")
+        trie.add(TBUtility.topic_to_regex("sensor/connect"), "connectRequests")
+        trie.add(TBUtility.topic_to_regex("$aws/things/+/shadow"), "mapping")
+
+        self.assertEqual(trie.match("sensor/SN-001/data"),
+                         {"mapping": [TBUtility.topic_to_regex("sensor/+/data"), "sensor/.+"]})
+        self.assertEqual(trie.match("sensor/connect"), {"mapping": ["sensor/.+"],
+                                                        "connectRequests": ["sensor/connect"]})
+        self.assertEqual(trie.match("sensor//data"), {"mapping": ["sensor/.+"]})
+        self.assertEqual(trie.match("sensor/"), {})
+        self.assertEqual(trie.match("sensor"), {})
+        self.assertEqual(trie.match("$aws/things/thing1/shadow"), {"mapping": ["\\$aws/things/[^/]+/shadow"]})
+
+    def test_matches_same_handlers_as_fullmatch(self):
+        random = Random(42)
+        levels = ["sensor", "device", "data", "+", "#", "$aws", "a.b", ""]
+        regex_topics = []
+        trie = TopicTrie()
+        for index in range(500):
+            topic_filter = "/".join(random.choice(levels) for _ in range(random.randint(1, 4)))
+            regex_topic = TBUtility.topic_to_regex(topic_filter)
+            if regex_topic in regex_topics:
+                continue
+            regex_topics.append(regex_topic)
+            trie.add(regex_topic, "kind%i" % (index % 3))
+
+        topic_levels = ["sensor", "device", "data", "$aws", "a.b", "axb", "", "SN-001"]
+        for _ in range(2000):
+            topic = "/".join(random.choice(topic_levels) for _ in range(random.randint(1, 5)))
+            matched = [regex_topic for regex_topics in trie.match(topic).values() for regex_topic in regex_topics]
+            expected = [regex_topic for regex_topic in regex_topics if fullmatch(regex_topic, topic)]
+            self.assertEqual(sorted(matched, key=regex_topics.index), expected, topic)
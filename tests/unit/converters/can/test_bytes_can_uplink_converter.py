@@ -203,6 +203,11 @@ class BytesCanUplinkConverterTests(BaseUnitTest):
         tb_data = self._test_eval_int(number, True, "value * value")
         self.assertEqual(tb_data.telemetry[0].to_dict()['values']["var"], number * number)
 
+    def test_strict_eval_allows_attributes_and_comprehensions(self):
+        number = randint(0, 127)
+        tb_data = self._test_eval_int(number, True, "[value + 1 for value in [value]][0] + value.bit_length()")
+        self.assertEqual(tb_data.telemetry[0].to_dict()['values']["var"], number + 1 + number.bit_length())
+
     def test_no_strict_eval(self):
         number = randint(-128, 256)
         tb_data = self._test_eval_int(number, False, "pow(value, 2)")
@@ -267,6 +272,27 @@ class BytesCanUplinkConverterTests(BaseUnitTest):
         self.assertEqual(tb_data.telemetry[0].to_dict()['values']["validVar"], bool_value)
         self.assertIsNone(tb_data.attributes.to_dict().get("invalidVar"))
 
+    def test_datapoint_keys_reused_between_messages(self):
+        configs = {
+            'deviceName': 'Test Device',
+            'deviceType': 'default',
+            'reportStrategy': {'type': 'ON_CHANGE'},
+            'configs': [{
+                "key": "boolVar",
+                "is_ts": True,
+                "type": "bool",
+                "start": 1
+            }]
+        }
+
+        first_data = self.converter.convert(configs, [0, 1, 0, 0, 0])
+        second_data = self.converter.convert(configs, [0, 0, 0, 0, 0])
+
+        first_key = next(iter(first_data.telemetry[0].values))
+        second_key = next(iter(second_data.telemetry[0].values))
+        self.assertIs(first_key, second_key)
+        self.assertEqual(first_key.report_strategy.report_strategy.value, 'ON_CHANGE')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -58,6 +58,57 @@ class JsonMqttUplinkConverterTests(BaseUnitTest):
             self.assertDictEqual(single_data, self._convert_to_dict(item.to_dict().get('telemetry')))
             self.assertDictEqual(single_data, self._convert_to_dict(item.to_dict().get('attributes')))
 
+    def test_array_result_merges_items_with_same_ts(self):
+        topic, config, _ = self._get_device_2_test_data()
+        config["converter"]["attributes"] = []
+        config["converter"]["timeseries"] = [{"type": "int", "key": "${key}", "value": "${value}"}]
+        array_data = [{"DeviceName": self.DEVICE_NAME, "DeviceType": self.DEVICE_TYPE,
+                       "key": "key_%d" % (index % 3), "value": index, "ts": 1000 + index // 3}
+                      for index in range(9)]
+        converter = JsonMqttUplinkConverter(config, logger=self.log)
+
+        converted_array_data = converter.convert(topic, array_data)
+
+        self.assertEqual(len(converted_array_data), 1)
+        converted_data = converted_array_data[0]
+        self.assertEqual(converted_data.telemetry_datapoints_count, 9)
+        self.assertListEqual(converted_data.to_dict()[TELEMETRY_PARAMETER], [
+            {"ts": 1000, "values": {"key_0": 0, "key_1": 1, "key_2": 2}},
+            {"ts": 1001, "values": {"key_0": 3, "key_1": 4, "key_2": 5}},
+            {"ts": 1002, "values": {"key_0": 6, "key_1": 7, "key_2": 8}}
+        ])
+
+    def test_value_types_and_keys(self):
+        topic, config, _ = self._get_device_2_test_data()
+        config["converter"]["attributes"] = [
+            {"type": "string", "key": "model", "value": "${model}"},
+            {"type": "string", "key": "firmware", "value": "v${firmware}"},
+            {"type": "bool", "key": "active", "value": "${active}"},
+            {"type": "string", "key": "None", "value": "${model}"},
+            {"type": "string", "key": "missing", "value": "${missing}"}
+        ]
+        config["converter"]["timeseries"] = [
+            {"type": "double", "key": "temperature", "value": "${temperature}"},
+            {"type": "int", "key": "humidity", "value": "${humidity}"},
+            {"type": "long", "key": "${counterName}", "value": "${counter.value}"},
+            {"type": "double", "key": "pressure", "value": "${pressure}"},
+            {"type": "integer", "key": "flag", "value": "${active}"}
+        ]
+        data = {"DeviceName": self.DEVICE_NAME, "DeviceType": self.DEVICE_TYPE, "ts": 1000,
+                "model": 42, "firmware": 3, "active": True, "temperature": 21, "humidity": 55.7,
+                "counterName": "packets", "counter": {"value": "17.9"}, "pressure": "high"}
+        converter = JsonMqttUplinkConverter(config, logger=self.log)
+
+        converted_data = converter.convert(topic, data)
+
+        self.assertDictEqual(converted_data.to_dict()[ATTRIBUTES_PARAMETER],
+                             {"model": "42", "firmware": "v3", "active": True})
+        self.assertListEqual(converted_data.to_dict()[TELEMETRY_PARAMETER], [
+            {"ts": 1000, "values": {"temperature": 21.0, "humidity": 55, "packets": 17, "pressure": "high",
+                                    "flag": "True"}}
+        ])
+        self.assertIsInstance(converted_data.to_dict()[TELEMETRY_PARAMETER][0]["values"]["temperature"], float)
+
     def test_parse_device_name_from_spaced_key_name(self):
         device_key_name = "device name"
 
@@ -0,0 +1,115 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from unittest import TestCase
+
+from thingsboard_gateway.gateway.entities.columnar_converted_data import ColumnarConvertedData
+from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
+from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
+from thingsboard_gateway.tb_utility.tb_utility import TBUtility
+
+
+class TestColumnarConvertedData(TestCase):
+    def setUp(self):
+        self.temperature_key = DatapointKey("temperature")
+        self.humidity_key = DatapointKey("humidity")
+
+    def test_to_dict_matches_converted_data(self):
+        converted_data = ConvertedData("Device A", "default")
+        columnar_data = ColumnarConvertedData("Device A", "default")
+        for data in (converted_data, columnar_data):
+            data.add_to_telemetry(TelemetryEntry({self.temperature_key: 21.5, self.humidity_key: 40}, 1000))
+            data.add_to_telemetry({"ts": 2000, "values": {self.temperature_key: 22.5}})
+            data.add_to_telemetry([TelemetryEntry({self.humidity_key: 41}, 1000)])
+            data.add_to_attributes(DatapointKey("model"), "TH-1")
+
+        self.assertDictEqual(converted_data.to_dict(), columnar_data.to_dict())
+        self.assertEqual(columnar_data.telemetry_datapoints_count, 4)
+        self.assertEqual([entry.to_dict() for entry in columnar_data.telemetry],
+                         [entry.to_dict() for entry in converted_data.telemetry])
+        # The telemetry is built from the columns, so it is given out as a read-only view
+        self.assertIsInstance(columnar_data.telemetry, tuple)
+
+    def test_extend_remaps_key_table(self):
+        first_data = ColumnarConvertedData("Device A")
+        first_data.add_telemetry_datapoint(self.temperature_key, 21.5, 1000)
+
+        second_data = ColumnarConvertedData("Device A")
+        second_data.add_telemetry_datapoint(self.humidity_key, 40, 1000)
+        second_data.add_telemetry_datapoint(self.temperature_key, 22.5, 2000)
+
+        first_data.extend(second_data)
+
+        self.assertEqual(first_data.to_dict()["telemetry"], [
+            {"ts": 1000, "values": {"temperature": 21.5, "humidity": 40}},
+            {"ts": 2000, "values": {"temperature": 22.5}}
+        ])
+        self.assertEqual(first_data.telemetry_datapoints_count, 3)
+
+    def test_extend_with_converted_data(self):
+        columnar_data = ColumnarConvertedData("Device A")
+        converted_data = ConvertedData("Device A")
+        converted_data.add_to_telemetry(TelemetryEntry({self.temperature_key: 21.5}, 1000))
+        converted_data.add_to_attributes(DatapointKey("model"), "TH-1")
+
+        columnar_data.extend(converted_data)
+
+        self.assertDictEqual(columnar_data.to_dict(), converted_data.to_dict())
+
+    def test_split_to_maximal_size(self):
+        columnar_data = ColumnarConvertedData("Device A")
+        for ts in range(100):
+            for key_index in range(10):
+                columnar_data.add_telemetry_datapoint(DatapointKey("key_%d" % key_index), ts * 1.5, 1000 + ts)
+
+        max_data_size = 1000
+        split_data = columnar_data.convert_to_objects_with_maximal_size(max_data_size)
+
+        self.assertGreater(len(split_data), 1)
+        self.assertEqual(sum(data.telemetry_datapoints_count for data in split_data), 1000)
+        for data in split_data:
+            self.assertLessEqual(TBUtility.get_data_size(data.to_dict()), max_data_size)
+
+        merged_data = ColumnarConvertedData("Device A")
+        for data in split_data:
+            merged_data.extend(data)
+        self.assertDictEqual(merged_data.to_dict(), columnar_data.to_dict())
+
+    def test_not_integer_timestamps_are_kept(self):
+        converted_data = ConvertedData("Device A")
+        columnar_data = ColumnarConvertedData("Device A")
+        for data in (converted_data, columnar_data):
+            data.add_to_telemetry(TelemetryEntry({self.temperature_key: 21.5}, 1000))
+            data.add_to_telemetry(TelemetryEntry({self.temperature_key: 22.5}, 1000.25))
+
+        other_data = ColumnarConvertedData("Device A")
+        other_data.add_telemetry_datapoint(self.humidity_key, 40, 1000)
+        other_data.extend(columnar_data)
+
+        self.assertDictEqual(columnar_data.to_dict(), converted_data.to_dict())
+        self.assertEqual([entry['ts'] for entry in other_data.to_dict()['telemetry']], [1000, 1000.25])
+
+    def test_telemetry_can_be_assigned_from_other_data(self):
+        columnar_data = ColumnarConvertedData("Device A")
+        columnar_data.add_telemetry_datapoint(self.temperature_key, 21.5, 1000)
+        columnar_data.add_telemetry_datapoint(self.temperature_key, 22.5, 2000)
+
+        copied_data = ColumnarConvertedData("Device A")
+        copied_data.telemetry = columnar_data.telemetry
+        converted_data = ConvertedData("Device A")
+        converted_data.add_to_telemetry(entry for entry in columnar_data.telemetry)
+
+        self.assertDictEqual(copied_data.to_dict(), columnar_data.to_dict())
+        self.assertDictEqual(converted_data.to_dict(), columnar_data.to_dict())
@@ -0,0 +1,108 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from random import Random
+from threading import Event
+from time import monotonic
+from unittest import TestCase
+
+from thingsboard_gateway.gateway.entities.converted_data import ConvertedData, split_large_entries
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
+from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
+from thingsboard_gateway.tb_utility.tb_handler import TBRemoteLoggerHandler
+from thingsboard_gateway.tb_utility.tb_utility import TBUtility
+
+
+class TestDataSize(TestCase):
+    def setUp(self):
+        self.random = Random(42)
+
+    def random_string(self):
+        alphabet = 'abcXYZ019 _-.:/"\\\n\t\x01żółć€😀'
+        return ''.join(self.random.choice(alphabet) for _ in range(self.random.randint(0, 12)))
+
+    def random_value(self, depth=0):
+        value_type = self.random.randint(0, 8 if depth < 2 else 6)
+        if value_type == 0:
+            return None
+        if value_type == 1:
+            return self.random.choice((True, False))
+        if value_type == 2:
+            return self.random.randint(-2 ** 63, 2 ** 63 - 1) // 10 ** self.random.randint(0, 18)
+        if value_type == 3:
+            return self.random.choice((0.1, -0.0, 1e16, 1e-7, float('nan'), float('inf'),
+                                       self.random.uniform(-1e6, 1e6)))
+        if value_type in (4, 5, 6):
+            return self.random_string()
+        if value_type == 7:
+            return [self.random_value(depth + 1) for _ in range(self.random.randint(0, 3))]
+        return {self.random_string(): self.random_value(depth + 1) for _ in range(self.random.randint(0, 3))}
+
+    def test_split_chunks_fit_into_max_size(self):
+        entries = {DatapointKey(self.random_string() + str(index)): self.random_value() for index in range(300)}
+        for _, chunk_size in split_large_entries(entries, 500, 500):
+            self.assertLessEqual(chunk_size, 500)
+
+    def test_telemetry_entry_size(self):
+        values = {DatapointKey("key%d" % index): self.random_value() for index in range(20)}
+        telemetry_entry = TelemetryEntry(values, ts=1762770912123)
+
+        self.assertEqual(telemetry_entry.data_size, TBUtility.get_data_size(telemetry_entry.to_dict()))
+
+    def test_converted_data_split_by_max_size(self):
+        converted_data = ConvertedData("Device", "default")
+        for ts in range(1762770912000, 1762770912010):
+            converted_data.add_to_telemetry(TelemetryEntry(
+                {DatapointKey("key%d" % index): self.random_string() for index in range(50)}, ts=ts))
+
+        for converted_object in converted_data.convert_to_objects_with_maximal_size(1000):
+            self.assertLessEqual(converted_object.get_size(), 1000)
+
+    def test_remote_logs_batches_fit_into_max_size(self):
+        gateway = _LogsReceivingGateway(max_payload_size=1000)
+        handler = TBRemoteLoggerHandler(gateway)
+        logs = [{"ts": 1762770912123 + index, "values": {"SERVICE_LOGS": self.random_string() * 5}}
+                for index in range(200)]
+        for log_msg in logs:
+            handler._logs_queue.put(log_msg)
+        gateway.connected = True
+
+        deadline = monotonic() + 10
+        while sum(len(batch) for batch in gateway.sent_batches) < len(logs) and monotonic() < deadline:
+            gateway.stop_event.wait(.01)
+        gateway.stopped = True
+        handler.deactivate()
+
+        self.assertEqual([log_msg for batch in gateway.sent_batches for log_msg in batch], logs)
+        for batch in gateway.sent_batches:
+            self.assertLessEqual(TBUtility.get_data_size(batch), 1000)
+
+
+class _LogsReceivingGateway:
+    def __init__(self, max_payload_size):
+        self.tb_client = self
+        self.connected = False
+        self.stopped = False
+        self.stop_event = Event()
+        self.sent_batches = []
+        self.__max_payload_size = max_payload_size
+
+    def is_connected(self):
+        return self.connected
+
+    def get_max_payload_size_bytes(self):
+        return self.__max_payload_size
+
+    def send_telemetry(self, logs):
+        self.sent_batches.append(logs)
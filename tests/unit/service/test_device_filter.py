@@ -0,0 +1,93 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import re
+from os import path
+from random import Random
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import simplejson
+
+from thingsboard_gateway.gateway.device_filter import DeviceFilter
+
+
+def validate_device_with_config(config, connector_name, device_name):
+    for device in config['deny'].get(connector_name, []):
+        if re.fullmatch(device, device_name):
+            return False
+    return True
+
+
+class TestDeviceFilter(TestCase):
+    CONFIG = {
+        "deny": {
+            "MQTT Broker Connector": [
+                "Temperature Device",
+                "(^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\\.[a-zA-Z0-9-.]+$)",
+                "(?P<prefix>ab)c\\d*",
+                "(x+)-\\1",
+                "Device 1."
+            ],
+            "Modbus Connector": ["My Modbus Device", "(?P<prefix>mb).*", "(?P<prefix>slave) \\d+"]
+        },
+        "allow": {
+            "MQTT Broker Connector": ["My Temperature Sensor", "Temperature Device"]
+        }
+    }
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.config_path = path.join(self.directory.name, "list.json")
+        self.write_config(self.CONFIG)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_config(self, config):
+        with open(self.config_path, "w") as file:
+            simplejson.dump(config, file)
+
+    def test_decisions_match_regex_fullmatch(self):
+        device_filter = DeviceFilter(self.config_path)
+        random = Random(42)
+        device_names = ["Temperature Device", "Temperature Device ", "My Temperature Sensor", "user@mail.com",
+                        "abc", "abc123", "abcd", "xx-xx", "xx-x", "Device 10", "Device 1", "My Modbus Device",
+                        "mb", "mbus", "slave 1", "slave", "Other"]
+        device_names += [''.join(random.choice("abcx1-@. DTMmsl") for _ in range(random.randint(0, 8)))
+                         for _ in range(2000)]
+
+        for _ in range(2):
+            for connector_name in ("MQTT Broker Connector", "Modbus Connector", "OPC-UA Connector"):
+                for device_name in device_names:
+                    self.assertEqual(device_filter.validate_device(connector_name, {"deviceName": device_name}),
+                                     validate_device_with_config(self.CONFIG, connector_name, device_name),
+                                     (connector_name, device_name))
+
+    def test_new_filter_does_not_use_cached_decisions(self):
+        # The remote configuration creates a new filter, when the filtering settings change
+        device_filter = DeviceFilter(self.config_path)
+        self.assertTrue(device_filter.validate_device("Modbus Connector", {"deviceName": "Slave Device"}))
+
+        self.write_config({"deny": {"Modbus Connector": ["Slave.*"]}, "allow": {}})
+        device_filter = DeviceFilter(self.config_path)
+
+        self.assertFalse(device_filter.validate_device("Modbus Connector", {"deviceName": "Slave Device"}))
+
+    def test_invalid_pattern_is_ignored(self):
+        self.write_config({"deny": {"Modbus Connector": ["Slave(", "Device \\d"]}, "allow": {}})
+        device_filter = DeviceFilter(self.config_path)
+
+        self.assertFalse(device_filter.validate_device("Modbus Connector", {"deviceName": "Device 1"}))
+        self.assertTrue(device_filter.validate_device("Modbus Connector", {"deviceName": "Slave("}))
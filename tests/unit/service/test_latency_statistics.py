@@ -0,0 +1,91 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from random import Random
+from unittest import TestCase
+
+from thingsboard_gateway.gateway.constants import LATENCY_TIMESTAMPS_PARAMETER
+from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.gateway.statistics.decorators import CollectStatistics
+from thingsboard_gateway.gateway.statistics.latency_statistics import LatencyHistogram, LatencyStatistics, \
+    ACK_STAGE, CONVERTER_STAGE, PUBLISH_STAGE, STORAGE_FILL_STAGE, TOTAL_STAGE
+
+
+class TestLatencyStatistics(TestCase):
+    def setUp(self):
+        LatencyStatistics.configure({"enable": True, "samplingInterval": 1})
+        LatencyStatistics.get_statistics(reset=True)
+
+    def tearDown(self):
+        LatencyStatistics.configure(None)
+        LatencyStatistics.get_statistics(reset=True)
+
+    def test_histogram_relative_error(self):
+        random = Random(42)
+        for value in [0, 1, 31, 32, 33, 1000, 2 ** 20 + 1] + [random.randint(0, 10 ** 9) for _ in range(1000)]:
+            upper_value = LatencyHistogram.get_bucket_upper_value(LatencyHistogram.get_bucket_index(value))
+            self.assertGreaterEqual(upper_value, value)
+            self.assertLessEqual(upper_value - value, value / LatencyHistogram.SUB_BUCKETS_COUNT)
+
+    def test_histogram_percentiles(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 10001):
+            histogram.record(value)
+
+        self.assertAlmostEqual(histogram.get_percentile(50), 5000, delta=5000 / 16)
+        self.assertAlmostEqual(histogram.get_percentile(99), 9900, delta=9900 / 16)
+        self.assertEqual(histogram.to_dict()["count"], 10000)
+        self.assertEqual(histogram.to_dict()["max"], 10)
+
+    def test_sampling_interval(self):
+        LatencyStatistics.configure({"enable": True, "samplingInterval": 10})
+        sampled = [LatencyStatistics.start({}, "Connector") for _ in range(100)]
+
+        self.assertEqual(sum(latency_timestamps is not None for latency_timestamps in sampled), 10)
+
+    def test_disabled_statistics_do_not_touch_metadata(self):
+        LatencyStatistics.configure({"enable": False})
+        metadata = {}
+
+        self.assertIsNone(LatencyStatistics.start(metadata, "Connector"))
+        self.assertEqual(metadata, {})
+
+    def test_stages_are_recorded_per_connector(self):
+        metadata = {}
+        latency_timestamps = LatencyStatistics.start(metadata, "Connector")
+        first_ts = latency_timestamps["firstTs"]
+
+        LatencyStatistics.checkpoint(latency_timestamps, STORAGE_FILL_STAGE, current_ts=first_ts + 1500)
+        LatencyStatistics.checkpoint(latency_timestamps, PUBLISH_STAGE, current_ts=first_ts + 2000)
+        LatencyStatistics.checkpoint(latency_timestamps, ACK_STAGE, current_ts=first_ts + 12000)
+        statistics = LatencyStatistics.get_statistics(reset=True)
+
+        self.assertIs(metadata[LATENCY_TIMESTAMPS_PARAMETER], latency_timestamps)
+        self.assertEqual(statistics["Connector"][STORAGE_FILL_STAGE]["p50"], 1.5)
+        self.assertEqual(statistics["Connector"][PUBLISH_STAGE]["max"], .5)
+        self.assertEqual(statistics["Connector"][ACK_STAGE]["avg"], 10)
+        self.assertEqual(statistics["Connector"][TOTAL_STAGE]["max"], 12)
+        self.assertEqual(LatencyStatistics.get_statistics(), {})
+
+    def test_converter_stage_is_measured_by_decorator(self):
+        class Converter:
+            @CollectStatistics(start_stat_type='receivedBytesFromDevices',
+                               end_stat_type='convertedBytesFromDevice')
+            def convert(self, config, data):
+                return ConvertedData("Device", "default")
+
+        converted_data = Converter().convert({}, b'data')
+        LatencyStatistics.start(converted_data.metadata, "Connector")
+
+        self.assertEqual(LatencyStatistics.get_statistics()["Connector"][CONVERTER_STAGE]["count"], 1)
@@ -0,0 +1,110 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from logging import getLogger
+from unittest import TestCase
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+from thingsboard_gateway.gateway.statistics.latency_statistics import LatencyStatistics, ACK_STAGE
+from thingsboard_gateway.gateway.statistics.metrics_endpoint import MetricsEndpoint, OPENMETRICS_CONTENT_TYPE
+from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
+
+
+class TestMetricsEndpoint(TestCase):
+    def setUp(self):
+        StatisticsService.enable_statistics()
+        StatisticsService.clear_statistics()
+        LatencyStatistics.configure({"enable": True, "samplingInterval": 1})
+        LatencyStatistics.get_statistics(reset=True)
+        self.gateway = _MetricsSourceGateway()
+        self.endpoint = MetricsEndpoint({"enable": True, "port": 0}, self.gateway, getLogger("service"))
+
+    def tearDown(self):
+        self.endpoint.stop()
+        StatisticsService.clear_statistics()
+        StatisticsService.disable_statistics()
+        LatencyStatistics.configure(None)
+        LatencyStatistics.get_statistics(reset=True)
+
+    def scrape(self, path="/metrics"):
+        with urlopen("http://127.0.0.1:%i%s" % (self.endpoint.port, path), timeout=5) as response:
+            return response.headers["Content-Type"], response.read().decode("utf-8")
+
+    def test_scrape_returns_gateway_internals(self):
+        sent_messages_count = StatisticsService.get_total_counters().get('msgsSentToPlatform', 0) + 3
+        StatisticsService.add_count('msgsSentToPlatform', 3)
+        StatisticsService.count_connector_message('MQTT Broker "1"', 'connectorMsgsReceived')
+        StatisticsService.count_connector_bytes('MQTT Broker "1"', b'12345', 'connectorBytesReceived')
+        latency_timestamps = LatencyStatistics.start({}, 'MQTT Broker "1"')
+        LatencyStatistics.checkpoint(latency_timestamps, ACK_STAGE,
+                                     current_ts=latency_timestamps["lastTs"] + 20000)
+
+        content_type, metrics = self.scrape()
+        lines = metrics.splitlines()
+
+        self.assertEqual(content_type, OPENMETRICS_CONTENT_TYPE)
+        self.assertEqual(lines[-1], "# EOF")
+        self.assertIn('tb_gateway_queue_size{queue="convertedData"} 7', lines)
+        self.assertIn('tb_gateway_rpc_requests_in_progress 2', lines)
+        self.assertIn('tb_gateway_storage_events{storage="MemoryEventStorage"} 120', lines)
+        self.assertIn('tb_gateway_report_strategy_cache_size 42', lines)
+        self.assertIn('# TYPE tb_gateway_msgs_sent_to_platform counter', lines)
+        self.assertIn('tb_gateway_msgs_sent_to_platform_total %i' % sent_messages_count, lines)
+        self.assertIn('tb_gateway_connector_msgs_received_total{connector="MQTT Broker \\"1\\""} 1', lines)
+        self.assertIn('tb_gateway_connector_bytes_received_total{connector="MQTT Broker \\"1\\""} 5', lines)
+        self.assertIn('tb_gateway_stage_latency_seconds{connector="MQTT Broker \\"1\\"",stage="ack",quantile="0.99"} '
+                      '0.02', lines)
+
+    def test_counters_are_not_reset_by_statistics_reports(self):
+        sent_messages_count = StatisticsService.get_total_counters().get('msgsSentToPlatform', 0) + 5
+        StatisticsService.add_count('msgsSentToPlatform', 3)
+        StatisticsService.clear_statistics(StatisticsService.aggregate_statistics())
+        StatisticsService.add_count('msgsSentToPlatform', 2)
+
+        self.assertIn('tb_gateway_msgs_sent_to_platform_total %i' % sent_messages_count, self.scrape()[1].splitlines())
+
+    def test_unknown_path(self):
+        with self.assertRaises(HTTPError) as error:
+            self.scrape("/unknown")
+
+        self.assertEqual(error.exception.code, 404)
+
+
+class _MetricsSourceGateway:
+    def __init__(self):
+        self.report_strategy_service = self
+
+    @staticmethod
+    def get_internal_queues_sizes():
+        return {'convertedData': 7, 'publishedEvents': 0, 'rpcToDevices': 1, 'rpcProcessing': 0}
+
+    @staticmethod
+    def get_rpc_requests_in_progress_count():
+        return 2
+
+    @staticmethod
+    def get_storage_name():
+        return "MemoryEventStorage"
+
+    @staticmethod
+    def get_storage_events_count():
+        return 120
+
+    def get_report_strategy_service(self):
+        return self.report_strategy_service
+
+    @staticmethod
+    def get_data_cache_size():
+        return 42
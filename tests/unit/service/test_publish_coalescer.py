@@ -0,0 +1,91 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import zlib
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+import simplejson
+
+from thingsboard_gateway.gateway.publish_coalescer import PublishCoalescer, ATTRIBUTES_DATA_TYPE, \
+    TELEMETRY_DATA_TYPE
+from thingsboard_gateway.gateway.tb_client import TBClient, tb_device_mqtt
+
+
+def create_devices_data(devices_count, entries_count=2):
+    return {'Device %i' % device: {
+        TELEMETRY_DATA_TYPE: [{'ts': 1700000000000 + entry, 'values': {'temperature': 20.5 + entry, 'humidity': 60}}
+                              for entry in range(entries_count)],
+        ATTRIBUTES_DATA_TYPE: {'model': 'T1000', 'firmware': '1.%i' % device}
+    } for device in range(devices_count)}
+
+
+class TestPublishCoalescer(TestCase):
+    def merge_payloads(self, payloads, decompress=None):
+        merged = {TELEMETRY_DATA_TYPE: {}, ATTRIBUTES_DATA_TYPE: {}}
+        for payload in payloads:
+            raw_payload = decompress(payload.payload) if decompress else payload.payload
+            self.assertEqual(len(raw_payload), payload.raw_size)
+            message = simplejson.loads(raw_payload)
+            self.assertEqual(len(message), payload.devices_count)
+            self.assertFalse(merged[payload.data_type].keys() & message.keys())
+            merged[payload.data_type].update(message)
+        return {device: {data_type: merged[data_type][device] for data_type in merged}
+                for device in merged[TELEMETRY_DATA_TYPE]}
+
+    def test_devices_data_is_coalesced_into_messages_of_limited_size(self):
+        devices_data = create_devices_data(100)
+
+        payloads, oversized_devices_data = PublishCoalescer({}).coalesce(devices_data, 1024)
+
+        self.assertEqual(oversized_devices_data, {})
+        self.assertLess(len(payloads), 25)
+        self.assertTrue(all(len(payload.payload) <= 1024 for payload in payloads))
+        self.assertEqual(self.merge_payloads(payloads), devices_data)
+        self.assertEqual(sum(payload.datapoints for payload in payloads), 100 * (2 * 2 + 2))
+
+    def test_datapoints_limit_and_oversized_device(self):
+        devices_data = create_devices_data(10)
+        devices_data['Big Device'] = {TELEMETRY_DATA_TYPE: [{'ts': 1, 'values': {'key%i' % key: key
+                                                                                  for key in range(50)}}]}
+
+        payloads, oversized_devices_data = PublishCoalescer({}).coalesce(devices_data, 65536, max_datapoints=10)
+
+        self.assertTrue(all(payload.datapoints <= 10 for payload in payloads))
+        self.assertEqual(oversized_devices_data, {'Big Device': devices_data.pop('Big Device')})
+        self.assertEqual(self.merge_payloads(payloads), devices_data)
+
+    def test_compressed_messages_are_published_to_compression_topic(self):
+        devices_data = create_devices_data(100)
+        coalescer = PublishCoalescer({'compression': 'zlib'})
+        payloads, _ = coalescer.coalesce(devices_data, 8196)
+
+        # Broker stand-in receiving the messages published by the client
+        published_messages = []
+        tb_client = TBClient.__new__(TBClient)
+        tb_client.client = MagicMock()
+        tb_client.client._devices_connected_through_gateway_telemetry_messages_rate_limit = \
+            tb_device_mqtt.RateLimit("0:0")
+        tb_client.client._devices_connected_through_gateway_telemetry_datapoints_rate_limit = \
+            tb_device_mqtt.RateLimit("0:0")
+        tb_client.client._client.publish.side_effect = \
+            lambda topic, payload, qos: published_messages.append((topic, payload)) or MagicMock(rc=0)
+        for payload in payloads:
+            tb_client.publish_coalesced(payload, 1, coalescer.compression)
+
+        self.assertEqual({topic for topic, _ in published_messages},
+                         {'v1/gateway/telemetry/zlib', 'v1/gateway/attributes/zlib'})
+        self.assertEqual(self.merge_payloads(payloads, zlib.decompress), devices_data)
+        self.assertLess(sum(len(payload) for _, payload in published_messages),
+                        sum(payload.raw_size for payload in payloads) / 3)
@@ -0,0 +1,144 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from copy import deepcopy
+from queue import Queue
+from threading import Event
+from time import monotonic, sleep
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+import simplejson
+
+from thingsboard_gateway.gateway.publish_coalescer import PublishCoalescer, TELEMETRY_DATA_TYPE
+from thingsboard_gateway.gateway.publish_scheduler import PublishScheduler
+from thingsboard_gateway.gateway.tb_client import TBClient, tb_device_mqtt
+from thingsboard_gateway.gateway.tb_gateway_service import TBGatewayService
+
+
+def create_telemetry(entries_count, keys_count):
+    return {TELEMETRY_DATA_TYPE: [{'ts': 1700000000000 + entry, 'values': {'key%i' % key: entry
+                                                                             for key in range(keys_count)}}
+                                  for entry in range(entries_count)]}
+
+
+class TestPublishScheduler(TestCase):
+    def setUp(self):
+        # Client stand-in, which counts messages published while the rate limits did not allow it
+        self.published_messages = []
+        self.rate_limit_violations = 0
+        self.tb_client = TBClient.__new__(TBClient)
+        self.tb_client.client = MagicMock()
+        messages_rate_limit = tb_device_mqtt.RateLimit("20:1", percentage=100)
+        datapoints_rate_limit = tb_device_mqtt.RateLimit("60:1", percentage=100)
+        self.tb_client.client._devices_connected_through_gateway_telemetry_messages_rate_limit = messages_rate_limit
+        self.tb_client.client._devices_connected_through_gateway_telemetry_datapoints_rate_limit = \
+            datapoints_rate_limit
+
+        def wait_for_rate_limit_released(timeout, message_rate_limit, dp_rate_limit, amount):
+            if message_rate_limit.check_limit_reached() or dp_rate_limit.check_limit_reached(amount):
+                self.rate_limit_violations += 1
+            return False
+
+        self.tb_client.client._wait_for_rate_limit_released.side_effect = wait_for_rate_limit_released
+        self.tb_client.client._client.publish.side_effect = \
+            lambda topic, payload, qos: self.published_messages.append(simplejson.loads(payload)) or MagicMock(rc=0)
+
+    def send(self, scheduler, devices_data, timeout=10):
+        scheduler.add(devices_data)
+        deadline = monotonic() + timeout
+        while not scheduler.is_empty() and monotonic() < deadline:
+            payload = scheduler.poll(self.tb_client, 65536)
+            if payload is None:
+                sleep(scheduler.get_wait_time())
+                continue
+            self.tb_client.publish_coalesced(payload, 1)
+        self.assertTrue(scheduler.is_empty())
+
+    def get_sent_telemetry(self):
+        sent_telemetry = {}
+        for message in self.published_messages:
+            for device_name, telemetry in message.items():
+                sent_telemetry.setdefault(device_name, {TELEMETRY_DATA_TYPE: []})[TELEMETRY_DATA_TYPE].extend(telemetry)
+        return sent_telemetry
+
+    def test_messages_fit_gateway_rate_limits_and_devices_are_interleaved(self):
+        devices_data = {'Chatty Device': create_telemetry(100, 1)}
+        devices_data.update({'Device %i' % device: create_telemetry(1, 2) for device in range(10)})
+
+        self.send(PublishScheduler(PublishCoalescer({}), {}), devices_data)
+
+        self.assertEqual(self.rate_limit_violations, 0)
+        self.assertTrue(all(sum(len(entry['values']) for telemetry in message.values() for entry in telemetry) <= 60
+                            for message in self.published_messages))
+        self.assertEqual(len(self.published_messages[0]), 11)
+        sent_telemetry = self.get_sent_telemetry()
+        self.assertEqual(sent_telemetry['Chatty Device'], devices_data['Chatty Device'])
+        self.assertEqual(sent_telemetry, devices_data)
+
+    def test_device_rate_limits_do_not_delay_other_devices(self):
+        devices_data = {'Chatty Device': create_telemetry(20, 1), 'Quiet Device': create_telemetry(2, 1)}
+        scheduler = PublishScheduler(PublishCoalescer({}), {'deviceDatapointsRateLimit': '10:1'})
+
+        self.assertIsNone(scheduler.poll(self.tb_client, 65536))
+        scheduler.add(devices_data)
+        payload = scheduler.poll(self.tb_client, 65536)
+        self.assertEqual(payload.devices_count, 2)
+        self.assertEqual(payload.datapoints, 12)
+        self.assertIsNone(scheduler.poll(self.tb_client, 65536))
+        self.assertGreater(scheduler.get_wait_time(), 0.05)
+
+        self.tb_client.publish_coalesced(payload, 1)
+        self.send(scheduler, {})
+
+        self.assertEqual(self.rate_limit_violations, 0)
+        self.assertEqual(self.get_sent_telemetry(), devices_data)
+
+    def create_gateway(self):
+        gateway = TBGatewayService.__new__(TBGatewayService)
+        gateway.name = 'Gateway'
+        gateway.stopped = False
+        gateway.stop_event = Event()
+        gateway.tb_client = self.tb_client
+        gateway._published_events = Queue()
+        gateway._TBGatewayService__renamed_devices = {}
+        gateway._TBGatewayService__publish_coalescer = PublishCoalescer({})
+        gateway._TBGatewayService__publish_scheduler_config = {}
+        gateway._TBGatewayService__publish_schedulers = {}
+        gateway._TBGatewayService__scheduled_pack_incomplete = False
+        self.tb_client.client.max_payload_size = 65536
+        self.tb_client._TBClient__uplink_shards = []
+        gateway.quality_of_service = 1
+        return gateway
+
+    def test_pack_interrupted_by_disconnect_is_resent_once(self):
+        devices_data = {'Device %i' % device: create_telemetry(10, 2) for device in range(10)}
+        gateway = self.create_gateway()
+        send_coalesced_data = gateway._TBGatewayService__send_coalesced_data
+
+        # The connection drops after the first message of the pack
+        self.tb_client.is_connected = lambda: not self.published_messages
+        send_coalesced_data(deepcopy(devices_data))
+        self.assertTrue(gateway._TBGatewayService__scheduled_pack_incomplete)
+        self.assertEqual(len(self.published_messages), 1)
+
+        # The pack is read from the storage again after the reconnect
+        self.published_messages.clear()
+        self.tb_client.is_connected = lambda: True
+        gateway._TBGatewayService__scheduled_pack_incomplete = False
+        send_coalesced_data(deepcopy(devices_data))
+
+        self.assertFalse(gateway._TBGatewayService__scheduled_pack_incomplete)
+        self.assertEqual(self.rate_limit_violations, 0)
+        self.assertEqual(self.get_sent_telemetry(), devices_data)
@@ -0,0 +1,119 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from logging import getLogger
+from os import path
+from queue import SimpleQueue
+from tempfile import TemporaryDirectory
+from threading import Event
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from orjson import dumps, loads
+
+from thingsboard_gateway.gateway.constants import REPORT_STRATEGY_DATA_CACHE_FILENAME
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
+from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
+from thingsboard_gateway.gateway.report_strategy.report_strategy_data_cache import ReportStrategyDataCache
+from thingsboard_gateway.gateway.report_strategy.report_strategy_service import ReportStrategyService
+
+LOG = getLogger("TEST")
+
+
+class TestReportStrategyDataCacheSnapshot(TestCase):
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.snapshot_path = path.join(self.temp_dir.name, REPORT_STRATEGY_DATA_CACHE_FILENAME)
+        self.on_change_strategy = ReportStrategyConfig({"type": "ON_CHANGE"})
+        self.periodical_strategy = ReportStrategyConfig({"type": "ON_CHANGE_OR_REPORT_PERIOD", "reportPeriod": 5000})
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_records_are_restored_from_snapshot(self):
+        cache = ReportStrategyDataCache({}, LOG, self.snapshot_path)
+        temperature_key = DatapointKey("temperature")
+        humidity_key = DatapointKey("humidity", self.periodical_strategy)
+        cache.put(temperature_key, 21.5, "Device A", "default", "MQTT", "connector-id",
+                  self.on_change_strategy, True)
+        cache.update_ts(temperature_key, "Device A", "connector-id", 1700000000000)
+        cache.put(humidity_key, 40, "Device A", "default", "MQTT", "connector-id",
+                  self.periodical_strategy, True)
+        cache.update_last_report_time(humidity_key, "Device A", "connector-id", 1000)
+        cache.stop()
+
+        restored_cache = ReportStrategyDataCache({}, LOG, self.snapshot_path)
+        try:
+            temperature_record = restored_cache.get(DatapointKey("temperature"), "Device A", "connector-id")
+            self.assertIsNotNone(temperature_record)
+            self.assertEqual(temperature_record.get_value(), 21.5)
+            self.assertEqual(temperature_record.get_ts(), 1700000000000)
+            self.assertEqual(temperature_record.report_strategy, self.on_change_strategy)
+
+            humidity_record = restored_cache.get(DatapointKey("humidity", self.periodical_strategy),
+                                                 "Device A", "connector-id")
+            self.assertIsNotNone(humidity_record)
+            self.assertEqual(humidity_record.get_value(), 40)
+            self.assertListEqual(restored_cache.pop_restored_keys_to_report_periodically(),
+                                 [(DatapointKey("humidity", self.periodical_strategy), "Device A", "connector-id")])
+            self.assertListEqual(restored_cache.pop_restored_keys_to_report_periodically(), [])
+        finally:
+            restored_cache.stop()
+
+    def test_expired_records_are_not_restored(self):
+        cache = ReportStrategyDataCache({}, LOG, self.snapshot_path)
+        short_ttl_strategy = ReportStrategyConfig({"type": "ON_CHANGE", "ttl": 10})
+        cache.put(DatapointKey("temperature"), 21.5, "Device A", "default", "MQTT", "connector-id",
+                  short_ttl_strategy, True)
+        cache.stop()
+
+        with open(self.snapshot_path, "rb") as snapshot_file:
+            snapshot = loads(snapshot_file.read())
+        snapshot["ts"] -= 60000
+        with open(self.snapshot_path, "wb") as snapshot_file:
+            snapshot_file.write(dumps(snapshot))
+
+        restored_cache = ReportStrategyDataCache({}, LOG, self.snapshot_path)
+        try:
+            self.assertIsNone(restored_cache.get(DatapointKey("temperature"), "Device A", "connector-id"))
+        finally:
+            restored_cache.stop()
+
+    def test_unchanged_value_is_suppressed_after_restart(self):
+        gateway = MagicMock()
+        gateway.stop_event = Event()
+        gateway._config_dir = self.temp_dir.name + path.sep
+        config = {"reportStrategy": {"type": "ON_CHANGE"}, "persistReportStrategyDataCache": True}
+
+        service = ReportStrategyService(config, gateway, SimpleQueue(), LOG)
+        self.assertTrue(service.filter_datapoint_and_cache(DatapointKey("temperature"), (21.5, None),
+                                                           "Device A", "default", "MQTT", "connector-id",
+                                                           service.main_report_strategy, True))
+        service.stop()
+
+        restarted_service = ReportStrategyService(config, gateway, SimpleQueue(), LOG)
+        try:
+            self.assertFalse(restarted_service.filter_datapoint_and_cache(DatapointKey("temperature"), (21.5, None),
+                                                                          "Device A", "default", "MQTT",
+                                                                          "connector-id",
+                                                                          restarted_service.main_report_strategy,
+                                                                          True))
+            self.assertTrue(restarted_service.filter_datapoint_and_cache(DatapointKey("temperature"), (22.5, None),
+                                                                         "Device A", "default", "MQTT",
+                                                                         "connector-id",
+                                                                         restarted_service.main_report_strategy,
+                                                                         True))
+        finally:
+            restarted_service.stop()
+            gateway.stop_event.set()
@@ -0,0 +1,102 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from os import path
+from tempfile import TemporaryDirectory
+from threading import Event, Thread
+from time import sleep
+from unittest import TestCase
+
+from thingsboard_gateway.tb_utility.tb_sampling_profiler import TBSamplingProfiler
+
+
+def _busy_loop_for_profiler(stop_event):
+    while not stop_event.is_set():
+        sum(range(1000))
+
+
+def _wait_with_deep_stack(stop_event, depth):
+    if depth:
+        return _wait_with_deep_stack(stop_event, depth - 1)
+    stop_event.wait()
+
+
+class TestSamplingProfiler(TestCase):
+    def setUp(self):
+        self.stop_event = Event()
+        self.threads = []
+        self.profiler = None
+
+    def tearDown(self):
+        self.stop_event.set()
+        if self.profiler is not None and self.profiler.is_alive():
+            self.profiler.stop()
+            self.profiler.join()
+        for thread in self.threads:
+            thread.join()
+
+    def start_thread(self, name, target, *args):
+        thread = Thread(name=name, target=target, args=(self.stop_event, *args), daemon=True)
+        thread.start()
+        self.threads.append(thread)
+
+    def test_stacks_are_collapsed_per_thread_name(self):
+        self.start_thread("Test Connector Thread", _busy_loop_for_profiler)
+        self.profiler = TBSamplingProfiler({"samplingIntervalMs": 1})
+        self.profiler.start()
+        sleep(.3)
+        self.profiler.stop()
+        self.profiler.join()
+
+        connector_stacks = self.profiler.get_collapsed_stacks("Test Connector Thread").splitlines()
+        self.assertTrue(connector_stacks)
+        for line in connector_stacks:
+            stack, count = line.rsplit(" ", 1)
+            self.assertTrue(stack.startswith("Test Connector Thread;"))
+            self.assertGreater(int(count), 0)
+        self.assertTrue(any("_busy_loop_for_profiler (test_sampling_profiler.py)" in line
+                            for line in connector_stacks))
+        self.assertNotIn("Sampling Profiler", self.profiler.get_thread_samples_count())
+
+    def test_overhead_is_bounded(self):
+        for index in range(50):
+            self.start_thread("Deep Stack Thread %i" % index, _wait_with_deep_stack, 60)
+        self.profiler = TBSamplingProfiler({"samplingIntervalMs": .1, "maxOverheadPercent": 2})
+        self.profiler.start()
+        sleep(1)
+        self.profiler.stop()
+        self.profiler.join()
+
+        self.assertGreater(self.profiler.samples_count, 0)
+        self.assertLess(self.profiler.overhead, .04)
+        self.assertEqual(self.profiler.get_thread_samples_count()["Deep Stack Thread 0"],
+                         self.profiler.samples_count)
+
+    def test_dump_to_file(self):
+        self.start_thread("Test Storage Thread", _wait_with_deep_stack, 3)
+        sleep(.1)
+        self.profiler = TBSamplingProfiler()
+        for _ in range(5):
+            self.profiler.take_sample()
+
+        with TemporaryDirectory() as directory:
+            dump_file = self.profiler.dump(path.join(directory, "profile", "gateway.collapsed"))
+            with open(dump_file) as file:
+                dumped_stacks = file.read()
+
+        self.assertEqual(dumped_stacks, self.profiler.get_collapsed_stacks())
+        storage_stacks = self.profiler.get_collapsed_stacks("Test Storage Thread").splitlines()
+        self.assertEqual(len(storage_stacks), 1)
+        self.assertEqual(storage_stacks[0].count("_wait_with_deep_stack (test_sampling_profiler.py)"), 4)
+        self.assertTrue(storage_stacks[0].endswith(" 5"))
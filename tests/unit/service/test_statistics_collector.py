@@ -0,0 +1,91 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from logging import getLogger
+from threading import Event
+from time import monotonic, sleep
+from unittest import TestCase
+from unittest.mock import patch
+
+from thingsboard_gateway.gateway.statistics.statistics_collector import StatisticsCollector
+
+
+class TestStatisticsCollector(TestCase):
+    def setUp(self):
+        self.collector = StatisticsCollector(getLogger("service"), max_workers=4, name="Test Statistics Collector")
+        self.release_slow_collector = Event()
+        self.calls = {}
+
+    def tearDown(self):
+        self.release_slow_collector.set()
+        self.collector.stop()
+
+    def collect_value(self, attribute):
+        attribute_name = attribute['attributeOnGateway']
+        self.calls[attribute_name] = self.calls.get(attribute_name, 0) + 1
+        if attribute_name == 'slow':
+            self.release_slow_collector.wait(10)
+        elif attribute_name == 'failing':
+            raise RuntimeError("Command failed")
+        return self.calls[attribute_name]
+
+    def test_slow_collector_does_not_block_collection(self):
+        attributes = [{'attributeOnGateway': 'slow'}] + [{'attributeOnGateway': 'fast%i' % index}
+                                                         for index in range(8)]
+
+        started = monotonic()
+        values = self.collector.collect(attributes, self.collect_value, wait_timeout=.5)
+
+        self.assertLess(monotonic() - started, 1)
+        self.assertEqual(values, {'fast%i' % index: 1 for index in range(8)})
+
+        values = self.collector.collect(attributes, self.collect_value, wait_timeout=.5)
+        self.assertNotIn('slow', values)
+        self.assertEqual(self.calls['slow'], 1)
+
+        self.release_slow_collector.set()
+        sleep(.1)
+        self.assertEqual(self.collector.collect(attributes, self.collect_value, default_refresh_period=60)['slow'], 1)
+
+    def test_values_are_cached_for_refresh_period(self):
+        attributes = [{'attributeOnGateway': 'cached', 'refreshPeriodInSeconds': 60},
+                      {'attributeOnGateway': 'refreshed', 'refreshPeriodInSeconds': 0}]
+
+        for _ in range(3):
+            values = self.collector.collect(attributes, self.collect_value, wait_timeout=1)
+
+        self.assertEqual(values, {'cached': 1, 'refreshed': 3})
+
+    def test_value_is_collected_on_every_call_with_default_cadence(self):
+        # Calls of the statistics service: every second by whole seconds of the monotonic clock,
+        # the first one in the middle of a second, the command takes some time
+        clock = [100.7]
+
+        def collect_value(attribute):
+            clock[0] += .3
+            return self.collect_value(attribute)
+
+        with patch('thingsboard_gateway.gateway.statistics.statistics_collector.monotonic', lambda: clock[0]):
+            for call_time in (100.7, 101.0, 102.0, 103.0, 104.0, 105.0):
+                clock[0] = call_time
+                values = self.collector.collect([{'attributeOnGateway': 'command'}], collect_value,
+                                                default_refresh_period=1, wait_timeout=1)
+                self.assertEqual(values, {'command': self.calls['command']})
+
+        self.assertEqual(self.calls['command'], 6)
+
+    def test_failed_collection_is_not_reported(self):
+        values = self.collector.collect([{'attributeOnGateway': 'failing'}], self.collect_value, wait_timeout=1)
+
+        self.assertEqual(values, {})
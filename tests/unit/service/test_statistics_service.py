@@ -0,0 +1,120 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from threading import Event, Thread
+from unittest import TestCase
+
+from thingsboard_gateway.gateway.statistics.decorators import CollectStatistics
+from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
+
+
+class TestStatisticsService(TestCase):
+    THREADS_COUNT = 16
+    INCREMENTS_PER_THREAD = 20000
+
+    def setUp(self):
+        StatisticsService.enable_statistics()
+        StatisticsService.clear_statistics()
+
+    def tearDown(self):
+        StatisticsService.clear_statistics()
+        StatisticsService.disable_statistics()
+
+    def test_counts_from_many_threads_are_exact(self):
+        reported = {'msgsSentToPlatform': 0, 'eventsAdded': 0}
+        reported_connectors = {}
+        stop_reporting = Event()
+
+        def report():
+            totals = StatisticsService.aggregate_statistics()
+            for key in reported:
+                reported[key] += StatisticsService.STATISTICS_STORAGE[key]
+            for connector_name, connector_statistics in StatisticsService.CONNECTOR_STATISTICS_STORAGE.items():
+                for stat_name, count in connector_statistics.items():
+                    reported_connectors[(connector_name, stat_name)] = \
+                        reported_connectors.get((connector_name, stat_name), 0) + count
+            StatisticsService.clear_statistics(totals)
+
+        def count(thread_index):
+            connector_name = 'Connector %d' % (thread_index % 4)
+            for _ in range(self.INCREMENTS_PER_THREAD):
+                StatisticsService.add_count('msgsSentToPlatform')
+                StatisticsService.add_bytes('eventsAdded', 3)
+                StatisticsService.count_connector_message(connector_name, 'connectorMsgsReceived')
+
+        def report_periodically():
+            while not stop_reporting.is_set():
+                report()
+
+        reporting_thread = Thread(target=report_periodically)
+        reporting_thread.start()
+        counting_threads = [Thread(target=count, args=(thread_index,)) for thread_index in range(self.THREADS_COUNT)]
+        for thread in counting_threads:
+            thread.start()
+        for thread in counting_threads:
+            thread.join()
+        stop_reporting.set()
+        reporting_thread.join()
+        report()
+
+        total_increments = self.THREADS_COUNT * self.INCREMENTS_PER_THREAD
+        self.assertEqual(reported, {'msgsSentToPlatform': total_increments, 'eventsAdded': total_increments * 3})
+        self.assertEqual(reported_connectors, {('Connector %d' % connector_index, 'connectorMsgsReceived'):
+                                               total_increments // 4 for connector_index in range(4)})
+
+    def test_clear_statistics(self):
+        StatisticsService.add_count('storageMsgPulled', 5)
+        StatisticsService.count_connector_message('Connector', 'connectorMsgsReceived')
+        StatisticsService.aggregate_statistics()
+
+        self.assertEqual(StatisticsService.STATISTICS_STORAGE['storageMsgPulled'], 5)
+        self.assertEqual(StatisticsService.CONNECTOR_STATISTICS_STORAGE,
+                         {'Connector': {'connectorMsgsReceived': 1}})
+
+        StatisticsService.clear_statistics()
+        StatisticsService.add_count('storageMsgPulled', 2)
+        StatisticsService.aggregate_statistics()
+
+        self.assertEqual(StatisticsService.STATISTICS_STORAGE['storageMsgPulled'], 2)
+        self.assertEqual(StatisticsService.CONNECTOR_STATISTICS_STORAGE, {})
+
+    def test_raw_payload_bytes_count(self):
+        class Message:
+            payload = b'{"temperature": 21.5}'
+
+        self.assertEqual(StatisticsService.get_bytes_count(b'\x01\x02\x03', 'key'), 3)
+        self.assertEqual(StatisticsService.get_bytes_count(bytearray(8), 'key'), 8)
+        self.assertEqual(StatisticsService.get_bytes_count('temperature', 'key'), 11)
+        self.assertEqual(StatisticsService.get_bytes_count('żółw', 'key'), 7)
+        self.assertEqual(StatisticsService.get_bytes_count(Message(), 'key'), 21)
+
+    def test_bytes_count_without_raw_payload_is_sampled(self):
+        messages_count = StatisticsService.BYTES_COUNT_SAMPLING_INTERVAL * 20
+        sampled_messages = [{"value": "x" * (index % 7)} for index in range(messages_count)]
+        total_bytes_count = sum(StatisticsService.get_bytes_count(message, 'sampled')
+                                for message in sampled_messages)
+        exact_bytes_count = sum(len(str(message)) for message in sampled_messages)
+
+        self.assertAlmostEqual(total_bytes_count / exact_bytes_count, 1, delta=.1)
+
+    def test_collect_counts_raw_payload_length(self):
+        StatisticsService.clear_statistics()
+        CollectStatistics.collect('receivedBytesFromDevices', b'12345')
+        StatisticsService.count_connector_bytes('Connector', b'1234', 'connectorBytesReceived')
+        StatisticsService.count_connector_bytes('Connector', None, 'connectorBytesReceived', bytes_count=10)
+        StatisticsService.aggregate_statistics()
+
+        self.assertEqual(StatisticsService.STATISTICS_STORAGE['receivedBytesFromDevices'], 5)
+        self.assertEqual(StatisticsService.CONNECTOR_STATISTICS_STORAGE,
+                         {'Connector': {'connectorBytesReceived': 14}})
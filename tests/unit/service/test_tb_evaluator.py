@@ -0,0 +1,72 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from unittest import TestCase
+
+from thingsboard_gateway.tb_utility.tb_evaluator import TBEvaluator
+from thingsboard_gateway.tb_utility.tb_utility import TBUtility
+
+
+class TestTBEvaluator(TestCase):
+    def test_safe_expressions(self):
+        variables = {"value": 6, "can_data": bytearray([0x01, 0x02, 0x03])}
+        expressions = {
+            "value / 4": 1.5,
+            "value * 10 - 1": 59,
+            "(can_data[0] << 8 | can_data[1]) & 0xFFFF": 0x0102,
+            "~value ^ 0b1": -8,
+            "value if value > 5 else -value": 6,
+            "can_data[1:3]": bytearray([0x02, 0x03]),
+            "value in (1, 6) and not value == 2": True,
+            "round(value / 4, 1) + abs(-1)": 2.5,
+            "bool(value & 0b100)": True
+        }
+        for expression, expected_value in expressions.items():
+            with self.subTest(expression=expression):
+                self.assertEqual(TBEvaluator.compile_safe(expression).evaluate(variables), expected_value)
+
+    def test_unsafe_expressions_are_rejected(self):
+        expressions = ["().__class__.__bases__", "__import__('os')", "open('/etc/passwd')",
+                       "[x for x in value]", "lambda: 1", "value.bit_length()", "exec('1')",
+                       "max(*value)", "dict(**value)"]
+        for expression in expressions:
+            with self.subTest(expression=expression):
+                with self.assertRaises(ValueError):
+                    TBEvaluator.compile_safe(expression).evaluate({"value": [1]})
+
+    def test_too_large_results_are_rejected(self):
+        for expression in ["9 ** 9 ** 9", "pow(9, 10 ** 8)", "1 << 10 ** 9", "'a' * 10 ** 9", "10 ** 9 * [1]"]:
+            with self.subTest(expression=expression):
+                with self.assertRaises(ValueError):
+                    TBEvaluator.compile_safe(expression).evaluate()
+        self.assertEqual(TBEvaluator.compile_safe("2 ** 10 + (1 << 4) + len('ab' * 3)").evaluate(), 1046)
+
+    def test_functions_can_be_disabled(self):
+        with self.assertRaises(ValueError):
+            TBEvaluator.compile_safe("pow(value, 2)", allow_functions=False).evaluate({"value": 2})
+        self.assertEqual(TBEvaluator.compile_safe("value * value", allow_functions=False).evaluate({"value": 2}), 4)
+
+    def test_trusted_expressions_use_given_globals(self):
+        expression = TBEvaluator.compile_trusted("prefix + str(value).upper()", {"prefix": "id-"})
+
+        self.assertEqual(expression.evaluate({"value": "abc"}), "id-ABC")
+
+    def test_expressions_are_not_cached_globally(self):
+        self.assertIsNot(TBEvaluator.compile_safe("value + 1"), TBEvaluator.compile_safe("value + 1"))
+        self.assertFalse(hasattr(TBEvaluator, '_compiled_expressions'))
+
+    def test_convert_data_type_with_eval(self):
+        self.assertEqual(TBUtility.convert_data_type("21.42 + 21.42", "int", use_eval=True), 42)
+        with self.assertRaises(ValueError):
+            TBUtility.convert_data_type("__import__('os').getpid()", "int", use_eval=True)
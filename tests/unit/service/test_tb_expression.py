@@ -0,0 +1,69 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from unittest import TestCase
+
+from thingsboard_gateway.tb_utility.tb_expression import TBExpression
+from thingsboard_gateway.tb_utility.tb_utility import TBUtility
+
+
+class TestTBExpression(TestCase):
+    EXPRESSIONS = ["${temperature}", "T: ${temperature} C", "${sensor.humidity}", "${sensor.inner.value}",
+                   "${sensor.missing}", "${missing}", "constant", "", "${my key}", "${my key.value}",
+                   "${values[0]}", "${values[*]}", "${$.sensor.humidity}", "${nothing}-${sensor.humidity}-${temperature}",
+                   "${}", "${sensor.list.value}", "${empty.value}", "${text.value}", "${dotted.key}", "${sensor.a-b}"]
+    BODIES = [
+        {"temperature": 21.5, "sensor": {"humidity": 40, "inner": {"value": 1}, "list": [1, 2], "a-b": 3},
+         "my key": {"value": 5}, "my": "first word", "values": [{"value": 1}, 2], "empty": None, "text": "abc",
+         "dotted.key": "dotted"},
+        {"temperature": "hot", "sensor": [1, 2]},
+        [{"temperature": 1}],
+        {},
+        '{"temperature": 5, "sensor": {"humidity": 2}}'
+    ]
+
+    @staticmethod
+    def render_with_get_values(expression, body, expression_instead_none):
+        tags = TBUtility.get_values(expression, body, get_tag=True)
+        values = TBUtility.get_values(expression, body, expression_instead_none=expression_instead_none)
+        result = expression
+        for tag, value in zip(tags, values):
+            is_valid_expression = "${" in expression and "}" in expression
+            result = result.replace('${' + str(tag) + '}', str(value)) if is_valid_expression else tag
+        return result
+
+    def test_render_matches_get_values(self):
+        for expression in self.EXPRESSIONS:
+            compiled_expression = TBExpression(expression)
+            for body in self.BODIES:
+                for expression_instead_none in (False, True):
+                    with self.subTest(expression=expression, body=body,
+                                      expression_instead_none=expression_instead_none):
+                        self.assertEqual(compiled_expression.render(body, expression_instead_none),
+                                         self.render_with_get_values(expression, body, expression_instead_none))
+
+    def test_expression_parts(self):
+        expression = TBExpression("Device ${sensor.name} in ${location}")
+
+        self.assertTrue(expression.is_template)
+        self.assertEqual(expression.tags, ("sensor.name", "location"))
+        self.assertEqual(expression.prefix, "Device ")
+        self.assertEqual(expression.suffix, "")
+        self.assertFalse(TBExpression("Device A").is_template)
+
+    def test_compile_all_skips_not_string_expressions(self):
+        expressions = TBExpression.compile_all(("${temperature}", None, 1, "${temperature}", "Device A"))
+
+        self.assertEqual(set(expressions), {"${temperature}", "Device A"})
+        self.assertFalse(hasattr(TBExpression, "_compiled_expressions"))
@@ -4,6 +4,7 @@ from unittest import TestCase, main
 import time
 from dateutil import parser
 
+from thingsboard_gateway.tb_utility.tb_ts_format_resolver import TBTsFormatResolver
 from thingsboard_gateway.tb_utility.tb_utility import TBUtility
 
 
@@ -44,6 +45,42 @@ class TestTSFormatResolver(TestCase):
         timestamp = self.ts_resolver(data=self.data, config=self.config, logger=logging)
         self.assertEqual(timestamp, self.data['ts'])
 
+    def test_inferred_format_matches_dateutil(self):
+        values = ['10.11.25 10:35:12.123', '13.02.25 10:35:12.123', '01.02.03 01:02:03.4', '2025-11-10T10:35:12.123',
+                  '2025-01-02 10:35', '2025-01-13 10:35', '02/01/2025 10:35:12', '25/01/2025 10:35:12',
+                  '2025-01-02T10:35:12+02:00', '99-12-31', '31-12-99']
+        for dayfirst in (False, True):
+            for yearfirst in (False, True):
+                resolver = TBTsFormatResolver('timestampField', dayfirst, yearfirst)
+                for value in values * 2:
+                    with self.subTest(value=value, dayfirst=dayfirst, yearfirst=yearfirst):
+                        expected_ts = int(parser.parse(value, dayfirst=dayfirst, yearfirst=yearfirst).timestamp() * 1000)
+                        self.assertEqual(resolver.to_milliseconds(value), expected_ts)
+
+    def test_format_is_inferred_by_resolver_of_key_config(self):
+        config = {**self.config, 'dayfirst': True}
+        resolver = TBTsFormatResolver.from_config(config)
+        self.ts_resolver(data=self.data, config=config, logger=logging, ts_format_resolver=resolver)
+
+        self.assertEqual(resolver.ts_field_key, 'timestampField')
+        self.assertTrue(resolver.dayfirst)
+        self.assertIsNotNone(resolver.ts_format)
+        self.assertIsNone(TBTsFormatResolver.from_config({}))
+        self.assertFalse(hasattr(TBTsFormatResolver, '_resolvers'))
+
+    def test_convert_epoch_timestamps(self):
+        ts = 1762770912123
+        for value in (ts / 1000, ts, ts * 1000, ts * 1000000):
+            with self.subTest(value=value):
+                self.data['timestampField'] = value
+                self.assertEqual(self.ts_resolver(data=self.data, config=self.config, logger=logging), ts)
+
+    def test_invalid_timestamp_uses_default(self):
+        self.data['timestampField'] = 'not a timestamp'
+        self.data['ts'] = int(time.time() * 1000)
+        self.assertEqual(self.ts_resolver(data=self.data, config=self.config, logger=logging), self.data['ts'])
+        self.assertIsNone(self.ts_resolver(data=self.data, config=self.config, logger=logging, default_ts=False))
+
 
 if __name__ == '__main__':
     main()
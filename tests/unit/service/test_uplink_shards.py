@@ -0,0 +1,195 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import logging
+import socket
+from threading import Lock, Thread, Timer
+from time import monotonic, sleep
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from paho.mqtt.client import MQTTv311
+
+from thingsboard_gateway.gateway.tb_client import TBClient
+from thingsboard_gateway.gateway.uplink_shards import ConsistentHashRing, UplinkShard
+
+
+class AckDelayBroker:
+    """Broker stand-in, which acknowledges every QoS 1 message after ack_delay seconds."""
+
+    def __init__(self, ack_delay):
+        self.ack_delay = ack_delay
+        self.received_messages = []
+        self.__lock = Lock()
+        self.__server = socket.socket()
+        self.__server.bind(('127.0.0.1', 0))
+        self.__server.listen()
+        self.port = self.__server.getsockname()[1]
+        self.__connections = []
+        Thread(target=self.__accept, daemon=True).start()
+
+    def stop(self):
+        self.__server.close()
+        for connection in self.__connections:
+            connection.close()
+
+    def __accept(self):
+        while True:
+            try:
+                connection, _ = self.__server.accept()
+            except OSError:
+                return
+            self.__connections.append(connection)
+            Thread(target=self.__serve, args=(connection,), daemon=True).start()
+
+    @staticmethod
+    def __read(connection, size):
+        data = b''
+        while len(data) < size:
+            chunk = connection.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError
+            data += chunk
+        return data
+
+    def __send(self, connection, packet):
+        with self.__lock:
+            try:
+                connection.sendall(packet)
+            except OSError:
+                pass
+
+    def __serve(self, connection):
+        try:
+            while True:
+                header = self.__read(connection, 1)[0]
+                remaining_length, multiplier = 0, 1
+                while True:
+                    byte = self.__read(connection, 1)[0]
+                    remaining_length += (byte & 127) * multiplier
+                    multiplier *= 128
+                    if not byte & 128:
+                        break
+                body = self.__read(connection, remaining_length)
+                packet_type = header >> 4
+                if packet_type == 1:
+                    self.__send(connection, b'\x20\x03\x00\x00\x00')
+                elif packet_type == 3:
+                    topic_length = int.from_bytes(body[:2], 'big')
+                    packet_id = body[2 + topic_length:4 + topic_length]
+                    with self.__lock:
+                        self.received_messages.append((connection.fileno(), body[2:2 + topic_length].decode()))
+                    Timer(self.ack_delay, self.__send, args=(connection, b'\x40\x02' + packet_id)).start()
+                elif packet_type == 12:
+                    self.__send(connection, b'\xd0\x00')
+                elif packet_type == 14:
+                    return
+        except (ConnectionError, OSError):
+            return
+
+
+class TestUplinkShards(TestCase):
+    def test_devices_are_assigned_to_shards_consistently(self):
+        devices = ['Device %i' % device for device in range(1000)]
+        ring = ConsistentHashRing(4)
+
+        assignment = {device: ring.get_shard(device) for device in devices}
+
+        self.assertEqual(assignment, {device: ConsistentHashRing(4).get_shard(device) for device in devices})
+        for shard in range(4):
+            self.assertGreater(list(assignment.values()).count(shard), 150)
+
+        # Devices of a disconnected shard are moved to other shards, other devices stay in place
+        failover_assignment = {device: ring.get_shard(device, lambda shard: shard != 2) for device in devices}
+        for device in devices:
+            if assignment[device] == 2:
+                self.assertNotEqual(failover_assignment[device], 2)
+            else:
+                self.assertEqual(failover_assignment[device], assignment[device])
+        self.assertIsNone(ring.get_shard('Device', lambda shard: False))
+
+    def publish_through_shards(self, shards_count, messages_count, devices_count=16):
+        broker = AckDelayBroker(ack_delay=.05)
+        shards = [UplinkShard(index, 'gateway_%i' % index, 'token', None, max_inflight_messages=4)
+                  for index in range(shards_count)]
+        try:
+            for shard in shards:
+                shard.start('127.0.0.1', broker.port, keepalive=60)
+            deadline = monotonic() + 5
+            while not all(shard.is_connected() for shard in shards) and monotonic() < deadline:
+                sleep(.01)
+
+            ring = ConsistentHashRing(shards_count)
+            start_time = monotonic()
+            published = []
+            for message in range(messages_count):
+                device = 'Device %i' % (message % devices_count)
+                published.append(shards[ring.get_shard(device)].publish('%s/%i' % (device, message), b'{}', 1))
+            for message_info in published:
+                message_info.wait_for_publish(timeout=10)
+            sent_time = monotonic() - start_time
+
+            self.assertTrue(all(message_info.is_published() for message_info in published))
+            return sent_time, broker.received_messages
+        finally:
+            for shard in shards:
+                shard.stop()
+            broker.stop()
+
+    def test_throughput_scales_with_shards_and_device_order_is_kept(self):
+        single_connection_time, _ = self.publish_through_shards(1, 64)
+        sharded_time, received_messages = self.publish_through_shards(4, 64)
+
+        # Every connection has at most 4 messages waiting for acknowledgement
+        self.assertGreater(single_connection_time, 64 / 4 * .05 * .9)
+        self.assertLess(sharded_time, single_connection_time / 2)
+
+        connections_by_device = {}
+        messages_by_device = {}
+        for connection, topic in received_messages:
+            device, message = topic.split('/')
+            connections_by_device.setdefault(device, set()).add(connection)
+            messages_by_device.setdefault(device, []).append(int(message))
+        self.assertTrue(all(len(connections) == 1 for connections in connections_by_device.values()))
+        self.assertTrue(all(messages == sorted(messages) for messages in messages_by_device.values()))
+        self.assertEqual(sum(len(messages) for messages in messages_by_device.values()), 64)
+
+    @staticmethod
+    def create_tb_client(client_id):
+        tb_client = TBClient.__new__(TBClient)
+        tb_client._TBClient__logger = logging.getLogger('tb_connection')
+        tb_client._TBClient__client_id = client_id
+        tb_client._TBClient__username = 'username'
+        tb_client._TBClient__password = 'password'
+        tb_client._TBClient__uplink_shards = []
+        tb_client._TBClient__uplink_shards_ring = None
+        tb_client.client = MagicMock()
+        tb_client.client._client._max_inflight_messages = 20
+        tb_client.client._client.protocol = MQTTv311
+        tb_client._TBClient__create_uplink_shards({'count': 3})
+        return tb_client
+
+    def test_shards_use_protocol_of_main_connection(self):
+        tb_client = self.create_tb_client('')
+
+        self.assertEqual(tb_client.get_uplink_shards_count(), 3)
+        for uplink_shard in tb_client._TBClient__uplink_shards:
+            self.assertEqual(uplink_shard._UplinkShard__client.protocol, MQTTv311)
+
+    def test_shards_are_disabled_for_basic_credentials_with_client_id(self):
+        with self.assertLogs('tb_connection', level='ERROR'):
+            tb_client = self.create_tb_client('gateway')
+
+        self.assertEqual(tb_client.get_uplink_shards_count(), 1)
+        self.assertEqual(tb_client.get_uplink_shard('Device'), 0)
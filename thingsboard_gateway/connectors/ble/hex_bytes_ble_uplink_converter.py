@@ -7,6 +7,7 @@ from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
 from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
 from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
+from thingsboard_gateway.tb_utility.tb_evaluator import TBEvaluator
 from thingsboard_gateway.tb_utility.tb_utility import TBUtility
 
 
@@ -14,6 +15,15 @@ class HexBytesBLEUplinkConverter(BLEUplinkConverter):
     def __init__(self, config, logger):
         self._log = logger
         self.__config = config
+        self.__compute_expressions = {}
+
+    def __get_compute_expression(self, item):
+        cached_expression = self.__compute_expressions.get(id(item))
+        if cached_expression is not None and cached_expression[0] is item:
+            return cached_expression[1]
+        expression = TBEvaluator.compile_trusted(item['compute'], globals())
+        self.__compute_expressions[id(item)] = (item, expression)
+        return expression
 
     def convert(self, config, data):
         converted_data = ConvertedData(device_name=self.__config['deviceName'],
@@ -49,7 +59,7 @@ class HexBytesBLEUplinkConverter(BLEUplinkConverter):
                                 value += int(data.hex()[int(indexes[0]) * 2], 16)
 
                             if item.get('compute', False):
-                                value = eval(item['compute'], globals(), {'value': value})
+                                value = self.__get_compute_expression(item).evaluate({'value': value})
 
                         if item.get('key') is not None:
                             datapoint_key = TBUtility.convert_key_to_datapoint_key(item['key'], device_report_strategy,
@@ -16,11 +16,16 @@ import struct
 
 from thingsboard_gateway.connectors.can.can_converter import CanConverter
 from thingsboard_gateway.gateway.statistics.decorators import CollectStatistics
+from thingsboard_gateway.tb_utility.tb_evaluator import TBEvaluator
+
+
+STRICT_EVAL_GLOBALS = {"__builtins__": {}}
 
 
 class BytesCanDownlinkConverter(CanConverter):
     def __init__(self, logger):
         self._log = logger
+        self.__expressions = {}
 
     @CollectStatistics(start_stat_type='allReceivedBytesFromTB',
                        end_stat_type='allBytesSentToDevices')
@@ -37,9 +42,7 @@ class BytesCanDownlinkConverter(CanConverter):
                 return list(bytearray.fromhex(data["dataInHex"]))
 
             if config.get("dataExpression", ""):
-                value = eval(config["dataExpression"],
-                             {"__builtins__": {}} if config.get("strictEval", True) else globals(),
-                             data)
+                value = self.__compile_expression(config).evaluate(data)
             elif "value" in data:
                 value = data["value"]
             else:
@@ -71,3 +74,14 @@ class BytesCanDownlinkConverter(CanConverter):
         except Exception as e:
             self._log.error("Failed to convert TB data to CAN payload: %s", str(e))
             return
+
+    def __compile_expression(self, config):
+        cached_expression = self.__expressions.get(id(config))
+        if cached_expression is not None and cached_expression[0] is config:
+            return cached_expression[1]
+
+        # Strict expressions are evaluated without builtins, as eval with empty builtins did
+        expression = TBEvaluator.compile_trusted(config["dataExpression"],
+                                                 STRICT_EVAL_GLOBALS if config.get("strictEval", True) else globals())
+        self.__expressions[id(config)] = (config, expression)
+        return expression
@@ -17,16 +17,23 @@ import struct
 from thingsboard_gateway.connectors.can.can_converter import CanConverter
 from thingsboard_gateway.gateway.constants import REPORT_STRATEGY_PARAMETER
 from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.gateway.entities.datapoint_keys_cache import DatapointKeysCache
 from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
 from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
 from thingsboard_gateway.gateway.statistics.decorators import CollectStatistics
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
-from thingsboard_gateway.tb_utility.tb_utility import TBUtility
+from thingsboard_gateway.tb_utility.tb_evaluator import TBEvaluator
+
+
+STRICT_EVAL_GLOBALS = {"__builtins__": {}}
 
 
 class BytesCanUplinkConverter(CanConverter):
     def __init__(self, logger):
         self._log = logger
+        self.__devices_report_strategies = {}
+        self.__expressions = {}
+        self.__datapoint_keys = DatapointKeysCache(self._log)
 
     @CollectStatistics(start_stat_type='receivedBytesFromDevices',
                        end_stat_type='convertedBytesFromDevice')
@@ -36,11 +43,7 @@ class BytesCanUplinkConverter(CanConverter):
 
         converted_data = ConvertedData(device_name=device_name, device_type=device_type)
 
-        device_report_strategy = None
-        try:
-            device_report_strategy = ReportStrategyConfig(configs.get(REPORT_STRATEGY_PARAMETER))
-        except ValueError as e:
-            self._log.trace("Report strategy config is not specified for device %s: %s", device_name, e)
+        device_report_strategy = self.__get_device_report_strategy(configs)
 
         for config in configs.get('configs', []):
             try:
@@ -72,12 +75,9 @@ class BytesCanUplinkConverter(CanConverter):
                     continue
 
                 if config.get("expression", ""):
-                    value = eval(config["expression"],
-                                                   {"__builtins__": {}} if config["strictEval"] else globals(),
-                                                   {"value": value, "can_data": can_data})
+                    value = self.__compile_expression(config).evaluate({"value": value, "can_data": can_data})
 
-                datapoint_key = TBUtility.convert_key_to_datapoint_key(tb_key, device_report_strategy,
-                                                                       configs, self._log)
+                datapoint_key = self.__datapoint_keys.get(tb_key, device_report_strategy, configs)
                 if tb_item == "attributes":
                     converted_data.add_to_attributes(datapoint_key, value)
                 else:
@@ -95,3 +95,27 @@ class BytesCanUplinkConverter(CanConverter):
                                                   count=converted_data.telemetry_datapoints_count)
 
         return converted_data
+
+    def __compile_expression(self, config):
+        cached_expression = self.__expressions.get(id(config))
+        if cached_expression is not None and cached_expression[0] is config:
+            return cached_expression[1]
+
+        # Strict expressions are evaluated without builtins, as eval with empty builtins did
+        expression = TBEvaluator.compile_trusted(config["expression"],
+                                                 STRICT_EVAL_GLOBALS if config["strictEval"] else globals())
+        self.__expressions[id(config)] = (config, expression)
+        return expression
+
+    def __get_device_report_strategy(self, configs):
+        cached_report_strategy = self.__devices_report_strategies.get(id(configs))
+        if cached_report_strategy is not None and cached_report_strategy[0] is configs:
+            return cached_report_strategy[1]
+
+        device_report_strategy = None
+        try:
+            device_report_strategy = ReportStrategyConfig(configs.get(REPORT_STRATEGY_PARAMETER))
+        except ValueError as e:
+            self._log.trace("Report strategy config is not specified for device %s: %s", configs.get("deviceName"), e)
+        self.__devices_report_strategies[id(configs)] = (configs, device_report_strategy)
+        return device_report_strategy
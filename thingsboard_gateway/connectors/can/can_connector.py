@@ -285,7 +285,7 @@ class CanConnector(Connector, Thread):
                         # log.debug("[%s] New CAN message received %s", self.get_name(), message)
                         StatisticsService.count_connector_message(self.name,
                                                                   stat_parameter_name='connectorMsgsReceived')
-                        StatisticsService.count_connector_bytes(self.name, message,
+                        StatisticsService.count_connector_bytes(self.name, message.data,
                                                                 stat_parameter_name='connectorBytesReceived')
                         self.__process_message(message)
                     self.__check_if_error_happened()
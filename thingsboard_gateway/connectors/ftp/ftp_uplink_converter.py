@@ -23,6 +23,8 @@ from thingsboard_gateway.gateway.entities.report_strategy_config import ReportSt
 from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
 from thingsboard_gateway.gateway.statistics.decorators import CollectStatistics
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
+from thingsboard_gateway.tb_utility.tb_expression import TBExpression
+from thingsboard_gateway.tb_utility.tb_ts_format_resolver import TBTsFormatResolver
 from thingsboard_gateway.tb_utility.tb_utility import TBUtility
 
 
@@ -31,6 +33,27 @@ class FTPUplinkConverter(FTPConverter):
         self._log = logger
         self.__config = config
         self.__data_types = {"attributes": "attributes", "timeseries": "telemetry"}
+        self.__expressions = TBExpression.compile_all(
+            (self.__config.get("devicePatternName"), self.__config.get("devicePatternType"),
+             *(datatype_config.get(option)
+               for datatype in self.__data_types
+               for datatype_config in self.__config.get(datatype, [])
+               for option in ("key", "value"))))
+        self.__ts_format_resolvers = {id(key_config): (key_config, TBTsFormatResolver.from_config(key_config))
+                                      for key_config in self.__config.get("timeseries", [])
+                                      if isinstance(key_config, dict) and key_config.get('tsField') is not None}
+
+    def __get_expression(self, expression):
+        compiled_expression = self.__expressions.get(expression)
+        if compiled_expression is None:
+            compiled_expression = self.__expressions[expression] = TBExpression(expression)
+        return compiled_expression
+
+    def __get_ts_format_resolver(self, key_config):
+        cached = self.__ts_format_resolvers.get(id(key_config))
+        if cached is not None and cached[0] is key_config:
+            return cached[1]
+        return None
 
     def _get_device_report_strategy(self, device_name):
         device_report_strategy = None
@@ -103,7 +126,9 @@ class FTPUplinkConverter(FTPConverter):
                                     data_to_retrieve_ts = {}
                                     for index, item in enumerate(config['headers']):
                                        data_to_retrieve_ts[item] = arr[index]
-                                    ts = TBUtility.resolve_different_ts_formats(data=data_to_retrieve_ts, config=information, logger=self._log)
+                                    ts = TBUtility.resolve_different_ts_formats(
+                                        data=data_to_retrieve_ts, config=information, logger=self._log,
+                                        ts_format_resolver=self.__get_ts_format_resolver(information))
                                 except Exception as e:
                                     self._log.error('Error while retrieving timestamp for key %s: %s', key, e)
                                     ts = old_ts
@@ -213,18 +238,8 @@ class FTPUplinkConverter(FTPConverter):
 
         try:
             if self.__config.get("devicePatternName") is not None:
-                device_name_tags = TBUtility.get_values(self.__config.get("devicePatternName"), data,
-                                                        get_tag=True)
-                device_name_values = TBUtility.get_values(self.__config.get("devicePatternName"), data,
-                                                          expression_instead_none=True)
-
-                device_name = self.__config.get("devicePatternName")
-                for (device_name_tag, device_name_value) in zip(device_name_tags, device_name_values):
-                    is_valid_key = "${" in self.__config.get("devicePatternName") and "}" in \
-                                   self.__config.get("devicePatternName")
-                    device_name = device_name.replace('${' + str(device_name_tag) + '}',
-                                                                                  str(device_name_value)) \
-                        if is_valid_key else device_name_tag
+                device_name = self.__get_expression(self.__config.get("devicePatternName")).render(
+                    data, expression_instead_none=True)
         except Exception as e:
             StatisticsService.count_connector_message(self._log.name, 'convertersMsgDropped')
             self._log.error('Error in converter, for config: \n%s\n and message: \n%s\n %s', dumps(self.__config), data,
@@ -237,18 +252,8 @@ class FTPUplinkConverter(FTPConverter):
 
         try:
             if self.__config.get("devicePatternType") is not None:
-                device_type_tags = TBUtility.get_values(self.__config.get("devicePatternType"), data,
-                                                        get_tag=True)
-                device_type_values = TBUtility.get_values(self.__config.get("devicePatternType"), data,
-                                                          expression_instead_none=True)
-                device_type = self.__config.get("devicePatternType")
-
-                for (device_type_tag, device_type_value) in zip(device_type_tags, device_type_values):
-                    is_valid_key = "${" in self.__config.get("devicePatternType") and "}" in \
-                                   self.__config.get("devicePatternType")
-                    device_type = device_type.replace('${' + str(device_type_tag) + '}',
-                                                                                  str(device_type_value)) \
-                        if is_valid_key else device_type_tag
+                device_type = self.__get_expression(self.__config.get("devicePatternType")).render(
+                    data, expression_instead_none=True)
         except Exception as e:
             StatisticsService.count_connector_message(self._log.name, 'convertersMsgDropped')
             self._log.error('Error in converter, for config: \n%s\n and message: \n%s\n %s', dumps(self.__config), data,
@@ -276,29 +281,13 @@ class FTPUplinkConverter(FTPConverter):
             for datatype in self.__data_types:
                 for datatype_config in self.__config.get(datatype, []):
                     try:
-                        values = TBUtility.get_values(datatype_config["value"], data, datatype_config["type"],
-                                                      expression_instead_none=True)
-                        values_tags = TBUtility.get_values(datatype_config["value"], data, datatype_config["type"],
-                                                           get_tag=True)
-
-                        keys = TBUtility.get_values(datatype_config["key"], data, datatype_config["type"],
-                                                    expression_instead_none=True)
-                        keys_tags = TBUtility.get_values(datatype_config["key"], data, get_tag=True)
-
-                        full_key = datatype_config["key"]
-                        for (key, key_tag) in zip(keys, keys_tags):
-                            is_valid_key = "${" in datatype_config["key"] and "}" in datatype_config["key"]
-                            full_key = full_key.replace('${' + str(key_tag) + '}',
-                                                        str(key)) if is_valid_key else key_tag
+                        full_key = self.__get_expression(datatype_config["key"]).render(
+                            data, expression_instead_none=True)
                         if full_key == 'ts' and datatype == 'timeseries':
                             continue
 
-                        full_value = datatype_config["value"]
-                        for (value, value_tag) in zip(values, values_tags):
-                            is_valid_value = "${" in datatype_config["value"] and "}" in datatype_config["value"]
-
-                            full_value = full_value.replace('${' + str(value_tag) + '}',
-                                                            str(value)) if is_valid_value else str(value)
+                        full_value = self.__get_expression(datatype_config["value"]).render(
+                            data, expression_instead_none=True)
                         datapoint_key = TBUtility.convert_key_to_datapoint_key(full_key, device_report_strategy,
                                                                                datatype_config, self._log)
                         if datatype == 'timeseries':
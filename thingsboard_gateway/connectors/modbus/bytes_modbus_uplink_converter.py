@@ -22,23 +22,25 @@ from pymodbus.pdu import ExceptionResponse
 from thingsboard_gateway.connectors.modbus.entities.bytes_uplink_converter_config import BytesUplinkConverterConfig
 from thingsboard_gateway.connectors.modbus.modbus_converter import ModbusConverter
 from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.gateway.entities.datapoint_keys_cache import DatapointKeysCache
 from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
 from thingsboard_gateway.gateway.statistics.decorators import CollectStatistics
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
-from thingsboard_gateway.tb_utility.tb_utility import TBUtility
 
 
 class BytesModbusUplinkConverter(ModbusConverter):
     def __init__(self, config: BytesUplinkConverterConfig, logger):
         self._log = logger
         self.__config = config
+        self.__device_report_strategy = self._get_device_report_strategy(self.__config.report_strategy,
+                                                                         self.__config.device_name)
+        self.__datapoint_keys = DatapointKeysCache(self._log)
 
     @CollectStatistics(start_stat_type='receivedBytesFromDevices',
                        end_stat_type='convertedBytesFromDevice')
     def convert(self, _, data: List[dict]) -> Union[ConvertedData, None]:
         result = ConvertedData(self.__config.device_name, self.__config.device_type)
-        device_report_strategy = self._get_device_report_strategy(self.__config.report_strategy,
-                                                                  self.__config.device_name)
+        device_report_strategy = self.__device_report_strategy
 
         converted_data_append_methods = {
             'attributes': result.add_to_attributes,
@@ -57,10 +59,7 @@ class BytesModbusUplinkConverter(ModbusConverter):
                                                         self.__config.word_order)
 
                         if decoded_data is not None:
-                            datapoint_key = TBUtility.convert_key_to_datapoint_key(config['tag'],
-                                                                                   device_report_strategy,
-                                                                                   config,
-                                                                                   self._log)
+                            datapoint_key = self.__datapoint_keys.get(config['tag'], device_report_strategy, config)
                             converted_data_append_methods[config_section]({datapoint_key: decoded_data})
 
             self._log.trace("Decoded data: %s", result)
@@ -257,7 +257,8 @@ class Slave(Thread):
         StatisticsService.count_connector_message(self.connector.get_name(),
                                                   stat_parameter_name='connectorMsgsReceived')
         StatisticsService.count_connector_bytes(self.connector.get_name(), result,
-                                                stat_parameter_name='connectorBytesReceived')
+                                                stat_parameter_name='connectorBytesReceived',
+                                                bytes_count=self.__get_response_data_bytes_count(result))
 
         return result
 
@@ -274,7 +275,7 @@ class Slave(Thread):
         except KeyError:
             self._log.error('Unknown Modbus function with code: %s', function_code)
 
-        self._log.debug("Read with result: %s", str(result))
+        self._log.debug("Read with result: %s", result)
         return result
 
     async def write(self, function_code, address, value):
@@ -290,7 +291,8 @@ class Slave(Thread):
         StatisticsService.count_connector_message(self.connector.get_name(),
                                                   stat_parameter_name='connectorMsgsReceived')
         StatisticsService.count_connector_bytes(self.connector.get_name(), result,
-                                                stat_parameter_name='connectorBytesReceived')
+                                                stat_parameter_name='connectorBytesReceived',
+                                                bytes_count=self.__get_response_data_bytes_count(result))
 
         return result
 
@@ -318,9 +320,19 @@ class Slave(Thread):
             future.set_exception(e)
             return future
 
-        self._log.debug("Write with result: %s", str(result))
+        self._log.debug("Write with result: %s", result)
         return result
 
+    @staticmethod
+    def __get_response_data_bytes_count(result):
+        registers = getattr(result, 'registers', None)
+        if registers:
+            return len(registers) * 2
+        bits = getattr(result, 'bits', None)
+        if bits:
+            return (len(bits) + 7) // 8
+        return None
+
     def is_connected_to_platform(self):
         return self.last_connect_time != 0 and monotonic() - self.last_connect_time < 10
 
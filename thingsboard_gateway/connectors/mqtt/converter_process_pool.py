@@ -0,0 +1,218 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from concurrent.futures import ProcessPoolExecutor
+from logging import getLogger
+from multiprocessing import get_context
+from queue import Empty, Queue
+from threading import BoundedSemaphore, Thread
+from time import time
+
+from thingsboard_gateway.gateway.constants import CONVERTED_TS_PARAMETER, REPORT_PERIOD_PARAMETER, TYPE_PARAMETER, \
+    AGGREGATION_FUNCTION_PARAMETER, TTL_PARAMETER
+from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
+from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
+from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
+from thingsboard_gateway.tb_utility.tb_loader import TBModuleLoader
+
+MAX_CACHED_DATAPOINT_KEYS = 100000
+
+# Converters created in a worker process by converter id
+_worker_converters = {}
+
+# Datapoint keys by packed keys in the connector process
+_datapoint_keys = {}
+
+
+def pack_converted_data(data: ConvertedData) -> tuple:
+    """
+    Packs converted data into plain tuples for sending between processes. Hashes of datapoint keys and report
+    strategies depend on the process, so the keys are packed as values and created again by unpack_converted_data.
+    """
+    # Every key of a report strategy refers to the same packed strategy tuple, so it is pickled once
+    packed_strategies = {}
+
+    def pack_keys(values):
+        keys = []
+        for key in values:
+            if isinstance(key, DatapointKey):
+                strategy = key.report_strategy
+                packed_strategy = None
+                if strategy is not None:
+                    packed_strategy = packed_strategies.get(strategy)
+                    if packed_strategy is None:
+                        packed_strategy = packed_strategies[strategy] = (strategy.report_period,
+                                                                         strategy.report_strategy.value,
+                                                                         strategy.aggregation_function,
+                                                                         strategy.ttl)
+                key = (key.key, packed_strategy)
+            keys.append(key)
+        return keys
+
+    telemetry = [(entry.ts, entry.metadata or None, pack_keys(entry.values), list(entry.values.values()))
+                 for entry in data.telemetry]
+    attributes = (pack_keys(data.attributes.values), list(data.attributes.values.values()))
+    return data.device_name, data.device_type, data.metadata, telemetry, attributes
+
+
+def unpack_converted_data(packed_data: tuple) -> ConvertedData:
+    device_name, device_type, metadata, telemetry, attributes = packed_data
+    data = ConvertedData(device_name, device_type, metadata)
+    for ts, entry_metadata, keys, values in telemetry:
+        entry = TelemetryEntry(dict(zip(_unpack_keys(keys), values)), ts)
+        if entry_metadata:
+            entry.metadata = entry_metadata
+        data.add_to_telemetry(entry)
+    keys, values = attributes
+    if keys:
+        data.add_to_attributes(dict(zip(_unpack_keys(keys), values)))
+    return data
+
+
+def _unpack_keys(keys):
+    datapoint_keys = _datapoint_keys
+    return [datapoint_keys.get(key) or _unpack_key(key) for key in keys]
+
+
+def _unpack_key(packed_key):
+    datapoint_key = packed_key
+    if isinstance(packed_key, tuple):
+        key, packed_strategy = packed_key
+        strategy = None
+        if packed_strategy is not None:
+            report_period, report_strategy_type, aggregation_function, ttl = packed_strategy
+            strategy = ReportStrategyConfig({REPORT_PERIOD_PARAMETER: report_period or 0,
+                                             TYPE_PARAMETER: report_strategy_type,
+                                             AGGREGATION_FUNCTION_PARAMETER: aggregation_function,
+                                             TTL_PARAMETER: ttl})
+        datapoint_key = DatapointKey.intern(key, strategy)
+    if len(_datapoint_keys) >= MAX_CACHED_DATAPOINT_KEYS:
+        _datapoint_keys.clear()
+    _datapoint_keys[packed_key] = datapoint_key
+    return datapoint_key
+
+
+def _init_worker(connector_type, converter_specs):
+    for converter_id, (converter_class_name, mapping, logger_name) in enumerate(converter_specs):
+        try:
+            converter_class = TBModuleLoader.import_module(connector_type, converter_class_name)
+            logger = getLogger(logger_name)
+            _worker_converters[converter_id] = converter_class(mapping, logger), logger
+        except Exception as e:
+            getLogger(logger_name).error("Cannot create converter %s in converter process: %r",
+                                         converter_class_name, e)
+
+
+def _convert_batch(batch):
+    results = []
+    for converter_id, topic, content in batch:
+        converter, logger = _worker_converters.get(converter_id, (None, None))
+        if converter is None:
+            continue
+        try:
+            converted_data = converter.convert(topic, content)
+        except Exception as e:
+            logger.error("Error while converting data from topic %s: %r", topic, e)
+            continue
+        for data in converted_data if isinstance(converted_data, list) else (converted_data,):
+            if data is not None and (data.telemetry_datapoints_count > 0 or data.attributes_datapoints_count > 0):
+                data.add_to_metadata({CONVERTED_TS_PARAMETER: int(time() * 1000)})
+                results.append((topic, pack_converted_data(data)))
+    return results
+
+
+class ConverterProcessPool:
+    """
+    Runs uplink converters in worker processes, so CPU-bound conversion is not limited by the GIL.
+    Every worker process creates its own converters from the mapping configuration; messages are sent to the workers
+    in batches and the converted data is given to send_result in this process.
+    Statistics collected by the converters in worker processes are not reported.
+    """
+
+    def __init__(self, connector_type, processes_count, send_result, logger, batch_size=100, max_queue_size=0):
+        self.__connector_type = connector_type
+        self.__processes_count = processes_count
+        self.__send_result = send_result
+        self.__log = logger
+        self.__batch_size = batch_size
+        self.__queue = Queue(max_queue_size)
+        self.__in_flight_batches = BoundedSemaphore(processes_count * 2)
+        self.__executor = None
+        self.__converter_specs = None
+        self.__converter_ids = {}
+        self.__stopped = False
+        self.__feeder = Thread(name='Converter Process Pool Feeder', target=self.__feed, daemon=True)
+
+    def start(self, converters):
+        """Starts worker processes for converters, a list of (converter, converter class name, mapping) tuples."""
+        converter_specs = [(converter_class_name, mapping, getattr(converter, '_log', self.__log).name)
+                           for converter, converter_class_name, mapping in converters]
+        if converter_specs != self.__converter_specs:
+            if self.__executor is not None:
+                self.__executor.shutdown(wait=False, cancel_futures=True)
+            self.__executor = ProcessPoolExecutor(self.__processes_count, mp_context=get_context('spawn'),
+                                                  initializer=_init_worker,
+                                                  initargs=(self.__connector_type, converter_specs))
+            self.__converter_specs = converter_specs
+            self.__log.info("Started %i converter processes", self.__processes_count)
+        self.__converter_ids = {converter: converter_id for converter_id, (converter, _, _) in enumerate(converters)}
+        if not self.__feeder.is_alive():
+            self.__feeder.start()
+
+    def put(self, converter, topic, content) -> bool:
+        converter_id = self.__converter_ids.get(converter)
+        if converter_id is None:
+            return False
+        self.__queue.put((converter_id, topic, content), True, 100)
+        return True
+
+    def stop(self):
+        self.__stopped = True
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False, cancel_futures=True)
+
+    def __feed(self):
+        while not self.__stopped:
+            try:
+                batch = [self.__queue.get(timeout=1)]
+            except Empty:
+                continue
+            for _ in range(self.__batch_size - 1):
+                try:
+                    batch.append(self.__queue.get_nowait())
+                except Empty:
+                    break
+
+            self.__in_flight_batches.acquire()
+            try:
+                self.__executor.submit(_convert_batch, batch).add_done_callback(self.__on_batch_converted)
+            except Exception as e:
+                self.__in_flight_batches.release()
+                self.__log.error("Cannot send %i messages to converter processes: %r", len(batch), e)
+
+    def __on_batch_converted(self, future):
+        self.__in_flight_batches.release()
+        if future.cancelled():
+            return
+        try:
+            results = future.result()
+        except Exception as e:
+            self.__log.error("Error in converter process: %r", e)
+            return
+        for topic, packed_data in results:
+            try:
+                self.__send_result(topic, unpack_converted_data(packed_data))
+            except Exception as e:
+                self.__log.exception("Error while sending converted data from topic %s: %r", topic, e)
@@ -12,7 +12,7 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
-from re import search
+from re import compile as compile_regex, error as RegexError, search
 from time import time
 from typing import Dict
 
@@ -21,15 +21,67 @@ from simplejson import dumps
 from thingsboard_gateway.connectors.mqtt.mqtt_uplink_converter import MqttUplinkConverter
 from thingsboard_gateway.gateway.constants import REPORT_STRATEGY_PARAMETER, \
     RECEIVED_TS_PARAMETER, CONVERTED_TS_PARAMETER
-from thingsboard_gateway.gateway.entities.attributes import Attributes
 from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.gateway.entities.datapoint_keys_cache import DatapointKeysCache
 from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
 from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
 from thingsboard_gateway.gateway.statistics.decorators import CollectStatistics
+from thingsboard_gateway.tb_utility.tb_expression import TBExpression
+from thingsboard_gateway.tb_utility.tb_ts_format_resolver import TBTsFormatResolver
 from thingsboard_gateway.tb_utility.tb_utility import TBUtility
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
 
 USE_RECEIVED_TS_PARAMETER = "useReceivedTs"
+WILDCARD_CONFIG = "*"
+
+
+class _DatapointPlan:
+    """
+    Conversion of an attribute or time series key configuration, prepared once for all messages.
+    The datapoint key is created in advance for keys without tags, values of single tag expressions are taken
+    from the message as is and numbers are cast without the round trip through a string.
+    """
+
+    __slots__ = ['config', 'is_wildcard', 'is_valid', 'key_expression', 'datapoint_key', 'value_expression',
+                 'value_type', 'numeric_cast', 'has_ts_field', 'ts_format_resolver']
+
+    def __init__(self, config, device_report_strategy, use_eval, logger):
+        self.config = config
+        self.is_wildcard = isinstance(config, str) and config == WILDCARD_CONFIG
+        self.is_valid = self.is_wildcard
+        self.key_expression = None
+        self.datapoint_key = None
+        self.value_expression = None
+        self.value_type = None
+        self.numeric_cast = None
+        self.has_ts_field = False
+        self.ts_format_resolver = None
+        if self.is_wildcard or not isinstance(config, dict) \
+                or not isinstance(config.get('key'), str) or not isinstance(config.get('value'), str):
+            return
+
+        self.is_valid = True
+        self.key_expression = TBExpression(config['key'])
+        if not self.key_expression.is_template:
+            self.datapoint_key = TBUtility.convert_key_to_datapoint_key(config['key'], device_report_strategy,
+                                                                        config, logger)
+        self.value_expression = TBExpression(config['value'])
+        self.value_type = config.get('type')
+        self.has_ts_field = config.get('tsField') is not None
+        self.ts_format_resolver = TBTsFormatResolver.from_config(config)
+        if self.value_expression.is_single_tag and isinstance(self.value_type, str) and not use_eval:
+            # The same results as TBUtility.convert_data_type gives for the value converted to a string
+            value_type = self.value_type.lower()
+            if 'str' in value_type:
+                self.numeric_cast = str
+            elif 'int' in value_type or 'long' in value_type:
+                self.numeric_cast = _to_int
+            elif value_type in ('float', 'double'):
+                self.numeric_cast = float
+
+
+def _to_int(value):
+    return int(float(value))
 
 
 class JsonMqttUplinkConverter(MqttUplinkConverter):
@@ -44,6 +96,8 @@ class JsonMqttUplinkConverter(MqttUplinkConverter):
             pass
         self.__config = config.get('converter')
         self.__use_eval = self.__config.get(self.CONFIGURATION_OPTION_USE_EVAL, False)
+        self.__datapoint_keys = DatapointKeysCache(self._log)
+        self.__build_conversion_plan()
 
     @property
     def config(self):
@@ -52,6 +106,42 @@ class JsonMqttUplinkConverter(MqttUplinkConverter):
     @config.setter
     def config(self, value):
         self.__config = value
+        self.__datapoint_keys.clear()
+        self.__build_conversion_plan()
+
+    def __build_conversion_plan(self):
+        device_info = self.__config.get('deviceInfo', {})
+        self.__device_name_plan = self.__build_device_info_plan(device_info, "deviceNameExpressionSource",
+                                                                "deviceNameExpression")
+        self.__device_type_plan = self.__build_device_info_plan(device_info, "deviceProfileExpressionSource",
+                                                                "deviceProfileExpression")
+        self.__use_received_ts = self.__config.get(USE_RECEIVED_TS_PARAMETER, False) is True
+        self.__attributes_plan = self.__build_datapoints_plan(self.__config.get("attributes", []))
+        self.__timeseries_plan = self.__build_datapoints_plan(self.__config.get("timeseries", []))
+
+    def __build_datapoints_plan(self, datatype_configs):
+        datapoints_plan = []
+        for datatype_config in datatype_configs:
+            datapoint_plan = _DatapointPlan(datatype_config, self.__device_report_strategy, self.__use_eval, self._log)
+            # Keys rendered to "None" are never reported
+            if datapoint_plan.datapoint_key is None or datapoint_plan.key_expression.expression != 'None':
+                datapoints_plan.append(datapoint_plan)
+        return datapoints_plan
+
+    @staticmethod
+    def __build_device_info_plan(device_info, expression_source, expression):
+        source = device_info.get(expression_source)
+        expression = device_info.get(expression)
+        if not isinstance(expression, str):
+            return None
+        if source == 'message' or source == 'constant':
+            return source, TBExpression(expression)
+        if source == 'topic':
+            try:
+                return source, compile_regex(expression)
+            except RegexError:
+                return None
+        return None
 
     @CollectStatistics(start_stat_type='receivedBytesFromDevices',
                        end_stat_type='convertedBytesFromDevice')
@@ -73,58 +163,17 @@ class JsonMqttUplinkConverter(MqttUplinkConverter):
             return self._convert_single_item(topic, data)
 
     def _convert_single_item(self, topic, data):
-        datatypes = {"attributes": "attributes",
-                     "timeseries": "telemetry"}
-
-        device_name = self.parse_device_name(topic, data, self.__config)
-
-        converted_data = ConvertedData(device_name=device_name,
-                                       device_type=self.parse_device_type(topic, data, self.__config),
+        converted_data = ConvertedData(device_name=self.__resolve_device_info(self.__device_name_plan, topic, data,
+                                                                              "deviceNameExpressionSource",
+                                                                              "deviceNameExpression"),
+                                       device_type=self.__resolve_device_info(self.__device_type_plan, topic, data,
+                                                                              "deviceProfileExpressionSource",
+                                                                              "deviceProfileExpression"),
                                        metadata={RECEIVED_TS_PARAMETER: int(time() * 1000)})
 
         try:
-            for datatype in datatypes:
-                timestamp = None
-                if self.__config.get(USE_RECEIVED_TS_PARAMETER, False) is True:
-                    timestamp = converted_data.metadata["receivedTs"]
-
-                for datatype_config in self.__config.get(datatype, []):
-                    if isinstance(datatype_config, str) and datatype_config == "*":
-                        if datatype == "attributes":
-                            converted_data.add_to_attributes(Attributes(data))
-                        else:
-                            telemetry_entry = TelemetryEntry(data, timestamp)
-                            converted_data.add_to_telemetry(telemetry_entry)
-                    else:
-                        values = TBUtility.get_values(datatype_config["value"], data, datatype_config["type"],
-                                                      expression_instead_none=False)
-                        values_tags = TBUtility.get_values(datatype_config["value"], data, datatype_config["type"],
-                                                           get_tag=True)
-
-                        keys = TBUtility.get_values(datatype_config["key"], data, datatype_config["type"],
-                                                    expression_instead_none=False)
-                        keys_tags = TBUtility.get_values(datatype_config["key"], data, get_tag=True)
-
-                        full_key = datatype_config["key"]
-                        for (key, key_tag) in zip(keys, keys_tags):
-                            is_valid_key = "${" in datatype_config["key"] and "}" in datatype_config["key"]
-                            full_key = full_key.replace('${' + str(key_tag) + '}', str(key)) if is_valid_key else key_tag
-
-                        full_value = datatype_config["value"]
-                        for (value, value_tag) in zip(values, values_tags):
-                            is_valid_value = "${" in datatype_config["value"] and "}" in datatype_config["value"]
-                            full_value = full_value.replace('${' + str(value_tag) + '}', str(value)) if is_valid_value else value
-
-                        if full_key != 'None' and full_value != 'None':
-                            converted_key = TBUtility.convert_key_to_datapoint_key(full_key, self.__device_report_strategy, datatype_config, self._log)
-                            converted_value = TBUtility.convert_data_type(full_value, datatype_config["type"], self.__use_eval)
-                            if datatype == "attributes":
-                                converted_data.add_to_attributes(converted_key, converted_value)
-                            else:
-                                if timestamp is None:
-                                    timestamp = TBUtility.resolve_different_ts_formats(data=data, config=datatype_config, logger=self._log)
-                                telemetry_entry = TelemetryEntry({converted_key: converted_value}, timestamp)
-                                converted_data.add_to_telemetry(telemetry_entry)
+            self.__convert_attributes(data, converted_data)
+            self.__convert_timeseries(data, converted_data)
         except Exception as e:
             self._log.error('Error in converter, for config: \n%s\n and message: \n%s\n %s', dumps(self.__config),
                             str(data), e)
@@ -138,6 +187,97 @@ class JsonMqttUplinkConverter(MqttUplinkConverter):
                                                   count=converted_data.telemetry_datapoints_count)
         return converted_data
 
+    def __convert_attributes(self, data, converted_data):
+        attributes = {}
+        try:
+            for datapoint_plan in self.__attributes_plan:
+                if datapoint_plan.is_wildcard:
+                    attributes.update(data or {})
+                    continue
+                datapoint_key, value = self.__convert_datapoint(datapoint_plan, data)
+                if datapoint_key is not None:
+                    attributes[datapoint_key] = value
+        finally:
+            if attributes:
+                converted_data.add_to_attributes(attributes)
+
+    def __convert_timeseries(self, data, converted_data):
+        timestamp = converted_data.metadata[RECEIVED_TS_PARAMETER] if self.__use_received_ts else None
+        default_ts_resolved = False
+        # Values of all keys are collected by timestamp, so an entry is created for a timestamp, not for a key
+        values_by_ts = {}
+        try:
+            for datapoint_plan in self.__timeseries_plan:
+                if datapoint_plan.is_wildcard:
+                    self.__add_telemetry(converted_data, values_by_ts)
+                    values_by_ts = {}
+                    converted_data.add_to_telemetry(TelemetryEntry(data, timestamp))
+                    continue
+                datapoint_key, value = self.__convert_datapoint(datapoint_plan, data)
+                if datapoint_key is None:
+                    continue
+                if timestamp is None and (datapoint_plan.has_ts_field or not default_ts_resolved):
+                    timestamp = TBUtility.resolve_different_ts_formats(
+                        data=data, config=datapoint_plan.config, logger=self._log,
+                        ts_format_resolver=datapoint_plan.ts_format_resolver)
+                    default_ts_resolved = not datapoint_plan.has_ts_field
+                values = values_by_ts.get(timestamp)
+                if values is None:
+                    values = values_by_ts[timestamp] = {}
+                values[datapoint_key] = value
+        finally:
+            self.__add_telemetry(converted_data, values_by_ts)
+
+    @staticmethod
+    def __add_telemetry(converted_data, values_by_ts):
+        for ts, values in values_by_ts.items():
+            converted_data.add_to_telemetry(TelemetryEntry(values, ts))
+
+    def __convert_datapoint(self, datapoint_plan, data):
+        if not datapoint_plan.is_valid:
+            raise ValueError("Invalid key configuration: %r" % (datapoint_plan.config,))
+
+        datapoint_key = datapoint_plan.datapoint_key
+        if datapoint_key is None:
+            full_key = datapoint_plan.key_expression.render(data)
+            if full_key == 'None':
+                return None, None
+            datapoint_key = self.__datapoint_keys.get(full_key, self.__device_report_strategy, datapoint_plan.config)
+
+        value_expression = datapoint_plan.value_expression
+        if value_expression.is_single_tag:
+            value = value_expression.evaluate(data)
+            if value is None:
+                return None, None
+            if datapoint_plan.numeric_cast is not None and (type(value) is int or type(value) is float):
+                return datapoint_key, datapoint_plan.numeric_cast(value)
+            value = str(value)
+        else:
+            value = value_expression.render(data)
+        if value == 'None':
+            return None, None
+        return datapoint_key, TBUtility.convert_data_type(value, datapoint_plan.value_type, self.__use_eval)
+
+    def __resolve_device_info(self, device_info_plan, topic, data, expression_source, expression):
+        if device_info_plan is None:
+            return self.parse_device_info(topic, data, self.__config, expression_source, expression)
+
+        source, compiled_expression = device_info_plan
+        try:
+            if source == 'topic':
+                search_result = compiled_expression.search(topic)
+                if search_result is not None:
+                    return search_result.group(0)
+                self._log.debug(
+                    "Regular expression result is None. deviceNameTopicExpression parameter will be interpreted "
+                    "as a deviceName\n Topic: %s\nRegex: %s", topic, compiled_expression.pattern)
+                return compiled_expression.pattern
+            return compiled_expression.render(data, expression_instead_none=True)
+        except Exception as e:
+            self._log.error('Error in converter, for config: \n%s\n and message: \n%s\n %s', dumps(self.__config),
+                            data, e)
+            return None
+
     @staticmethod
     def create_data_record(key, value, timestamp):
         value_item = {key: value}
@@ -160,14 +300,7 @@ class JsonMqttUplinkConverter(MqttUplinkConverter):
 
         try:
             if device_info.get(expression_source) == 'message' or device_info.get(expression_source) == 'constant':
-                result_tags = TBUtility.get_values(expression, data, get_tag=True)
-                result_values = TBUtility.get_values(expression, data, expression_instead_none=True)
-
-                result = expression
-                for (result_tag, result_value) in zip(result_tags, result_values):
-                    is_valid_key = "${" in expression and "}" in expression
-                    result = result.replace('${' + str(result_tag) + '}',
-                                            str(result_value)) if is_valid_key else result_tag
+                result = TBExpression(expression).render(data, expression_instead_none=True)
             elif device_info.get(expression_source) == 'topic':
                 search_result = search(expression, topic)
                 if search_result is not None:
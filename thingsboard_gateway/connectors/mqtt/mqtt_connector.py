@@ -16,6 +16,7 @@ import random
 import socket
 import ssl
 import string
+from functools import partial
 from queue import Queue, Empty
 from re import fullmatch, match, search
 from threading import Thread, Event
@@ -26,9 +27,12 @@ import orjson
 from orjson.orjson import JSONDecodeError
 
 from thingsboard_gateway.connectors.mqtt.backward_compatibility_adapter import BackwardCompatibilityAdapter
+from thingsboard_gateway.connectors.mqtt.converter_process_pool import ConverterProcessPool
 from thingsboard_gateway.gateway.constant_enums import Status
 from thingsboard_gateway.connectors.connector import Connector
 from thingsboard_gateway.connectors.mqtt.mqtt_decorators import CustomCollectStatistics
+from thingsboard_gateway.connectors.mqtt.pending_rpc_requests import PendingRpcRequests
+from thingsboard_gateway.connectors.mqtt.topic_trie import TopicTrie
 from thingsboard_gateway.gateway.constants import DATA_RETRIEVING_STARTED, CONVERTED_TS_PARAMETER
 from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
 from thingsboard_gateway.gateway.statistics.decorators import CollectAllReceivedBytesStatistics
@@ -46,7 +50,7 @@ except ImportError:
     from paho.mqtt.client import Client, Properties
     from paho.mqtt.packettypes import PacketTypes
 
-from paho.mqtt.client import MQTTv31, MQTTv311, MQTTv5
+from paho.mqtt.client import MQTTv31, MQTTv311, MQTTv5, topic_matches_sub
 
 
 MQTT_VERSIONS = {
@@ -108,6 +112,11 @@ RESULT_CODES_V5 = {
 class MqttConnector(Connector, Thread):
     CONFIGURATION_KEY_SHARED_GLOBAL = "sharedGlobal"
     CONFIGURATION_KEY_SHARED_ID = "sharedId"
+    MAPPING_HANDLERS = "mapping"
+    CONNECT_HANDLERS = "connectRequests"
+    DISCONNECT_HANDLERS = "disconnectRequests"
+    ATTRIBUTE_REQUEST_HANDLERS = "attributeRequests"
+    QUEUE_GET_TIMEOUT = 1
 
     def __init__(self, gateway, config, connector_type):
         super().__init__()
@@ -194,6 +203,13 @@ class MqttConnector(Connector, Thread):
         self.__connect_requests_sub_topics = {}
         self.__disconnect_requests_sub_topics = {}
         self.__attribute_requests_sub_topics = {}
+        self.__topic_trie = TopicTrie()
+
+        # Two-way RPC requests waiting for responses and wildcard topic filters subscribed for the responses,
+        # a filter covers the responses only after the broker acknowledged its subscription
+        self.__pending_rpc_requests = PendingRpcRequests()
+        self.__rpc_response_subscriptions = set()
+        self.__pending_rpc_response_subscriptions = set()
 
         # Set up external MQTT broker connection -----------------------------------------------------------------------
         client_id = self.__broker.get("clientId", ''.join(random.choice(string.ascii_lowercase) for _ in range(23)))
@@ -264,9 +280,27 @@ class MqttConnector(Connector, Thread):
         self.__max_msg_number_for_worker = self.__broker.get('maxMessageNumberPerWorker', 10)
         self.__max_number_of_workers = self.__broker.get('maxNumberOfWorkers', 100)
 
-        self._on_message_queue = Queue(self.__broker.get('maxProcessingMessageQueue', 1000000000))
-        self._on_message_thread = Thread(name='On Message', target=self._process_on_message, daemon=True)
-        self._on_message_thread.start()
+        # Converters are run in worker processes instead of threads when configured
+        self.__converter_process_pool = None
+        converter_worker_processes = self.__broker.get('converterWorkerProcesses', 0)
+        if converter_worker_processes > 0:
+            self.__converter_process_pool = ConverterProcessPool(self._connector_type, converter_worker_processes,
+                                                                 self._save_converted_msg, self.__log,
+                                                                 max_queue_size=self.__broker.get('maxMessageQueue',
+                                                                                                  1000000000))
+
+        # Messages are dispatched by several threads when configured, messages of a topic always go to the same one,
+        # so they are processed in order
+        on_message_dispatchers_count = max(int(self.__broker.get('onMessageDispatchersCount', 1)), 1)
+        self._on_message_queues = [Queue(self.__broker.get('maxProcessingMessageQueue', 1000000000))
+                                   for _ in range(on_message_dispatchers_count)]
+        self._on_message_threads = []
+        for index, on_message_queue in enumerate(self._on_message_queues):
+            thread_name = 'On Message' if on_message_dispatchers_count == 1 else 'On Message %i' % index
+            self._on_message_threads.append(Thread(name=thread_name, target=self._process_on_message,
+                                                   args=(on_message_queue,), daemon=True))
+        for thread in self._on_message_threads:
+            thread.start()
 
     def get_config(self):
         return self.config
@@ -344,6 +378,7 @@ class MqttConnector(Connector, Thread):
                     self.__connect()
 
                 self.__threads_manager()
+                self.__pending_rpc_requests.cancel_expired()
 
                 self.__stop_event.wait(timeout=0.2)
             except TimeoutError:
@@ -386,6 +421,8 @@ class MqttConnector(Connector, Thread):
         self._client.loop_stop()
         for worker in self.__workers_thread_pool:
             worker.stop()
+        if self.__converter_process_pool is not None:
+            self.__converter_process_pool.stop()
         self.__log.info('%s has been stopped.', self.get_name())
         self.__log.stop()
 
@@ -417,6 +454,8 @@ class MqttConnector(Connector, Thread):
                              extra_params)
 
             self.__mapping_sub_topics = {}
+            # Shared converters are used by several mappings, but the workers create them once
+            process_pool_converters = {}
 
             # Setup data upload requests handling ----------------------------------------------------------------------
             for mapping in self.__mapping:
@@ -479,6 +518,8 @@ class MqttConnector(Connector, Thread):
                         self.__mapping_sub_topics[regex_topic] = []
 
                     self.__mapping_sub_topics[regex_topic].append(converter)
+                    if converter not in process_pool_converters:
+                        process_pool_converters[converter] = (converter, converter_class_name, mapping)
 
                     # Subscribe to appropriate topic -------------------------------------------------------------------
                     self.__subscribe(mapping["topicFilter"], mapping.get("subscriptionQos", 1))
@@ -493,6 +534,10 @@ class MqttConnector(Connector, Thread):
             self.__setup_request_subscriptions(self.__connect_requests, self.__connect_requests_sub_topics)
             self.__setup_request_subscriptions(self.__disconnect_requests, self.__disconnect_requests_sub_topics)
             self.__setup_request_subscriptions(self.__attribute_requests, self.__attribute_requests_sub_topics)
+            self.__build_topic_trie()
+            self.__setup_rpc_response_subscriptions()
+            if self.__converter_process_pool is not None:
+                self.__converter_process_pool.start(list(process_pool_converters.values()))
         else:
             result_codes = RESULT_CODES_V5 if self._mqtt_version == 5 else RESULT_CODES_V3
             rc = result_code.value if self._mqtt_version == 5 else result_code
@@ -513,6 +558,51 @@ class MqttConnector(Connector, Thread):
                 self.__log.debug("Error", exc_info=True)
                 continue
 
+    def __setup_rpc_response_subscriptions(self):
+        # Responses to two-way RPCs are received through one wildcard subscription per response topic expression,
+        # so requests are not delayed by subscribing and waiting for the subscription ack
+        self.__rpc_response_subscriptions = set()
+        self.__pending_rpc_response_subscriptions = set()
+        for rpc_config in self.__server_side_rpc:
+            if not rpc_config.get("responseTopicExpression") or not rpc_config.get("responseTimeout"):
+                continue
+            topic_filter = self.__get_rpc_response_topic_filter(rpc_config["responseTopicExpression"])
+            if topic_filter not in self.__pending_rpc_response_subscriptions:
+                self.__pending_rpc_response_subscriptions.add(topic_filter)
+                self.__subscribe(topic_filter, rpc_config.get("responseTopicQoS", 1))
+
+    @staticmethod
+    def __get_rpc_response_topic_filter(response_topic_expression):
+        return '/'.join('+' if '${' in level else level for level in response_topic_expression.split('/'))
+
+    def __check_rpc_response_subscription(self, topic_filter, granted_qos):
+        if topic_filter not in self.__pending_rpc_response_subscriptions:
+            return
+        try:
+            reason_code = granted_qos[0]
+            failed = getattr(reason_code, 'value', reason_code) >= 128
+        except (IndexError, TypeError):
+            failed = True
+        self.__pending_rpc_response_subscriptions.discard(topic_filter)
+        if failed:
+            # E.g. the broker ACL does not allow wildcards, responses will be subscribed by exact topics
+            self.__log.warning('"%s" subscription to RPC response topic filter %s failed, '
+                               'exact response topics will be subscribed for every request',
+                               self.get_name(), topic_filter)
+        else:
+            self.__rpc_response_subscriptions.add(topic_filter)
+
+    def __build_topic_trie(self):
+        # All topic filters are matched in one walk over the trie instead of fullmatch against every filter
+        topic_trie = TopicTrie()
+        for kind, sub_topics in ((self.MAPPING_HANDLERS, self.__mapping_sub_topics),
+                                 (self.CONNECT_HANDLERS, self.__connect_requests_sub_topics),
+                                 (self.DISCONNECT_HANDLERS, self.__disconnect_requests_sub_topics),
+                                 (self.ATTRIBUTE_REQUEST_HANDLERS, self.__attribute_requests_sub_topics)):
+            for regex_topic in sub_topics:
+                topic_trie.add(regex_topic, kind)
+        self.__topic_trie = topic_trie
+
     def _on_disconnect(self, *args):
         self._connected = False
         self.__log.debug('"%s" was disconnected. %s', self.get_name(), str(args))
@@ -522,6 +612,7 @@ class MqttConnector(Connector, Thread):
 
     def _on_subscribe(self, _, __, mid, granted_qos, *args):
         self.__log.info(args)
+        self.__check_rpc_response_subscription(self.__subscribes_sent.get(mid), granted_qos)
         try:
             if granted_qos[0] == 128:
                 self.__log.error('"%s" subscription failed to topic %s subscription message id = %i',
@@ -540,8 +631,11 @@ class MqttConnector(Connector, Thread):
 
     def put_data_to_convert(self, converter, message, content) -> bool:
         if not self.__msg_queue.full():
-            if not hasattr(converter, 'SUPPORTS_BYTES_PAYLOAD'):
+            if isinstance(content, bytes) and not hasattr(converter, 'SUPPORTS_BYTES_PAYLOAD'):
                 content = TBUtility.decode(content)
+            if self.__converter_process_pool is not None and \
+                    self.__converter_process_pool.put(converter, message.topic, content):
+                return True
             self.__msg_queue.put((converter.convert, message.topic, content), True, 100)
             return True
         return False
@@ -576,7 +670,7 @@ class MqttConnector(Connector, Thread):
         StatisticsService.count_connector_message(self.name, stat_parameter_name='connectorMsgsReceived')
         StatisticsService.count_connector_bytes(self.name, message.payload,
                                                 stat_parameter_name='connectorBytesReceived')
-        self._on_message_queue.put((client, userdata, message))
+        self._on_message_queues[hash(message.topic) % len(self._on_message_queues)].put((client, userdata, message))
 
     def _parse_device_info(self, device_info, topic, content):
         found_device_name = None
@@ -616,88 +710,103 @@ class MqttConnector(Connector, Thread):
            self.__log.debug("Error %s", e, exc_info=True)
            return None, None
 
-    def _process_on_message(self):
+    def _process_on_message(self, on_message_queue):
         while not self.__stopped:
-            if not self._on_message_queue.empty():
-                client, userdata, message = self._on_message_queue.get_nowait()
-
-                self.statistics['MessagesReceived'] += 1
-                content = None
-
-                # Check if message topic exists in mappings "i.e., I'm posting telemetry/attributes" -------------------
-                topic_handlers = [regex for regex in self.__mapping_sub_topics if fullmatch(regex, message.topic)]
-
-                if topic_handlers:
-                    # Note: every topic may be associated to one or more converter.
-                    # This means that a single MQTT message
-                    # may produce more than one message towards ThingsBoard. This also means that I cannot return after
-                    # the first successful conversion: I got to use all the available ones.
-                    # I will use a flag to understand whether at least one converter succeeded
-                    request_handled = False
-
-                    for topic in topic_handlers:
-                        available_converters = self.__mapping_sub_topics[topic]
-                        for converter in available_converters:
-                            try:
-                                request_handled = self.put_data_to_convert(converter, message, message.payload)
-                            except Exception as e:
-                                self.__log.exception(e)
-
-                    if not request_handled:
-                        self.__log.error('Cannot find converter for the topic:"%s"! Client: %s, User data: %s',
-                                         message.topic,
-                                         str(client),
-                                         str(userdata))
-
-                    # Note: if I'm in this branch, this was for sure a telemetry/attribute push message
-                    # => Execution must end here both in case of failure and success
-                    continue
+            try:
+                client, userdata, message = on_message_queue.get(timeout=self.QUEUE_GET_TIMEOUT)
+            except Empty:
+                continue
 
-                # The main request processing block, the try/except statements are added to avoid whole attributes processing
-                # to be stopped because of a single error in a request processing
-                try:
+            self.statistics['MessagesReceived'] += 1
+            content = None
 
-                    # Handling connect requests ----------------------------------------------------------------
-                    request_handled, content = self.__process_connect(message, content)
-                    if request_handled:
-                        continue
+            matched_handlers = self.__topic_trie.match(message.topic)
 
-                    # Handling disconnect requests ----------------------------------------------------------------
-                    request_handled, content = self.__process_disconnect(message, content)
-                    if request_handled:
-                        continue
+            # Check if message topic exists in mappings "i.e., I'm posting telemetry/attributes" -------------------
+            topic_handlers = matched_handlers.get(self.MAPPING_HANDLERS)
 
-                    # Handling attribute requests ----------------------------------------------------------------
-                    request_handled, content = self.__process_attribute_request(message, content)
-                    if request_handled:
-                        continue
+            if topic_handlers:
+                # Note: every topic may be associated to one or more converter.
+                # This means that a single MQTT message
+                # may produce more than one message towards ThingsBoard. This also means that I cannot return after
+                # the first successful conversion: I got to use all the available ones.
+                # I will use a flag to understand whether at least one converter succeeded
+                request_handled = False
+                # The payload is decoded once, only if some converter needs it decoded,
+                # and the decoded content is shared between converters
+                payload_decoded = False
 
-                # In case of failure in any block above, log the error and continue
-                except TypeError as e:
-                    self.__log.exception("Make sure your input match with config and the payload you sent was valid.",)
-                    continue
+                for topic in topic_handlers:
+                    available_converters = self.__mapping_sub_topics[topic]
+                    for converter in available_converters:
+                        try:
+                            if hasattr(converter, 'SUPPORTS_BYTES_PAYLOAD'):
+                                converter_content = message.payload
+                            else:
+                                if not payload_decoded:
+                                    content = TBUtility.decode(message.payload)
+                                    payload_decoded = True
+                                converter_content = content
+                            request_handled = self.put_data_to_convert(converter, message, converter_content)
+                        except Exception as e:
+                            self.__log.exception(e)
+
+                if not request_handled:
+                    self.__log.error('Cannot find converter for the topic:"%s"! Client: %s, User data: %s',
+                                     message.topic,
+                                     str(client),
+                                     str(userdata))
+
+                # Note: if I'm in this branch, this was for sure a telemetry/attribute push message
+                # => Execution must end here both in case of failure and success
+                continue
 
-                except Exception as e:
-                    self.__log.exception("An unexpected error occurred while processing request: %s", str(e))
-                    self.__log.debug("Error", exc_info=True)
+            # The main request processing block, the try/except statements are added to avoid whole attributes processing
+            # to be stopped because of a single error in a request processing
+            try:
+
+                # Handling connect requests ----------------------------------------------------------------
+                request_handled, content = self.__process_connect(
+                    message, content, matched_handlers.get(self.CONNECT_HANDLERS, []))
+                if request_handled:
                     continue
 
-                # Check if message topic exists in RPC handlers --------------------------------------------------------
-                # The gateway is expecting for this message => no wildcards here, the topic must be evaluated as is
+                # Handling disconnect requests ----------------------------------------------------------------
+                request_handled, content = self.__process_disconnect(
+                    message, content, matched_handlers.get(self.DISCONNECT_HANDLERS, []))
+                if request_handled:
+                    continue
 
-                if self.__gateway.is_rpc_in_progress(message.topic):
-                    self.__log.info("RPC response arrived. Forwarding it to thingsboard.")
-                    self.__gateway.rpc_with_reply_processing(message.topic, content)
+                # Handling attribute requests ----------------------------------------------------------------
+                request_handled, content = self.__process_attribute_request(
+                    message, content, matched_handlers.get(self.ATTRIBUTE_REQUEST_HANDLERS, []))
+                if request_handled:
                     continue
 
-                self.__log.debug("Received message to topic \"%s\" with unknown interpreter data: \n\n\"%s\"",
-                                 message.topic,
-                                 content)
-            else:
-                sleep(.2)
+            # In case of failure in any block above, log the error and continue
+            except TypeError as e:
+                self.__log.exception("Make sure your input match with config and the payload you sent was valid.",)
+                continue
+
+            except Exception as e:
+                self.__log.exception("An unexpected error occurred while processing request: %s", str(e))
+                self.__log.debug("Error", exc_info=True)
+                continue
 
-    def __process_connect(self, message, content):
-        topic_handlers = self.__match_handlers(self.__connect_requests_sub_topics, message.topic)
+            # Check if message topic exists in RPC handlers --------------------------------------------------------
+            # The gateway is expecting for this message => no wildcards here, the topic must be evaluated as is
+
+            if self.__pending_rpc_requests.complete(message.topic,
+                                                    self.__decode_content_from_message(message, content)):
+                continue
+
+            self.__log.debug("Received message to topic \"%s\" with unknown interpreter data: \n\n\"%s\"",
+                             message.topic,
+                             content)
+
+    def __process_connect(self, message, content, topic_handlers=None):
+        if topic_handlers is None:
+            topic_handlers = self.__match_handlers(self.__connect_requests_sub_topics, message.topic)
         if not topic_handlers:
             return False, content
         content = self.__decode_content_from_message(message, content)
@@ -715,8 +824,9 @@ class MqttConnector(Connector, Thread):
 
         return True, content
 
-    def __process_disconnect(self, message, content):
-        topic_handlers = self.__match_handlers(self.__disconnect_requests_sub_topics, message.topic)
+    def __process_disconnect(self, message, content, topic_handlers=None):
+        if topic_handlers is None:
+            topic_handlers = self.__match_handlers(self.__disconnect_requests_sub_topics, message.topic)
         if not topic_handlers:
             return False, content
         content = self.__decode_content_from_message(message, content)
@@ -740,8 +850,9 @@ class MqttConnector(Connector, Thread):
 
         return True, content
 
-    def __process_attribute_request(self, message, content):
-        topic_handlers = self.__match_handlers(self.__attribute_requests_sub_topics, message.topic)
+    def __process_attribute_request(self, message, content, topic_handlers=None):
+        if topic_handlers is None:
+            topic_handlers = self.__match_handlers(self.__attribute_requests_sub_topics, message.topic)
         if not topic_handlers:
             return False, content
         content = self.__decode_content_from_message(message, content)
@@ -926,6 +1037,9 @@ class MqttConnector(Connector, Thread):
 
             expects_response = rpc_config.get("responseTopicExpression")
             defines_timeout = rpc_config.get("responseTimeout")
+            expected_response_topic = None
+            response_future = None
+            subscribed_response_topic = None
 
             # 2-way RPC setup
             if expects_response and defines_timeout:
@@ -940,28 +1054,21 @@ class MqttConnector(Connector, Thread):
 
                 timeout = time() * 1000 + rpc_config.get("responseTimeout")
 
-                # Start listening on the response topic
-                self.__log.info("Subscribing to: %s", expected_response_topic)
-                self.__subscribe(expected_response_topic, rpc_config.get("responseTopicQoS", 1))
-
-                # Wait for subscription to be carried out
-                sub_response_timeout = 10
-
-                while expected_response_topic in self.__subscribes_sent.values():
-                    sub_response_timeout -= 1
-                    sleep(0.1)
-                    if sub_response_timeout == 0:
-                        break
-
-                # Ask the gateway to enqueue this as an RPC response
-                self.__gateway.register_rpc_request_timeout(content,
-                                                            timeout,
-                                                            expected_response_topic,
-                                                            self.rpc_cancel_processing)
-
-                # Wait for RPC to be successfully enqueued, which never fails.
-                while self.__gateway.is_rpc_in_progress(expected_response_topic):
-                    sleep(0.1)
+                # Start listening on the response topic, unless it is covered by an acknowledged wildcard subscription
+                # (values substituted into the expression may contain "/" and not match the filter).
+                # The broker handles the subscription before the request published after it, so there is no need
+                # to wait for the subscription ack. A response topic without tags is the filter itself, it is not
+                # subscribed again, as unsubscribing it after the response would remove the wildcard subscription
+                response_topic_filter = self.__get_rpc_response_topic_filter(rpc_config["responseTopicExpression"])
+                if ((response_topic_filter not in self.__rpc_response_subscriptions
+                     or not topic_matches_sub(response_topic_filter, expected_response_topic))
+                        and expected_response_topic not in self.__pending_rpc_response_subscriptions):
+                    self.__log.info("Subscribing to: %s", expected_response_topic)
+                    self.__subscribe(expected_response_topic, rpc_config.get("responseTopicQoS", 1))
+                    subscribed_response_topic = expected_response_topic
+
+                # The request waits for the response before it is published, so a fast response is not missed
+                response_future = self.__pending_rpc_requests.add(expected_response_topic, timeout)
 
             elif expects_response and not defines_timeout:
                 self.__log.info("2-way RPC without timeout: treating as 1-way")
@@ -998,6 +1105,10 @@ class MqttConnector(Connector, Thread):
                     result = self._publish(request_topic, data_to_send, rpc_config.get('retain', False), rpc_config.get('qos', 0))
                 except Exception as e:
                     self.__log.exception("Error during publishing to target broker: %r", e)
+                    if response_future is not None:
+                        self.__pending_rpc_requests.remove(expected_response_topic, response_future)
+                        if subscribed_response_topic is not None:
+                            self._client.unsubscribe(subscribed_response_topic)
                     self.__gateway.send_rpc_reply(device=content.get("device"),
                                                   req_id=content["data"]["id"],
                                                   content={
@@ -1009,6 +1120,9 @@ class MqttConnector(Connector, Thread):
                     self.__log.info("One-way RPC: sending ack to ThingsBoard immediately")
                     self.__gateway.send_rpc_reply(device=content.get('device'), req_id=content["data"]["id"],
                                                   success_sent=result is not None, to_connector_rpc=True if content.get('device') is None else False) # noqa
+                else:
+                    response_future.add_done_callback(
+                        partial(self.__on_rpc_response, content, subscribed_response_topic))
 
                 # Everything went out smoothly: RPC is served
                 return
@@ -1075,6 +1189,23 @@ class MqttConnector(Connector, Thread):
             self.__log.error("Error during publishing to target broker: %r", e)
         return result
 
+    def __on_rpc_response(self, content, subscribed_response_topic, response_future):
+        try:
+            response = response_future.result()
+        except Exception as e:
+            self.__log.error("RPC request %s to device %s is not completed: %s",
+                             content["data"]["id"], content.get("device"), e)
+            if subscribed_response_topic is not None:
+                self.rpc_cancel_processing(subscribed_response_topic)
+            self.__gateway.send_rpc_reply(device=content.get("device"), req_id=content["data"]["id"],
+                                          success_sent=False)
+            return
+
+        self.__log.info("RPC response arrived. Forwarding it to thingsboard.")
+        if subscribed_response_topic is not None:
+            self._client.unsubscribe(subscribed_response_topic)
+        self.__gateway.send_rpc_reply(content.get("device"), content["data"]["id"], response)
+
     def rpc_cancel_processing(self, topic):
         self.__log.info("RPC canceled or terminated. Unsubscribing from %s", topic)
         self._client.unsubscribe(topic)
@@ -1094,22 +1225,20 @@ class MqttConnector(Connector, Thread):
             self.__msg_queue = incoming_queue
             self.__send_result = send_result
             self.__batch_size = batch_size
-            self.__stop_event = Event()
 
         def run(self):
             while not self.stopped:
                 try:
-                    batch = []
-                    for _ in range(self.__batch_size):
+                    try:
+                        batch = [self.__msg_queue.get(timeout=MqttConnector.QUEUE_GET_TIMEOUT)]
+                    except Empty:
+                        continue
+                    for _ in range(self.__batch_size - 1):
                         try:
                             batch.append(self.__msg_queue.get_nowait())
                         except Empty:
                             break
 
-                    if not batch:
-                        self.__stop_event.wait(0.01)
-                        continue
-
                     for convert_function, config, incoming_data in batch:
                         converted_data: Union[ConvertedData, List[ConvertedData]] = convert_function(config, incoming_data)
                         if isinstance(converted_data, ConvertedData):
@@ -1129,4 +1258,3 @@ class MqttConnector(Connector, Thread):
 
         def stop(self):
             self.stopped = True
-            self.__stop_event.set()
@@ -16,6 +16,11 @@ from thingsboard_gateway.connectors.converter import Converter, abstractmethod
 
 
 class MqttUplinkConverter(Converter):
+    """
+    Converters with the SUPPORTS_BYTES_PAYLOAD attribute get the raw message payload, others get the payload
+    decoded by TBUtility.decode. The payload is decoded once per message and the decoded content is shared
+    between all converters of the message topic, so converters must not modify it.
+    """
 
     @abstractmethod
     def convert(self, config, data):
@@ -0,0 +1,107 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from collections import deque
+from concurrent.futures import Future
+from heapq import heappop, heappush
+from itertools import count
+from threading import Lock
+from time import time
+from typing import Deque, Dict
+
+
+class _PendingRpcRequest:
+    __slots__ = ['response_topic', 'deadline', 'future', 'finished']
+
+    def __init__(self, response_topic, deadline):
+        self.response_topic = response_topic
+        self.deadline = deadline
+        self.future = Future()
+        self.finished = False
+
+
+class PendingRpcRequests:
+    """
+    Two-way RPC requests waiting for responses from devices, correlated by the expected response topic
+    (which usually contains the request id). Every request is a future, completed with the response content
+    or with TimeoutError when the response did not arrive before the deadline (in milliseconds).
+    Requests expecting a response on the same topic are completed in the order they were added.
+    """
+
+    def __init__(self):
+        self.__lock = Lock()
+        self.__requests: Dict[str, Deque[_PendingRpcRequest]] = {}
+        self.__deadlines = []
+        self.__sequence = count()
+
+    def __len__(self):
+        return sum(len(requests) for requests in self.__requests.values())
+
+    def add(self, response_topic: str, deadline: float) -> Future:
+        request = _PendingRpcRequest(response_topic, deadline)
+        with self.__lock:
+            requests = self.__requests.get(response_topic)
+            if requests is None:
+                requests = self.__requests[response_topic] = deque()
+            requests.append(request)
+            heappush(self.__deadlines, (deadline, next(self.__sequence), request))
+        return request.future
+
+    def complete(self, response_topic: str, response) -> bool:
+        with self.__lock:
+            requests = self.__requests.get(response_topic)
+            if not requests:
+                return False
+            request = self.__pop(requests)
+        request.future.set_result(response)
+        return True
+
+    def remove(self, response_topic: str, future: Future) -> bool:
+        """Removes the request without completing its future, e.g. when the request was not sent to the device."""
+        with self.__lock:
+            requests = self.__requests.get(response_topic, ())
+            for request in requests:
+                if request.future is future:
+                    requests.remove(request)
+                    request.finished = True
+                    if not requests:
+                        del self.__requests[response_topic]
+                    return True
+        return False
+
+    def cancel_expired(self, now=None) -> int:
+        if now is None:
+            now = time() * 1000
+        expired_requests = []
+        with self.__lock:
+            while self.__deadlines and self.__deadlines[0][0] <= now:
+                _, _, request = heappop(self.__deadlines)
+                if request.finished:
+                    continue
+                requests = self.__requests[request.response_topic]
+                requests.remove(request)
+                request.finished = True
+                if not requests:
+                    del self.__requests[request.response_topic]
+                expired_requests.append(request)
+        for request in expired_requests:
+            request.future.set_exception(TimeoutError("No response on topic %s" % request.response_topic))
+        return len(expired_requests)
+
+    def __pop(self, requests):
+        request = requests.popleft()
+        request.finished = True
+        if not requests:
+            del self.__requests[request.response_topic]
+        return request
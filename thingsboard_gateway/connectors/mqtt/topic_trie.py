@@ -0,0 +1,111 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from re import compile as compile_regex
+from typing import Dict, List, Tuple
+
+SINGLE_LEVEL_REGEX = "[^/]+"
+MULTI_LEVEL_REGEX = ".+"
+ESCAPED_DOLLAR = "\\$"
+# "[^/]+" contains the levels separator, so it is replaced before splitting with a character forbidden in MQTT topics
+SINGLE_LEVEL_PLACEHOLDER = "\0"
+REGEX_SPECIAL_CHARACTERS = frozenset('.^$*+?{}[]\\|()')
+
+
+class _TopicTrieNode:
+    __slots__ = ['children', 'single_level', 'multi_level_handlers', 'handlers']
+
+    def __init__(self):
+        self.children: Dict[str, '_TopicTrieNode'] = {}
+        self.single_level = None
+        self.multi_level_handlers: List[Tuple[int, str, str]] = []
+        self.handlers: List[Tuple[int, str, str]] = []
+
+
+class TopicTrie:
+    """
+    Matches a topic against the regular expressions made from the subscribed topic filters
+    by TBUtility.topic_to_regex, in one walk proportional to the topic depth.
+    Every regular expression is added with the kind of its handler (data mapping, connect request etc.),
+    match returns the matched expressions of every kind in the order they were added, as the linear
+    fullmatch scan over the handlers dicts did.
+    Levels "[^/]+" and a trailing ".+" are the + and # wildcards, other levels must be plain names,
+    expressions that do not fit (e.g. with regular expression syntax inside a level) are matched with fullmatch.
+    """
+
+    def __init__(self):
+        self.__root = _TopicTrieNode()
+        self.__regex_handlers = []
+        self.__handlers_count = 0
+
+    def __len__(self):
+        return self.__handlers_count
+
+    def add(self, regex_topic: str, kind: str):
+        handler = (self.__handlers_count, kind, regex_topic)
+        self.__handlers_count += 1
+
+        levels = regex_topic.replace(SINGLE_LEVEL_REGEX, SINGLE_LEVEL_PLACEHOLDER).split('/')
+        node = self.__root
+        for level_index, level in enumerate(levels):
+            if level == MULTI_LEVEL_REGEX and level_index == len(levels) - 1:
+                node.multi_level_handlers.append(handler)
+                return
+            if level == SINGLE_LEVEL_PLACEHOLDER:
+                if node.single_level is None:
+                    node.single_level = _TopicTrieNode()
+                node = node.single_level
+                continue
+            level_characters = set(level.replace(ESCAPED_DOLLAR, ''))
+            if SINGLE_LEVEL_PLACEHOLDER in level_characters or REGEX_SPECIAL_CHARACTERS & level_characters:
+                self.__regex_handlers.append((compile_regex(regex_topic), handler))
+                return
+            level = level.replace(ESCAPED_DOLLAR, '$')
+            child = node.children.get(level)
+            if child is None:
+                child = node.children[level] = _TopicTrieNode()
+            node = child
+        node.handlers.append(handler)
+
+    def match(self, topic: str) -> Dict[str, List[str]]:
+        levels = topic.split('/')
+        levels_count = len(levels)
+        matched_handlers = []
+        nodes = [(self.__root, 0)]
+        while nodes:
+            node, level_index = nodes.pop()
+            # ".+" needs at least one character after the separator
+            if node.multi_level_handlers and (levels_count - level_index > 1 or
+                                              (level_index < levels_count and levels[level_index])):
+                matched_handlers.extend(node.multi_level_handlers)
+            if level_index == levels_count:
+                matched_handlers.extend(node.handlers)
+                continue
+            level = levels[level_index]
+            child = node.children.get(level)
+            if child is not None:
+                nodes.append((child, level_index + 1))
+            if node.single_level is not None and level:
+                nodes.append((node.single_level, level_index + 1))
+
+        for regex, handler in self.__regex_handlers:
+            if regex.fullmatch(topic):
+                matched_handlers.append(handler)
+
+        matched = {}
+        if len(matched_handlers) > 1:
+            matched_handlers.sort()
+        for _, kind, regex_topic in matched_handlers:
+            matched.setdefault(kind, []).append(regex_topic)
+        return matched
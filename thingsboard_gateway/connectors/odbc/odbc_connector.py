@@ -26,6 +26,7 @@ from simplejson import dumps, load
 from thingsboard_gateway.gateway.constants import TELEMETRY_PARAMETER
 from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
 from thingsboard_gateway.gateway.statistics.decorators import CollectAllReceivedBytesStatistics
+from thingsboard_gateway.tb_utility.tb_evaluator import TBEvaluator
 from thingsboard_gateway.tb_utility.tb_loader import TBModuleLoader
 from thingsboard_gateway.tb_utility.tb_utility import TBUtility
 from thingsboard_gateway.tb_utility.tb_logger import init_logger
@@ -81,6 +82,8 @@ class OdbcConnector(Connector, Thread):
         self.__iterator_file_name = ""
 
         self.__devices = {}
+        self.__device_name_expression = None
+        self.__device_type_expression = None
 
         self.__column_names = []
         self.__attribute_columns = []
@@ -356,9 +359,15 @@ class OdbcConnector(Connector, Thread):
             StatisticsService.count_connector_message(self._log.name, 'convertersTsProduced',
                                                       count=converted_data.telemetry_datapoints_count)
 
-            converted_data.device_name = eval(self.__config["mapping"]["device"]["name"], globals(), data)
+            if self.__device_name_expression is None:
+                self.__device_name_expression = TBEvaluator.compile_trusted(
+                    self.__config["mapping"]["device"]["name"], globals())
+            converted_data.device_name = self.__device_name_expression.evaluate(data)
 
-            device_type = eval(self.__config["mapping"]["device"]["type"], globals(), data)
+            if self.__device_type_expression is None:
+                self.__device_type_expression = TBEvaluator.compile_trusted(
+                    self.__config["mapping"]["device"]["type"], globals())
+            device_type = self.__device_type_expression.evaluate(data)
             if not device_type:
                 device_type = self.__config["mapping"]["device"].get("type", "default")
             converted_data.device_type = device_type
@@ -19,6 +19,7 @@ from thingsboard_gateway.gateway.entities.report_strategy_config import ReportSt
 from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
 from thingsboard_gateway.gateway.statistics.decorators import CollectStatistics
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
+from thingsboard_gateway.tb_utility.tb_evaluator import TBEvaluator
 from thingsboard_gateway.tb_utility.tb_utility import TBUtility
 
 
@@ -28,6 +29,15 @@ class OdbcUplinkConverter(OdbcConverter):
 
     def __init__(self, logger):
         self._log = logger
+        self.__expressions = {}
+
+    def __get_expression(self, config_item, parameter):
+        cached_expression = self.__expressions.get((id(config_item), parameter))
+        if cached_expression is not None and cached_expression[0] is config_item:
+            return cached_expression[1]
+        expression = TBEvaluator.compile_trusted(config_item[parameter], globals())
+        self.__expressions[(id(config_item), parameter)] = (config_item, expression)
+        return expression
 
     @CollectStatistics(start_stat_type='receivedBytesFromDevices',
                        end_stat_type='convertedBytesFromDevice')
@@ -80,7 +90,7 @@ class OdbcUplinkConverter(OdbcConverter):
                             continue
                     elif isinstance(config_item, dict):
                         if "nameExpression" in config_item:
-                            name = eval(config_item["nameExpression"], globals(), data)
+                            name = self.__get_expression(config_item, "nameExpression").evaluate(data)
                         else:
                             name = config_item["name"]
                         full_key = TBUtility.convert_key_to_datapoint_key(name, device_report_strategy, config_item, self._log)
@@ -88,7 +98,7 @@ class OdbcUplinkConverter(OdbcConverter):
                         if "column" in config_item:
                             value = data[config_item["column"]]
                         elif "value" in config_item:
-                            value = eval(config_item["value"], globals(), data)
+                            value = self.__get_expression(config_item, "value").evaluate(data)
                         else:
                             StatisticsService.count_connector_message(self._log.name, 'convertersMsgDropped')
                             self._log.error("Failed to convert SQL data to TB format: no column/value configuration item")
@@ -29,6 +29,7 @@ from cachetools import TTLCache
 from thingsboard_gateway.connectors.connector import Connector
 from thingsboard_gateway.gateway.constants import CONNECTOR_PARAMETER, RECEIVED_TS_PARAMETER, CONVERTED_TS_PARAMETER, \
     DATA_RETRIEVING_STARTED, REPORT_STRATEGY_PARAMETER, ON_ATTRIBUTE_UPDATE_DEFAULT_TIMEOUT
+from thingsboard_gateway.gateway.entities.columnar_converted_data import ColumnarConvertedData
 from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
 from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
@@ -734,8 +735,9 @@ class OpcUaConnector(Connector, Thread):
                         if sub_node.nodeid not in device.nodes_data_change_subscriptions:
                             continue
                         if device not in device_converted_data_map:
-                            device_converted_data_map[device] = ConvertedData(device_name=device.name,
-                                                                              device_type=device.device_profile)
+                            device_converted_data_map[device] = ColumnarConvertedData(
+                                device_name=device.name,
+                                device_type=device.device_profile)
 
                         nodes_configs = device.nodes_data_change_subscriptions[sub_node.nodeid]['nodes_configs']
                         nodes_values = [data.monitored_item.Value for _ in range(len(nodes_configs))]
@@ -749,11 +751,7 @@ class OpcUaConnector(Connector, Thread):
                                 CONVERTED_TS_PARAMETER: int(time() * 1000)
                             })
 
-                            for node_config in nodes_configs:
-                                if node_config['section'] == 'attributes':
-                                    device_converted_data_map[device].add_to_attributes(converted_data.attributes)
-                                else:
-                                    device_converted_data_map[device].add_to_telemetry(converted_data.telemetry)
+                            device_converted_data_map[device].extend(converted_data)
                     except Exception as e:
                         self.__log.exception("Error converting data: %s", e)
 
@@ -19,11 +19,12 @@ from asyncua.ua.uatypes import VariantType
 
 from thingsboard_gateway.connectors.opcua.opcua_converter import OpcUaConverter
 from thingsboard_gateway.gateway.constants import TELEMETRY_PARAMETER, ATTRIBUTES_PARAMETER, REPORT_STRATEGY_PARAMETER
+from thingsboard_gateway.gateway.entities.columnar_converted_data import ColumnarConvertedData
 from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.gateway.entities.datapoint_keys_cache import DatapointKeysCache
 from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
 from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
-from thingsboard_gateway.tb_utility.tb_utility import TBUtility
 
 DATA_TYPES = {
     'attributes': ATTRIBUTES_PARAMETER,
@@ -52,30 +53,18 @@ class OpcUaUplinkConverter(OpcUaConverter):
     def __init__(self, config, logger):
         self._log = logger
         self.__config = config
+        self.__device_report_strategy = None
+        try:
+            self.__device_report_strategy = ReportStrategyConfig(self.__config.get(REPORT_STRATEGY_PARAMETER))
+        except ValueError as e:
+            self._log.trace("Report strategy config is not specified for device %s: %s",
+                            self.__config.get('device_name'), e)
+        self.__datapoint_keys = DatapointKeysCache(self._log)
 
     def process_datapoint(self, config, val, basic_timestamp, device_report_strategy):
         try:
-            error = None
-            data = val.Value.Value
-            if isinstance(data, list):
-                data = [str(item) for item in data]
-            else:
-                handler = VARIANT_TYPE_HANDLERS.get(val.Value.VariantType, lambda d: d if not hasattr(d, 'to_string') else d.to_string())
-                data = handler(data)
-
-            if data is None and val.StatusCode.is_bad():
-                data = str.format(ERROR_MSG_TEMPLATE,val.StatusCode.name, val.data_type, val.StatusCode.doc)
-                error = True
-
-            timestamp_location = config.get('timestampLocation', 'gateway').lower()
-            timestamp = basic_timestamp  # Default timestamp
-            if timestamp_location == 'sourcetimestamp' and val.SourceTimestamp is not None:
-                timestamp = val.SourceTimestamp.timestamp() * 1000
-            elif timestamp_location == 'servertimestamp' and val.ServerTimestamp is not None:
-                timestamp = val.ServerTimestamp.timestamp() * 1000
-
-            section = DATA_TYPES[config['section']]
-            datapoint_key = TBUtility.convert_key_to_datapoint_key(config['key'], device_report_strategy, config, self._log)
+            section, datapoint_key, data, timestamp, error = self.__parse_datapoint(config, val, basic_timestamp,
+                                                                                    device_report_strategy)
             if section == TELEMETRY_PARAMETER:
                 return TelemetryEntry({datapoint_key: data}, ts=timestamp), error
             elif section == ATTRIBUTES_PARAMETER:
@@ -83,6 +72,30 @@ class OpcUaUplinkConverter(OpcUaConverter):
         except Exception as e:
             return None, str(e)
 
+    def __parse_datapoint(self, config, val, basic_timestamp, device_report_strategy):
+        error = None
+        data = val.Value.Value
+        if isinstance(data, list):
+            data = [str(item) for item in data]
+        else:
+            handler = VARIANT_TYPE_HANDLERS.get(val.Value.VariantType, lambda d: d if not hasattr(d, 'to_string') else d.to_string())
+            data = handler(data)
+
+        if data is None and val.StatusCode.is_bad():
+            data = str.format(ERROR_MSG_TEMPLATE,val.StatusCode.name, val.data_type, val.StatusCode.doc)
+            error = True
+
+        timestamp_location = config.get('timestampLocation', 'gateway').lower()
+        timestamp = basic_timestamp  # Default timestamp
+        if timestamp_location == 'sourcetimestamp' and val.SourceTimestamp is not None:
+            timestamp = val.SourceTimestamp.timestamp() * 1000
+        elif timestamp_location == 'servertimestamp' and val.ServerTimestamp is not None:
+            timestamp = val.ServerTimestamp.timestamp() * 1000
+
+        section = DATA_TYPES[config['section']]
+        datapoint_key = self.__datapoint_keys.get(config['key'], device_report_strategy, config)
+        return section, datapoint_key, data, timestamp, error
+
     def convert(self, configs, values) -> ConvertedData:
         StatisticsService.count_connector_message(self._log.name, 'convertersMsgProcessed')
         basic_timestamp = int(time() * 1000)
@@ -93,28 +106,23 @@ class OpcUaUplinkConverter(OpcUaConverter):
             if not isinstance(values, list):
                 values = [values]
 
-            converted_data = ConvertedData(device_name=self.__config['device_name'], device_type=self.__config['device_type'])
-
-            device_report_strategy = None
-            try:
-                device_report_strategy = ReportStrategyConfig(self.__config.get(REPORT_STRATEGY_PARAMETER))
-            except ValueError as e:
-                self._log.trace("Report strategy config is not specified for device %s: %s", self.__config['device_name'], e)
+            converted_data = ColumnarConvertedData(device_name=self.__config['device_name'],
+                                                   device_type=self.__config['device_type'])
 
-            telemetry_batch = []
-            attributes_batch = []
+            device_report_strategy = self.__device_report_strategy
 
             for config, val in zip(configs, values):
-                result, error = self.process_datapoint(config, val, basic_timestamp, device_report_strategy)
-                if result is not None:
-                    if isinstance(result, TelemetryEntry):
-                        telemetry_batch.append(result)
-                    elif isinstance(result, dict):
-                        attributes_batch.append(result)
-
-            converted_data.add_to_telemetry(telemetry_batch)
-            for attr in attributes_batch:
-                converted_data.add_to_attributes(attr)
+                try:
+                    section, datapoint_key, data, timestamp, error = self.__parse_datapoint(config, val,
+                                                                                            basic_timestamp,
+                                                                                            device_report_strategy)
+                except Exception as e:
+                    self._log.trace("Failed to process datapoint with config %s: %s", config, e)
+                    continue
+                if section == TELEMETRY_PARAMETER:
+                    converted_data.add_telemetry_datapoint(datapoint_key, data, timestamp)
+                elif section == ATTRIBUTES_PARAMETER:
+                    converted_data.add_to_attributes({datapoint_key: data})
 
             StatisticsService.count_connector_message(self._log.name, 'convertersAttrProduced', count=converted_data.attributes_datapoints_count)
             StatisticsService.count_connector_message(self._log.name, 'convertersTsProduced', count=converted_data.telemetry_datapoints_count)
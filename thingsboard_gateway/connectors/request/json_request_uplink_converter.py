@@ -21,6 +21,8 @@ from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
 from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
 from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
 from thingsboard_gateway.gateway.statistics.decorators import CollectStatistics
+from thingsboard_gateway.tb_utility.tb_expression import TBExpression
+from thingsboard_gateway.tb_utility.tb_ts_format_resolver import TBTsFormatResolver
 from thingsboard_gateway.tb_utility.tb_utility import TBUtility
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
 
@@ -31,6 +33,28 @@ class JsonRequestUplinkConverter(RequestConverter):
         self.__config = config
         self.__datatypes = {"attributes": "attributes",
                             "telemetry": "telemetry"}
+        converter_config = self.__config.get('converter', {})
+        self.__expressions = TBExpression.compile_all(
+            (converter_config.get("deviceNameJsonExpression"), converter_config.get("deviceTypeJsonExpression"),
+             *(datatype_object_config.get(option)
+               for datatype in self.__datatypes
+               for datatype_object_config in converter_config.get(datatype, [])
+               for option in ("key", "value"))))
+        self.__ts_format_resolvers = {id(key_config): (key_config, TBTsFormatResolver.from_config(key_config))
+                                      for key_config in converter_config.get("telemetry", [])
+                                      if isinstance(key_config, dict) and key_config.get('tsField') is not None}
+
+    def __get_expression(self, expression):
+        compiled_expression = self.__expressions.get(expression)
+        if compiled_expression is None:
+            compiled_expression = self.__expressions[expression] = TBExpression(expression)
+        return compiled_expression
+
+    def __get_ts_format_resolver(self, key_config):
+        cached = self.__ts_format_resolvers.get(id(key_config))
+        if cached is not None and cached[0] is key_config:
+            return cached[1]
+        return None
 
     @CollectStatistics(start_stat_type='receivedBytesFromDevices',
                        end_stat_type='convertedBytesFromDevice')
@@ -43,32 +67,14 @@ class JsonRequestUplinkConverter(RequestConverter):
 
         try:
             if self.__config['converter'].get("deviceNameJsonExpression") is not None:
-                device_name_tags = TBUtility.get_values(self.__config['converter'].get("deviceNameJsonExpression"),
-                                                        data, get_tag=True)
-                device_name_values = TBUtility.get_values(self.__config['converter'].get("deviceNameJsonExpression"),
-                                                          data, get_tag=False)
-                device_name = self.__config['converter'].get("deviceNameJsonExpression")
-                for (device_name_tag, device_name_value) in zip(device_name_tags, device_name_values):
-                    is_valid_key = "${" in self.__config['converter'].get("deviceNameJsonExpression") and "}" in \
-                                   self.__config['converter'].get("deviceNameJsonExpression")
-                    device_name = device_name.replace('${' + str(device_name_tag) + '}', str(device_name_value)) \
-                        if is_valid_key else device_name
+                device_name = self.__get_expression(self.__config['converter'].get("deviceNameJsonExpression")).render(
+                    data)
             else:
                 self.__log.error("The expression for looking \"deviceName\" not found in config %s",
                                  dumps(self.__config['converter']))
             if self.__config['converter'].get("deviceTypeJsonExpression") is not None:
-                device_type_tags = TBUtility.get_values(self.__config['converter'].get("deviceTypeJsonExpression"),
-                                                        data,
-                                                        get_tag=True)
-                device_type_values = TBUtility.get_values(self.__config['converter'].get("deviceTypeJsonExpression"),
-                                                          data,
-                                                          expression_instead_none=True)
-                device_type = self.__config['converter'].get("deviceTypeJsonExpression")
-                for (device_type_tag, device_type_value) in zip(device_type_tags, device_type_values):
-                    is_valid_key = "${" in self.__config['converter'].get("deviceTypeJsonExpression") and "}" in \
-                                   self.__config['converter'].get("deviceTypeJsonExpression")
-                    device_type = device_type.replace('${' + str(device_type_tag) + '}', str(device_type_value)) \
-                        if is_valid_key else device_type_tag
+                device_type = self.__get_expression(self.__config['converter'].get("deviceTypeJsonExpression")).render(
+                    data, expression_instead_none=True)
             else:
                 self.__log.error("The expression for looking \"deviceType\" not found in config %s",
                                  dumps(self.__config['converter']))
@@ -86,37 +92,19 @@ class JsonRequestUplinkConverter(RequestConverter):
         try:
             for datatype in self.__datatypes:
                 for datatype_object_config in self.__config["converter"].get(datatype, []):
-                    values = TBUtility.get_values(datatype_object_config["value"], data, datatype_object_config["type"],
-                                                  expression_instead_none=True)
-                    values_tags = TBUtility.get_values(datatype_object_config["value"], data,
-                                                       datatype_object_config["type"],
-                                                       get_tag=True)
-
-                    keys = TBUtility.get_values(datatype_object_config["key"], data, datatype_object_config["type"],
-                                                expression_instead_none=True)
-                    keys_tags = TBUtility.get_values(datatype_object_config["key"], data, get_tag=True)
-
-                    full_key = datatype_object_config["key"]
-                    for (key, key_tag) in zip(keys, keys_tags):
-                        is_valid_key = "${" in datatype_object_config["key"] and "}" in \
-                                       datatype_object_config["key"]
-                        full_key = full_key.replace('${' + str(key_tag) + '}',
-                                                    str(key)) if is_valid_key else key_tag
-
-                    full_value = datatype_object_config["value"]
-                    for (value, value_tag) in zip(values, values_tags):
-                        is_valid_value = "${" in datatype_object_config["value"] and "}" in \
-                                         datatype_object_config["value"]
-
-                        full_value = full_value.replace('${' + str(value_tag) + '}',
-                                                        str(value)) if is_valid_value else str(value)
+                    full_key = self.__get_expression(datatype_object_config["key"]).render(
+                        data, expression_instead_none=True)
+                    full_value = self.__get_expression(datatype_object_config["value"]).render(
+                        data, expression_instead_none=True)
 
                     datapoint_key = TBUtility.convert_key_to_datapoint_key(full_key, device_report_strategy,
                                                                            datatype_object_config, self.__log)
                     if datatype == 'attributes':
                         converted_data.add_to_attributes(datapoint_key, full_value)
                     else:
-                        ts = TBUtility.resolve_different_ts_formats(data=data, config=datatype_object_config, logger=self.__log)
+                        ts = TBUtility.resolve_different_ts_formats(
+                            data=data, config=datatype_object_config, logger=self.__log,
+                            ts_format_resolver=self.__get_ts_format_resolver(datatype_object_config))
 
                         telemetry_entry = TelemetryEntry({datapoint_key: full_value}, ts)
                         converted_data.add_to_telemetry(telemetry_entry)
@@ -21,6 +21,8 @@ from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
 from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
 from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
 from thingsboard_gateway.gateway.statistics.decorators import CollectStatistics
+from thingsboard_gateway.tb_utility.tb_expression import TBExpression
+from thingsboard_gateway.tb_utility.tb_ts_format_resolver import TBTsFormatResolver
 from thingsboard_gateway.tb_utility.tb_utility import TBUtility
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
 
@@ -30,6 +32,28 @@ class JsonRESTUplinkConverter(RESTConverter):
     def __init__(self, config, logger):
         self._log = logger
         self.__config = config
+        device_info = self.__config.get("deviceInfo", {})
+        self.__expressions = TBExpression.compile_all(
+            (device_info.get("deviceNameExpression"), device_info.get("deviceProfileExpression"),
+             *(datatype_config.get(option)
+               for datatype in ("attributes", "timeseries")
+               for datatype_config in self.__config.get(datatype, [])
+               for option in ("key", "value"))))
+        self.__ts_format_resolvers = {id(key_config): (key_config, TBTsFormatResolver.from_config(key_config))
+                                      for key_config in self.__config.get("timeseries", [])
+                                      if isinstance(key_config, dict) and key_config.get('tsField') is not None}
+
+    def __get_expression(self, expression):
+        compiled_expression = self.__expressions.get(expression)
+        if compiled_expression is None:
+            compiled_expression = self.__expressions[expression] = TBExpression(expression)
+        return compiled_expression
+
+    def __get_ts_format_resolver(self, key_config):
+        cached = self.__ts_format_resolvers.get(id(key_config))
+        if cached is not None and cached[0] is key_config:
+            return cached[1]
+        return None
 
     @CollectStatistics(start_stat_type='receivedBytesFromDevices',
                        end_stat_type='convertedBytesFromDevice')
@@ -45,16 +69,8 @@ class JsonRESTUplinkConverter(RESTConverter):
                 if device_info.get("deviceNameExpressionSource") == "constant":
                     device_name = device_info.deviceNameExpression
                 else:
-                    device_name_tags = TBUtility.get_values(device_info.get("deviceNameExpression"), data, get_tag=True)
-                    device_name_values = TBUtility.get_values(device_info.get("deviceNameExpression"), data,
-                                                              expression_instead_none=True)
-                    device_name = device_info.get("deviceNameExpression")
-                    for (device_name_tag, device_name_value) in zip(device_name_tags, device_name_values):
-                        is_valid_key = "${" in device_info.get("deviceNameExpression") and "}" in \
-                                       device_info.get("deviceNameExpression")
-                        device_name = device_name.replace('${' + str(device_name_tag) + '}',
-                                                          str(device_name_value)) \
-                            if is_valid_key else device_name_tag
+                    device_name = self.__get_expression(device_info.get("deviceNameExpression")).render(
+                        data, expression_instead_none=True)
             else:
                 self._log.error("The expression for looking \"device name\" not found in config %s",
                                 dumps(device_info))
@@ -63,17 +79,8 @@ class JsonRESTUplinkConverter(RESTConverter):
                 if device_info.get("deviceProfileExpressionSource") == "constant":
                     device_type = device_info.get("deviceProfileExpression")
                 else:
-                    device_profile_tags = TBUtility.get_values(device_info.get("deviceProfileExpression"), data,
-                                                               get_tag=True)
-                    device_profile_values = TBUtility.get_values(device_info.get("deviceProfileExpression"), data,
-                                                                 expression_instead_none=True)
-                    device_type = device_info.get("deviceProfileExpression")
-                    for (device_profile_tag, device_profile_value) in zip(device_profile_tags, device_profile_values):
-                        is_valid_key = "${" in device_info.get("deviceProfileExpression") and "}" in \
-                                       device_info.get("deviceProfileExpression")
-                        device_type = device_type.replace('${' + str(device_profile_tag) + '}',
-                                                          str(device_profile_value)) \
-                            if is_valid_key else device_profile_tag
+                    device_type = self.__get_expression(device_info.get("deviceProfileExpression")).render(
+                        data, expression_instead_none=True)
             else:
                 self._log.error("The expression for looking \"device profile\" not found in config %s",
                                 dumps(device_info))
@@ -92,29 +99,8 @@ class JsonRESTUplinkConverter(RESTConverter):
         try:
             for datatype in datatypes:
                 for datatype_config in self.__config.get(datatype, []):
-                    values = TBUtility.get_values(datatype_config["value"], data, datatype_config["type"],
-                                                  expression_instead_none=False)
-                    values_tags = TBUtility.get_values(datatype_config["value"], data, datatype_config["type"],
-                                                       get_tag=True)
-
-                    keys = TBUtility.get_values(datatype_config["key"], data, datatype_config["type"],
-                                                expression_instead_none=False)
-                    keys_tags = TBUtility.get_values(datatype_config["key"], data, get_tag=True)
-
-                    full_key = datatype_config['key']
-                    for (key_tag, key) in zip(keys_tags, keys):
-                        is_valid_key = "${" in datatype_config["key"] and "}" in \
-                                       datatype_config["key"]
-                        full_key = full_key.replace('${' + str(key_tag) + '}',
-                                                    str(key)) if is_valid_key else key
-
-                    full_value = datatype_config['value']
-                    for (value_tag, value) in zip(values_tags, values):
-                        is_valid_value = "${" in datatype_config["value"] and "}" in \
-                                         datatype_config["value"]
-
-                        full_value = full_value.replace('${' + str(value_tag) + '}',
-                                                        str(value)) if is_valid_value else value
+                    full_key = self.__get_expression(datatype_config["key"]).render(data)
+                    full_value = self.__get_expression(datatype_config["value"]).render(data)
 
                     if full_key != 'None' and full_value != 'None':
                         datapoint_key = TBUtility.convert_key_to_datapoint_key(full_key, device_report_strategy,
@@ -122,7 +108,9 @@ class JsonRESTUplinkConverter(RESTConverter):
                         if datatype == 'attributes':
                             converted_data.add_to_attributes(datapoint_key, full_value)
                         else:
-                            ts = TBUtility.resolve_different_ts_formats(data=data, config=datatype_config, logger=self._log)
+                            ts = TBUtility.resolve_different_ts_formats(
+                                data=data, config=datatype_config, logger=self._log,
+                                ts_format_resolver=self.__get_ts_format_resolver(datatype_config))
                             telemetry_entry = TelemetryEntry({datapoint_key: full_value}, ts)
                             converted_data.add_to_telemetry(telemetry_entry)
         except Exception as e:
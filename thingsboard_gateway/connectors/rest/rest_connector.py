@@ -668,7 +668,8 @@ class BasicDataHandler(BaseDataHandler):
 
             try:
                 StatisticsService.count_connector_message(self.name, stat_parameter_name='connectorMsgsReceived')
-                StatisticsService.count_connector_bytes(self.name, data, stat_parameter_name='connectorBytesReceived')
+                StatisticsService.count_connector_bytes(self.name, data, stat_parameter_name='connectorBytesReceived',
+                                                        bytes_count=request.content_length)
 
                 self.log.info("CONVERTER CONFIG: %r", endpoint_config['converter'])
 
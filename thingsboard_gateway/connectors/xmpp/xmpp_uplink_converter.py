@@ -22,6 +22,7 @@ from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
 from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
 from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
 from thingsboard_gateway.gateway.statistics.decorators import CollectStatistics
+from thingsboard_gateway.tb_utility.tb_expression import TBExpression
 from thingsboard_gateway.tb_utility.tb_utility import TBUtility
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
 
@@ -32,36 +33,27 @@ class XmppUplinkConverter(XmppConverter):
         self.__config = config
         self._datatypes = {"attributes": "attributes",
                            "timeseries": "telemetry"}
+        self.__expressions = TBExpression.compile_all(
+            (self.__config.get("deviceNameExpression"), self.__config.get("deviceTypeExpression"),
+             *(datatype_config.get(option)
+               for datatype in self._datatypes
+               for datatype_config in self.__config.get(datatype, [])
+               for option in ("key", "value"))))
+
+    def __get_expression(self, expression):
+        compiled_expression = self.__expressions.get(expression)
+        if compiled_expression is None:
+            compiled_expression = self.__expressions[expression] = TBExpression(expression)
+        return compiled_expression
 
     def _convert_json(self, val):
         try:
             data = json.loads(val)
 
-            device_name_tags = TBUtility.get_values(self.__config.get("deviceNameExpression"), data,
-                                                    get_tag=True)
-            device_name_values = TBUtility.get_values(self.__config.get("deviceNameExpression"), data,
-                                                      expression_instead_none=True)
-
-            device_name = self.__config.get("deviceNameExpression")
-            for (device_name_tag, device_name_value) in zip(device_name_tags, device_name_values):
-                is_valid_key = "${" in self.__config.get("deviceNameExpression") and "}" in \
-                               self.__config.get("deviceNameExpression")
-                device_name = device_name.replace('${' + str(device_name_tag) + '}',
-                                                                              str(device_name_value)) \
-                    if is_valid_key else device_name_tag
-
-            device_type_tags = TBUtility.get_values(self.__config.get("deviceTypeExpression"), data,
-                                                    get_tag=True)
-            device_type_values = TBUtility.get_values(self.__config.get("deviceTypeExpression"), data,
-                                                      expression_instead_none=True)
-
-            device_type = self.__config.get("deviceTypeExpression")
-            for (device_type_tag, device_type_value) in zip(device_type_tags, device_type_values):
-                is_valid_key = "${" in self.__config.get("deviceTypeExpression") and "}" in \
-                               self.__config.get("deviceTypeExpression")
-                device_type = device_type.replace('${' + str(device_type_tag) + '}',
-                                                                              str(device_type_value)) \
-                    if is_valid_key else device_type_tag
+            device_name = self.__get_expression(self.__config.get("deviceNameExpression")).render(
+                data, expression_instead_none=True)
+            device_type = self.__get_expression(self.__config.get("deviceTypeExpression")).render(
+                data, expression_instead_none=True)
 
             device_report_strategy = self._get_device_report_strategy(device_name)
 
@@ -69,29 +61,8 @@ class XmppUplinkConverter(XmppConverter):
 
             for datatype in self._datatypes:
                 for datatype_config in self.__config.get(datatype, []):
-                    values = TBUtility.get_values(datatype_config["value"], data, "json",
-                                                  expression_instead_none=False)
-                    values_tags = TBUtility.get_values(datatype_config["value"], data, "json",
-                                                       get_tag=True)
-
-                    keys = TBUtility.get_values(datatype_config["key"], data, "json",
-                                                expression_instead_none=False)
-                    keys_tags = TBUtility.get_values(datatype_config["key"], data, get_tag=True)
-
-                    full_key = datatype_config["key"]
-                    for (key, key_tag) in zip(keys, keys_tags):
-                        is_valid_key = "${" in datatype_config["key"] and "}" in \
-                                       datatype_config["key"]
-                        full_key = full_key.replace('${' + str(key_tag) + '}',
-                                                    str(key)) if is_valid_key else key_tag
-
-                    full_value = datatype_config["value"]
-                    for (value, value_tag) in zip(values, values_tags):
-                        is_valid_value = "${" in datatype_config["value"] and "}" in \
-                                         datatype_config["value"]
-
-                        full_value = full_value.replace('${' + str(value_tag) + '}',
-                                                        str(value)) if is_valid_value else value
+                    full_key = self.__get_expression(datatype_config["key"]).render(data)
+                    full_value = self.__get_expression(datatype_config["value"]).render(data)
 
                     if full_key != 'None' and full_value != 'None':
                         datapoint_key = TBUtility.convert_key_to_datapoint_key(full_key, device_report_strategy,
@@ -38,6 +38,7 @@ CONFIG_DEVICES_SECTION_PARAMETER = "devices"
 
 CONNECTED_DEVICES_FILENAME = "connected_devices.json"
 PERSISTENT_GRPC_CONNECTORS_KEY_FILENAME = "persistent_keys.json"
+REPORT_STRATEGY_DATA_CACHE_FILENAME = "report_strategy_data_cache.json"
 
 RENAMING_PARAMETER = "renaming"
 DISCONNECTED_PARAMETER = "disconnected"
@@ -66,6 +67,7 @@ RECEIVED_TS_PARAMETER = "receivedTs"
 CONVERTED_TS_PARAMETER = "convertedTs"
 SEND_TO_STORAGE_TS_PARAMETER = "sendToStorageTs"
 DATA_RETRIEVING_STARTED = "dataRetrieveStartedTs"
+LATENCY_TIMESTAMPS_PARAMETER = "latencyTs"
 
 # Size of metadata that will be added to messages in debug mode
 # Connector name length should be added to the size of the metadata
@@ -1,12 +1,61 @@
 import re
+from logging import getLogger
 
 import simplejson
 
+REGEX_SPECIAL_CHARACTERS = frozenset('.^$*+?{}[]\\|()')
+BACKREFERENCE_PATTERN = re.compile(r'\\[1-9]|\(\?P=')
+
+
+class CompiledDeviceNamePatterns:
+    """
+    Device name patterns of a connector, matched with re.fullmatch semantics. Plain names are checked
+    in a set, other patterns are joined into one alternation (patterns with backreferences are kept apart,
+    because joining renumbers their groups).
+    """
+
+    __slots__ = ['names', 'regexes']
+
+    def __init__(self, patterns):
+        self.names = set()
+        self.regexes = []
+        alternation_patterns = []
+        for pattern in patterns:
+            if not REGEX_SPECIAL_CHARACTERS.intersection(pattern):
+                self.names.add(pattern)
+                continue
+            try:
+                compiled_pattern = re.compile(pattern)
+            except re.error as e:
+                getLogger("service").error("Device filter pattern %r is invalid and will be ignored: %s", pattern, e)
+                continue
+            if BACKREFERENCE_PATTERN.search(pattern):
+                self.regexes.append(compiled_pattern)
+            else:
+                alternation_patterns.append(pattern)
+        if alternation_patterns:
+            try:
+                self.regexes.insert(0, re.compile('|'.join('(?:%s)' % pattern for pattern in alternation_patterns)))
+            except re.error:
+                # E.g. the same group names or global flags in different patterns
+                self.regexes[:0] = [re.compile(pattern) for pattern in alternation_patterns]
+
+    def match(self, device_name) -> bool:
+        if device_name in self.names:
+            return True
+        for regex in self.regexes:
+            if regex.fullmatch(device_name):
+                return True
+        return False
+
 
 class DeviceFilter:
+    MAX_CACHED_DECISIONS = 10000
+
     def __init__(self, config_path):
         self._config_path = config_path
         self._config = self._load_config()
+        self.__compile()
 
     def _load_config(self):
         if self._config_path:
@@ -15,17 +64,20 @@ class DeviceFilter:
 
         return {'deny': {}, 'allow': {}}
 
+    def __compile(self):
+        # A device is forbidden only by a deny entry, devices matching no entry are allowed as well as allowed ones,
+        # so allow entries do not take part in the decision
+        self.__deny_patterns = {connector_name: CompiledDeviceNamePatterns(device_list)
+                                for connector_name, device_list in self._config.get('deny', {}).items()}
+        self.__decisions = {}
+
     def validate_device(self, connector_name, data):
-        for con_name, device_list in self._config['deny'].items():
-            if con_name == connector_name:
-                for device in device_list:
-                    if re.fullmatch(device, data['deviceName']):
-                        return False
-
-        for con_name, device_list in self._config['allow'].items():
-            if con_name == connector_name:
-                for device in device_list:
-                    if re.fullmatch(device, data['deviceName']):
-                        return True
-
-        return True
+        device_name = data['deviceName']
+        decision = self.__decisions.get((connector_name, device_name))
+        if decision is None:
+            deny_patterns = self.__deny_patterns.get(connector_name)
+            decision = deny_patterns is None or not deny_patterns.match(device_name)
+            if len(self.__decisions) >= self.MAX_CACHED_DECISIONS:
+                self.__decisions.clear()
+            self.__decisions[(connector_name, device_name)] = decision
+        return decision
@@ -0,0 +1,220 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from array import array
+from time import time
+from typing import Dict, Iterator, List, Tuple, Union, Any
+
+from thingsboard_gateway.gateway.constants import TELEMETRY_TIMESTAMP_PARAMETER, TELEMETRY_VALUES_PARAMETER
+from thingsboard_gateway.gateway.entities.attributes import Attributes
+from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
+from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
+from thingsboard_gateway.tb_utility.tb_utility import TBUtility
+
+
+class ColumnarConvertedData(ConvertedData):
+    """
+    ConvertedData that keeps telemetry in parallel columns of timestamps, key indexes and values,
+    with every datapoint key stored once in the shared key table.
+    It is intended for connectors that produce a lot of samples per device, where a TelemetryEntry
+    object per sample is too expensive.
+    Samples with the same key and timestamp are coalesced on serialization, the last one wins.
+    Timestamps are kept in a compact integer column until a timestamp that is not an integer
+    (e.g. with a fraction of a millisecond) is added, then the column becomes a list and keeps them as is.
+    """
+
+    __slots__ = ['_keys', '_keys_indexes', '_ts_column', '_key_index_column', '_values_column']
+
+    def __init__(self, device_name, device_type='default', metadata=None):
+        self.device_name = device_name
+        self.device_type = device_type
+        self.attributes: Attributes = Attributes()
+        self.metadata = metadata or {}
+        self._keys: List[DatapointKey] = []
+        self._keys_indexes: Dict[DatapointKey, int] = {}
+        self._ts_column = array('q')
+        self._key_index_column = array('L')
+        self._values_column = []
+
+    def to_dict(self, debug_enabled=False):
+        result = {
+            "deviceName": self.device_name,
+            "deviceType": self.device_type,
+            "telemetry": [{TELEMETRY_TIMESTAMP_PARAMETER: ts, TELEMETRY_VALUES_PARAMETER: values}
+                          for ts, values in self.__group_by_ts(True).items()],
+            "attributes": self.attributes.to_dict()
+        }
+        if debug_enabled:
+            result["metadata"] = self.metadata
+        return result
+
+    @property
+    def telemetry(self) -> Tuple[TelemetryEntry, ...]:
+        """
+        Read-only view of the telemetry, built from the columns on every access.
+        Changes of the returned entries are not kept, use add_to_telemetry or assign the telemetry instead.
+        """
+        return tuple(TelemetryEntry(values, ts) for ts, values in self.__group_by_ts(False).items())
+
+    @telemetry.setter
+    def telemetry(self, telemetry_entries):
+        self._keys = []
+        self._keys_indexes = {}
+        self._ts_column = array('q')
+        self._key_index_column = array('L')
+        self._values_column = []
+        self.add_to_telemetry(telemetry_entries)
+
+    @property
+    def ts_index(self):
+        return {ts: index for index, ts in enumerate(dict.fromkeys(self._ts_column))}
+
+    @property
+    def telemetry_datapoints_count(self):
+        return len(self._values_column)
+
+    def add_telemetry_datapoint(self, datapoint_key: Union[DatapointKey, str], value, ts=None):
+        if ts is None:
+            ts = int(time() * 1000)
+        key_index = self._keys_indexes.get(datapoint_key)
+        if key_index is None:
+            key_index = self.__add_key(datapoint_key)
+        self.__append_ts(ts)
+        self._key_index_column.append(key_index)
+        self._values_column.append(value)
+
+    def iter_telemetry(self) -> Iterator[Tuple[Union[DatapointKey, str], Any, int]]:
+        keys = self._keys
+        for ts, key_index, value in zip(self._ts_column, self._key_index_column, self._values_column):
+            yield keys[key_index], value, ts
+
+    def extend(self, other: 'ConvertedData'):
+        if not isinstance(other, ConvertedData):
+            raise ValueError("Can only extend with another ConvertedData object.")
+        if isinstance(other, ColumnarConvertedData):
+            keys_mapping = [self._keys_indexes.get(key) for key in other._keys]
+            for other_key_index, key_index in enumerate(keys_mapping):
+                if key_index is None:
+                    keys_mapping[other_key_index] = self.__add_key(other._keys[other_key_index])
+            if all(other_key_index == key_index for other_key_index, key_index in enumerate(keys_mapping)):
+                self._key_index_column.extend(other._key_index_column)
+            else:
+                self._key_index_column.extend(keys_mapping[key_index] for key_index in other._key_index_column)
+            if isinstance(self._ts_column, array) and not isinstance(other._ts_column, array):
+                self._ts_column = list(self._ts_column)
+            self._ts_column.extend(other._ts_column)
+            self._values_column.extend(other._values_column)
+        else:
+            self.add_to_telemetry(other.telemetry)
+        self.attributes.update(other.attributes)
+        self.metadata.update(other.metadata)
+
+    def _add_single_telemetry_entry(self, telemetry_entry: Union[dict, TelemetryEntry]):
+        if isinstance(telemetry_entry, TelemetryEntry):
+            ts = telemetry_entry.ts
+            values = telemetry_entry.values
+        else:
+            ts = telemetry_entry.get(TELEMETRY_TIMESTAMP_PARAMETER)
+            values = telemetry_entry
+            if telemetry_entry.get(TELEMETRY_TIMESTAMP_PARAMETER) and telemetry_entry.get(TELEMETRY_VALUES_PARAMETER):
+                values = telemetry_entry[TELEMETRY_VALUES_PARAMETER]
+        if ts is None:
+            ts = int(time() * 1000)
+        for datapoint_key, value in values.items():
+            self.add_telemetry_datapoint(datapoint_key, value, ts)
+
+    def convert_to_objects_with_maximal_size(self, max_data_size) -> List['ConvertedData']:
+        general_info_bytes_size = TBUtility.get_data_size({
+            "deviceName": self.device_name,
+            "deviceType": self.device_type,
+            "metadata": self.metadata,
+            "telemetry": [],
+            "attributes": {}
+        })
+
+        if general_info_bytes_size > max_data_size:
+            raise ValueError("Maximal data size is too small even for general info, please adjust maxPayloadSize")
+
+        converted_objects = []
+        current_data = ColumnarConvertedData(self.device_name, self.device_type, self.metadata)
+        current_data_size = general_info_bytes_size
+
+        for datapoint_key, value in self.attributes.items():
+            key = datapoint_key.key if isinstance(datapoint_key, DatapointKey) else datapoint_key
+            entry_size = TBUtility.get_data_size({key: value}) + 1
+            if current_data_size + entry_size > max_data_size and current_data_size > general_info_bytes_size:
+                converted_objects.append(current_data)
+                current_data = ColumnarConvertedData(self.device_name, self.device_type, self.metadata)
+                current_data_size = general_info_bytes_size
+            current_data.add_to_attributes({datapoint_key: value})
+            current_data_size += entry_size
+
+        keys_sizes = [TBUtility.get_data_size({key.key if isinstance(key, DatapointKey) else key: None}) - 4
+                      for key in self._keys]
+        ts_sizes = {}
+        current_data_ts = set()
+        for ts, key_index, value in zip(self._ts_column, self._key_index_column, self._values_column):
+            entry_size = keys_sizes[key_index] + TBUtility.get_data_size(value) + 1
+            if ts not in current_data_ts:
+                ts_size = ts_sizes.get(ts)
+                if ts_size is None:
+                    ts_size = TBUtility.get_data_size({TELEMETRY_TIMESTAMP_PARAMETER: ts,
+                                                       TELEMETRY_VALUES_PARAMETER: {}}) + 1
+                    ts_sizes[ts] = ts_size
+                entry_size += ts_size
+            if current_data_size + entry_size > max_data_size and current_data_size > general_info_bytes_size:
+                converted_objects.append(current_data)
+                current_data = ColumnarConvertedData(self.device_name, self.device_type, self.metadata)
+                current_data_size = general_info_bytes_size
+                if ts in current_data_ts:
+                    entry_size += ts_sizes[ts]
+                current_data_ts = set()
+            current_data.add_telemetry_datapoint(self._keys[key_index], value, ts)
+            current_data_size += entry_size
+            current_data_ts.add(ts)
+
+        if current_data_size > general_info_bytes_size:
+            converted_objects.append(current_data)
+
+        return converted_objects
+
+    def __append_ts(self, ts):
+        ts_column = self._ts_column
+        if isinstance(ts_column, array):
+            try:
+                ts_column.append(ts)
+                return
+            except (TypeError, OverflowError):
+                ts_column = self._ts_column = list(ts_column)
+        ts_column.append(ts)
+
+    def __add_key(self, datapoint_key) -> int:
+        key_index = len(self._keys)
+        self._keys.append(datapoint_key)
+        self._keys_indexes[datapoint_key] = key_index
+        return key_index
+
+    def __group_by_ts(self, plain_keys) -> Dict[int, dict]:
+        if plain_keys:
+            keys = [key.key if isinstance(key, DatapointKey) else key for key in self._keys]
+        else:
+            keys = self._keys
+        grouped_values = {}
+        for ts, key_index, value in zip(self._ts_column, self._key_index_column, self._values_column):
+            values = grouped_values.get(ts)
+            if values is None:
+                values = grouped_values[ts] = {}
+            values[keys[key_index]] = value
+        return grouped_values
@@ -0,0 +1,33 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from typing import Optional
+
+
+class ConnectorStorageContext:
+    """
+    State of a connector that the storage fill thread needs for every converted data object.
+    It is created on the first data from the connector, so the common path for already connected
+    devices does not look up connectors and settings again.
+    """
+
+    __slots__ = ['connector_name', 'connector_id', 'is_gateway', 'track_devices_activity', 'incoming_messages']
+
+    def __init__(self, connector_name: str, connector_id: Optional[str], is_gateway: bool = False,
+                 track_devices_activity: bool = False):
+        self.connector_name = connector_name
+        self.connector_id = connector_id
+        self.is_gateway = is_gateway
+        self.track_devices_activity = track_devices_activity
+        self.incoming_messages = 0
@@ -12,7 +12,7 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
-from typing import List, Union
+from typing import Iterable, List, Union
 
 from thingsboard_gateway.gateway.constants import ATTRIBUTES_PARAMETER, TELEMETRY_PARAMETER, TIMESERIES_PARAMETER, \
     METADATA_PARAMETER
@@ -107,24 +107,17 @@ class ConvertedData:
     def extend(self, other: 'ConvertedData'):
         if not isinstance(other, ConvertedData):
             raise ValueError("Can only extend with another ConvertedData object.")
-        self.telemetry.extend(other.telemetry)
         self.attributes.update(other.attributes)
         self.metadata.update(other.metadata)
-        self._telemetry_datapoints_count += other.telemetry_datapoints_count
-        for telemetry_entry in self.telemetry:
-            if telemetry_entry.ts in self.ts_index:
-                index = self.ts_index[telemetry_entry.ts]
-                existing_values = self.telemetry[index].values
-                existing_values.update(telemetry_entry.values)
-            else:
-                self.ts_index[telemetry_entry.ts] = len(self.telemetry) - 1
+        for telemetry_entry in other.telemetry:
+            self._add_single_telemetry_entry(telemetry_entry)
 
-    def add_to_telemetry(self, telemetry_entry: Union[dict, TelemetryEntry, List[TelemetryEntry], List[dict]]):
-        if isinstance(telemetry_entry, list):
+    def add_to_telemetry(self, telemetry_entry: Union[dict, TelemetryEntry, Iterable[TelemetryEntry], Iterable[dict]]):
+        if isinstance(telemetry_entry, (dict, TelemetryEntry)):
+            self._add_single_telemetry_entry(telemetry_entry)
+        else:
             for entry in telemetry_entry:
                 self._add_single_telemetry_entry(entry)
-        else:
-            self._add_single_telemetry_entry(telemetry_entry)
 
     def _add_single_telemetry_entry(self, telemetry_entry: Union[dict, TelemetryEntry]):
         if isinstance(telemetry_entry, dict):
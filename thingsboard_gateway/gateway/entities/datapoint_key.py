@@ -15,13 +15,37 @@
 #
 # ------------------------------------------------------------------------------
 
+from typing import Dict, Optional
+
 from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
 
 
 class DatapointKey:
+    __slots__ = ["key", "report_strategy", "_hash"]
+
+    MAX_INTERNED_KEYS_PER_STRATEGY = 100000
+    _interned_keys: Dict[Optional[ReportStrategyConfig], Dict[str, 'DatapointKey']] = {}
+
     def __init__(self, key, report_strategy: ReportStrategyConfig = None):
         self.key = key
         self.report_strategy = report_strategy
+        self._hash = hash((key, report_strategy))
+
+    @classmethod
+    def intern(cls, key, report_strategy: ReportStrategyConfig = None) -> 'DatapointKey':
+        """
+        Returns shared DatapointKey instance for the key and report strategy pair,
+        so converters don't create a new key object for every converted value.
+        """
+        strategy_keys = cls._interned_keys.get(report_strategy)
+        if strategy_keys is None:
+            strategy_keys = cls._interned_keys.setdefault(report_strategy, {})
+        datapoint_key = strategy_keys.get(key)
+        if datapoint_key is None:
+            if len(strategy_keys) >= cls.MAX_INTERNED_KEYS_PER_STRATEGY:
+                strategy_keys.clear()
+            datapoint_key = strategy_keys.setdefault(key, cls(key, report_strategy))
+        return datapoint_key
 
     def __str__(self):
         return f"DatapointKey(key={self.key}, report_strategy={self.report_strategy})"
@@ -30,9 +54,11 @@ class DatapointKey:
         return self.__str__()
 
     def __hash__(self):
-        return hash((self.key, self.report_strategy))
+        return self._hash
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if isinstance(other, DatapointKey):
             return self.key == other.key and self.report_strategy == other.report_strategy
         return False
@@ -0,0 +1,53 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from typing import Dict, Optional, Tuple
+
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
+from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
+from thingsboard_gateway.tb_utility.tb_utility import TBUtility
+
+
+class DatapointKeysCache:
+    """
+    Per-converter cache of datapoint keys, built from the key configuration on the first use.
+    Key configurations are expected to live as long as the converter, they are referenced by identity.
+    """
+    MAX_CACHED_CONFIGS = 10000
+    MAX_CACHED_KEYS_PER_CONFIG = 10000
+
+    def __init__(self, logger=None):
+        self._logger = logger
+        self._keys_by_config: Dict[int, Tuple[dict, Dict[str, Tuple[Optional[ReportStrategyConfig], DatapointKey]]]] = {}
+
+    def get(self, key, device_report_strategy: Optional[ReportStrategyConfig], key_config: dict) -> DatapointKey:
+        config_keys = self._keys_by_config.get(id(key_config))
+        if config_keys is None or config_keys[0] is not key_config:
+            if len(self._keys_by_config) >= self.MAX_CACHED_CONFIGS:
+                self._keys_by_config.clear()
+            config_keys = (key_config, {})
+            self._keys_by_config[id(key_config)] = config_keys
+
+        cached_key = config_keys[1].get(key)
+        if cached_key is not None and cached_key[0] is device_report_strategy:
+            return cached_key[1]
+
+        datapoint_key = TBUtility.convert_key_to_datapoint_key(key, device_report_strategy, key_config, self._logger)
+        if len(config_keys[1]) >= self.MAX_CACHED_KEYS_PER_CONFIG:
+            config_keys[1].clear()
+        config_keys[1][key] = (device_report_strategy, datapoint_key)
+        return datapoint_key
+
+    def clear(self):
+        self._keys_by_config.clear()
@@ -31,7 +31,14 @@ class TelemetryEntry:
         self.ts = ts
         self.metadata = {}
         self.values: Dict[DatapointKey, Any] = values
-        self.data_size = TBUtility.get_data_size(self.to_dict())
+        self._data_size = None
+
+    @property
+    def data_size(self):
+        # Calculated on the first access, most entries are never measured as a whole
+        if self._data_size is None:
+            self._data_size = TBUtility.get_data_size(self.to_dict())
+        return self._data_size
 
     def __str__(self):
         return f"TelemetryEntry(ts={self.ts}, metadata={self.metadata}, values={self.values})"
@@ -0,0 +1,131 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from logging import getLogger
+from time import time
+from typing import Dict, List, Tuple
+from zlib import compress as zlib_compress
+
+from orjson import OPT_NON_STR_KEYS, dumps
+
+TELEMETRY_DATA_TYPE = 'telemetry'
+ATTRIBUTES_DATA_TYPE = 'attributes'
+
+COMPRESSION_NONE = 'none'
+COMPRESSION_ZLIB = 'zlib'
+COMPRESSION_ZSTD = 'zstd'
+
+
+class CoalescedPayload:
+    __slots__ = ['data_type', 'payload', 'devices_count', 'datapoints', 'raw_size']
+
+    def __init__(self, data_type, payload, devices_count, datapoints, raw_size):
+        self.data_type = data_type
+        self.payload = payload
+        self.devices_count = devices_count
+        self.datapoints = datapoints
+        self.raw_size = raw_size
+
+
+class PublishCoalescer:
+    """
+    Packs telemetry and attributes of many devices into gateway API messages ({"device name": data, ...})
+    of at most max_payload_size bytes and max_datapoints datapoints, optionally compressed.
+    The size limit applies to the JSON payload before compression, so the message fits the platform limits
+    after it is decompressed. Data of a device that does not fit into a message alone is returned
+    to be sent with splitting by the client.
+    """
+
+    def __init__(self, config: dict, logger=None):
+        self.__log = logger or getLogger('service')
+        self.compression = config.get('compression', COMPRESSION_NONE).lower()
+        compression_level = config.get('compressionLevel')
+        self.__compress = None
+        if self.compression == COMPRESSION_ZSTD:
+            try:
+                from zstandard import ZstdCompressor
+                self.__compress = ZstdCompressor(level=compression_level or 3).compress
+            except ImportError:
+                self.__log.error("zstandard library not found, payloads will be compressed with zlib")
+                self.compression = COMPRESSION_ZLIB
+        if self.compression == COMPRESSION_ZLIB:
+            level = compression_level if compression_level is not None else 6
+
+            def compress(payload):
+                return zlib_compress(payload, level)
+
+            self.__compress = compress
+        elif self.__compress is None:
+            self.compression = COMPRESSION_NONE
+
+    @property
+    def is_compressed(self):
+        return self.__compress is not None
+
+    def coalesce(self, devices_data: Dict[str, dict], max_payload_size: int,
+                 max_datapoints: int = 0) -> Tuple[List[CoalescedPayload], Dict[str, dict]]:
+        """
+        Returns the coalesced payloads for data of devices, in the format of the data pack read from the storage
+        ({"device name": {"telemetry": [...], "attributes": {...}}}), and data of devices that did not fit.
+        """
+        payloads = []
+        oversized_devices_data = {}
+        published_ts = int(time() * 1000)
+        for data_type in (ATTRIBUTES_DATA_TYPE, TELEMETRY_DATA_TYPE):
+            fragments = []
+            size = 1
+            datapoints = 0
+            for device_name, device_data in devices_data.items():
+                data = device_data.get(data_type)
+                if not data:
+                    continue
+                if data_type == TELEMETRY_DATA_TYPE:
+                    device_datapoints = 0
+                    for entry in data:
+                        values = entry.get('values')
+                        if values is None:
+                            device_datapoints += len(entry)
+                            continue
+                        device_datapoints += len(values)
+                        # The same as the client does for published messages, for latency debugging
+                        metadata = entry.get('metadata')
+                        if isinstance(metadata, dict):
+                            metadata['publishedTs'] = published_ts
+                else:
+                    device_datapoints = len(data)
+
+                fragment = dumps(device_name) + b':' + dumps(data, option=OPT_NON_STR_KEYS)
+                # Braces of the message and separators between the fragments take one byte per fragment
+                if len(fragment) + 2 > max_payload_size or 0 < max_datapoints < device_datapoints:
+                    oversized_devices_data.setdefault(device_name, {})[data_type] = data
+                    continue
+                if fragments and (size + len(fragment) + 1 > max_payload_size
+                                  or 0 < max_datapoints < datapoints + device_datapoints):
+                    payloads.append(self.__create_payload(data_type, fragments, datapoints))
+                    fragments = []
+                    size = 1
+                    datapoints = 0
+                fragments.append(fragment)
+                size += len(fragment) + 1
+                datapoints += device_datapoints
+            if fragments:
+                payloads.append(self.__create_payload(data_type, fragments, datapoints))
+        return payloads, oversized_devices_data
+
+    def __create_payload(self, data_type, fragments, datapoints):
+        payload = b'{' + b','.join(fragments) + b'}'
+        raw_size = len(payload)
+        if self.__compress is not None:
+            payload = self.__compress(payload)
+        return CoalescedPayload(data_type, payload, len(fragments), datapoints, raw_size)
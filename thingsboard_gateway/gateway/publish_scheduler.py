@@ -0,0 +1,186 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from collections import deque
+from typing import Deque, Dict, Union
+
+from thingsboard_gateway.gateway.publish_coalescer import ATTRIBUTES_DATA_TYPE, TELEMETRY_DATA_TYPE, \
+    CoalescedPayload, PublishCoalescer
+
+try:
+    from tb_device_mqtt import RateLimit
+except ImportError:
+    from thingsboard_gateway.tb_utility.tb_utility import TBUtility
+    TBUtility.install_package('tb-mqtt-client')
+    from tb_device_mqtt import RateLimit
+
+# The longest time to wait for the rate limits, the limits may be changed by the platform meanwhile
+MAX_WAIT_TIME = 1.0
+MAX_TRACKED_DEVICES = 10000
+
+
+def get_wait_time(rate_limit: RateLimit, amount=1) -> float:
+    """
+    Time in seconds until amount of tokens is available in every bucket of the rate limit.
+    Amount larger than a bucket capacity waits for the full bucket, the client allows to take it then.
+    """
+    if not rate_limit.has_limit():
+        return 0.0
+    wait_time = 0.0
+    for bucket in rate_limit._rate_buckets.values():  # noqa pylint: disable=protected-access
+        missing_tokens = min(amount, bucket.capacity) - bucket.get_remaining_tokens()
+        if missing_tokens > 0:
+            wait_time = max(wait_time, missing_tokens * bucket.duration / bucket.capacity)
+    return wait_time
+
+
+class PublishScheduler:
+    """
+    Shapes data packs read from the storage into messages that fit the rate limits, so publishing never blocks
+    inside the client waiting for the limits.
+    Messages are coalesced from the data of all devices in round-robin order, one telemetry entry or
+    attributes update of a device at a time, so a device with a lot of data does not delay the others.
+    The size of every message fits the datapoints limit of the gateway, every device may additionally have
+    its own messages and datapoints limits. A prepared message is given out by poll only when the gateway
+    limits have tokens for it, the limits are taken from the client on every poll, as the client may be replaced
+    on the remote configuration.
+    """
+
+    def __init__(self, coalescer: PublishCoalescer, config: dict):
+        self.__coalescer = coalescer
+        self.__device_messages_rate_limit_config = config.get('deviceMessagesRateLimit')
+        self.__device_datapoints_rate_limit_config = config.get('deviceDatapointsRateLimit')
+        self.__device_rate_limits = {}
+        self.__pending: Dict[str, Deque[tuple]] = {}
+        self.__ready: Deque[CoalescedPayload] = deque()
+        self.__oversized_devices_data = {}
+        self.__wait_time = 0.0
+
+    def add(self, devices_data: Dict[str, dict]):
+        for device_name, device_data in devices_data.items():
+            pending = self.__pending.get(device_name)
+            if pending is None:
+                pending = self.__pending[device_name] = deque()
+            if device_data.get(ATTRIBUTES_DATA_TYPE):
+                attributes = device_data[ATTRIBUTES_DATA_TYPE]
+                pending.append((ATTRIBUTES_DATA_TYPE, attributes, len(attributes)))
+            for entry in device_data.get(TELEMETRY_DATA_TYPE) or ():
+                values = entry.get('values')
+                pending.append((TELEMETRY_DATA_TYPE, entry, len(values if values is not None else entry)))
+            if not pending:
+                del self.__pending[device_name]
+
+    def is_empty(self) -> bool:
+        return not self.__pending and not self.__ready
+
+    def clear(self):
+        self.__pending.clear()
+        self.__ready.clear()
+        self.__oversized_devices_data.clear()
+
+    def get_wait_time(self) -> float:
+        return min(max(self.__wait_time, 0.001), MAX_WAIT_TIME)
+
+    def pop_oversized_devices_data(self) -> Dict[str, dict]:
+        """Returns data of devices too large for one message, to be sent with splitting by the client."""
+        oversized_devices_data = self.__oversized_devices_data
+        self.__oversized_devices_data = {}
+        return oversized_devices_data
+
+    def poll(self, tb_client, max_payload_size) -> Union[CoalescedPayload, None]:
+        """Returns the next message, if the rate limits of the client allow to publish it now."""
+        messages_rate_limit, datapoints_rate_limit = tb_client.get_gateway_telemetry_rate_limits()
+        if not self.__ready:
+            self.__prepare(max_payload_size, tb_client.get_max_datapoints_per_message())
+            if not self.__ready:
+                return None
+
+        payload = self.__ready[0]
+        self.__wait_time = max(get_wait_time(messages_rate_limit), get_wait_time(datapoints_rate_limit,
+                                                                                 payload.datapoints))
+        if self.__wait_time > 0:
+            return None
+        return self.__ready.popleft()
+
+    def __prepare(self, max_payload_size, max_datapoints):
+        devices_data = {}
+        datapoints = 0
+        self.__wait_time = MAX_WAIT_TIME
+        # Every round takes one item of every device, until the message is full or devices are out of their limits
+        progress = True
+        while progress and self.__pending and (max_datapoints <= 0 or datapoints < max_datapoints):
+            progress = False
+            for device_name in list(self.__pending):
+                pending = self.__pending[device_name]
+                data_type, data, data_datapoints = pending[0]
+                if 0 < max_datapoints < data_datapoints:
+                    self.__add_data(self.__oversized_devices_data, device_name, data_type, data)
+                    self.__pop(device_name, pending)
+                    progress = True
+                    continue
+                if 0 < max_datapoints < datapoints + data_datapoints:
+                    continue
+                device_data = devices_data.get(device_name)
+                if not self.__acquire_device_limits(device_name, data_datapoints, device_data is None):
+                    continue
+                self.__add_data(devices_data, device_name, data_type, data)
+                datapoints += data_datapoints
+                self.__pop(device_name, pending)
+                progress = True
+
+        if devices_data:
+            payloads, oversized_devices_data = self.__coalescer.coalesce(devices_data, max_payload_size,
+                                                                         max_datapoints)
+            self.__ready.extend(payloads)
+            for device_name, device_data in oversized_devices_data.items():
+                for data_type, data in device_data.items():
+                    self.__add_data(self.__oversized_devices_data, device_name, data_type, data)
+
+    def __acquire_device_limits(self, device_name, datapoints, is_new_message):
+        device_rate_limits = self.__device_rate_limits.get(device_name)
+        if device_rate_limits is None:
+            if self.__device_messages_rate_limit_config is None and self.__device_datapoints_rate_limit_config is None:
+                return True
+            if len(self.__device_rate_limits) >= MAX_TRACKED_DEVICES:
+                self.__device_rate_limits.clear()
+            device_rate_limits = self.__device_rate_limits[device_name] = (
+                RateLimit(self.__device_messages_rate_limit_config or '0:0', percentage=100),
+                RateLimit(self.__device_datapoints_rate_limit_config or '0:0', percentage=100))
+        messages_rate_limit, datapoints_rate_limit = device_rate_limits
+        wait_time = max(get_wait_time(messages_rate_limit) if is_new_message else 0,
+                        get_wait_time(datapoints_rate_limit, datapoints))
+        if wait_time > 0:
+            self.__wait_time = min(self.__wait_time, wait_time)
+            return False
+        if is_new_message:
+            messages_rate_limit.increase_rate_limit_counter()
+        datapoints_rate_limit.increase_rate_limit_counter(datapoints)
+        return True
+
+    def __pop(self, device_name, pending):
+        pending.popleft()
+        del self.__pending[device_name]
+        # The device goes to the end of the order, so the next message starts with devices not sent yet
+        if pending:
+            self.__pending[device_name] = pending
+
+    @staticmethod
+    def __add_data(devices_data, device_name, data_type, data):
+        device_data = devices_data.get(device_name)
+        if device_data is None:
+            device_data = devices_data[device_name] = {}
+        if data_type == ATTRIBUTES_DATA_TYPE:
+            device_data.setdefault(ATTRIBUTES_DATA_TYPE, {}).update(data)
+        else:
+            device_data.setdefault(TELEMETRY_DATA_TYPE, []).append(data)
@@ -12,11 +12,15 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
-from time import monotonic
+from os import path, replace
+from time import monotonic, time
 from threading import Thread, Event, Lock
-from typing import Optional, Tuple, Dict
+from typing import Optional, Tuple, Dict, List
 
-from thingsboard_gateway.gateway.constants import ReportStrategy, STRATEGIES_WITH_REPORT_PERIOD
+from orjson import dumps, loads, OPT_NON_STR_KEYS
+
+from thingsboard_gateway.gateway.constants import ReportStrategy, STRATEGIES_WITH_REPORT_PERIOD, \
+    REPORT_PERIOD_PARAMETER, TYPE_PARAMETER, AGGREGATION_FUNCTION_PARAMETER, TTL_PARAMETER
 from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
 from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
 
@@ -78,19 +82,26 @@ class ReportStrategyDataRecord:
 
 
 class ReportStrategyDataCache:
-    def __init__(self, config, logger):
+    SNAPSHOT_VERSION = 1
+
+    def __init__(self, config, logger, snapshot_path: Optional[str] = None):
         self._config = config
         self._data_cache: Dict[Tuple, Tuple[ReportStrategyDataRecord, float]] = {}
         self._lock = Lock()
         self._cleanup_interval = self._config.get("reportStrategyDataCacheCleanupInterval", 3600)
+        self._snapshot_path = snapshot_path
+        self._snapshot_interval = self._config.get("reportStrategyDataCacheSnapshotInterval", 60)
+        self._snapshot_loaded = snapshot_path is None
+        self._restored_keys_to_report_periodically: List[Tuple[DatapointKey, str, str]] = []
         self._stop_event = Event()
-        self._cleanup_thread = Thread(target=self._cleanup_loop, daemon=True,
-                                      name="Reporting strategy data cache cleanup thread")
-        self._cleanup_thread.start()
         current_time = monotonic()
         self.__previous_cleanup_time = current_time
+        self.__previous_snapshot_time = current_time
         self.__data_cache_current_ts = current_time
         self.__logger = logger
+        self._cleanup_thread = Thread(target=self._cleanup_loop, daemon=True,
+                                      name="Reporting strategy data cache cleanup thread")
+        self._cleanup_thread.start()
 
     def put(self, datapoint_key: DatapointKey, data: str, device_name,
             device_type, connector_name, connector_id, report_strategy,
@@ -101,11 +112,15 @@ class ReportStrategyDataCache:
             data, device_name, device_type, connector_name,
             connector_id, report_strategy, is_telemetry
         )
+        if not self._snapshot_loaded:
+            self.load_snapshot()
         with self._lock:
             self._data_cache[key] = (record, expire_ts)
 
     def get(self, datapoint_key: DatapointKey, device_name, connector_id) -> Optional[ReportStrategyDataRecord]:
         key = (datapoint_key, device_name, connector_id)
+        if not self._snapshot_loaded:
+            self.load_snapshot()
         with self._lock:
             item = self._data_cache.get(key)
             if not item:
@@ -143,17 +158,143 @@ class ReportStrategyDataCache:
             for key in keys_to_delete:
                 del self._data_cache[key]
 
+    def size(self) -> int:
+        return len(self._data_cache)
+
     def clear(self):
         with self._lock:
             self._data_cache.clear()
 
+    def pop_restored_keys_to_report_periodically(self) -> List[Tuple[DatapointKey, str, str]]:
+        if not self._snapshot_loaded:
+            self.load_snapshot()
+        with self._lock:
+            restored_keys = self._restored_keys_to_report_periodically
+            self._restored_keys_to_report_periodically = []
+        return restored_keys
+
+    def save_snapshot(self):
+        """
+        Writes the cached records to the snapshot file, so ON_CHANGE and periodical strategies keep their state
+        after the gateway restart. Monotonic based times are stored relative to the snapshot time.
+        """
+        if self._snapshot_path is None or not self._snapshot_loaded:
+            return
+
+        current_monotonic = monotonic()
+        strategies = {}
+        records = []
+        with self._lock:
+            for (datapoint_key, device_name, connector_id), (record, expire_ts) in self._data_cache.items():
+                if not isinstance(datapoint_key, DatapointKey):
+                    continue
+                key_strategy_index = -1
+                if datapoint_key.report_strategy is not None:
+                    key_strategy_index = strategies.setdefault(datapoint_key.report_strategy, len(strategies))
+                record_strategy_index = strategies.setdefault(record.report_strategy, len(strategies))
+                last_report_age = None
+                if record._last_report_time is not None:
+                    last_report_age = int(current_monotonic * 1000) - record._last_report_time
+                records.append((datapoint_key.key, key_strategy_index, record_strategy_index,
+                                device_name, record._device_type, record._connector_name, connector_id,
+                                record._is_telemetry, record._value, record._ts, last_report_age,
+                                expire_ts - current_monotonic if expire_ts else 0))
+
+        snapshot = {
+            "version": self.SNAPSHOT_VERSION,
+            "ts": int(time() * 1000),
+            "strategies": [self.__strategy_to_list(strategy) for strategy in strategies],
+            "records": records
+        }
+        temporary_snapshot_path = self._snapshot_path + ".tmp"
+        try:
+            with open(temporary_snapshot_path, "wb") as snapshot_file:
+                snapshot_file.write(dumps(snapshot, default=str, option=OPT_NON_STR_KEYS))
+            replace(temporary_snapshot_path, self._snapshot_path)
+            self.__logger.debug("Saved %d records to report strategy data cache snapshot", len(records))
+        except Exception as e:
+            self.__logger.error("Error while saving report strategy data cache snapshot: %s", e)
+
+    def load_snapshot(self):
+        with self._lock:
+            if self._snapshot_loaded:
+                return
+            self._snapshot_loaded = True
+            if not path.exists(self._snapshot_path):
+                return
+            try:
+                with open(self._snapshot_path, "rb") as snapshot_file:
+                    snapshot = loads(snapshot_file.read())
+                if snapshot.get("version") != self.SNAPSHOT_VERSION:
+                    self.__logger.warning("Unsupported report strategy data cache snapshot version: %r",
+                                          snapshot.get("version"))
+                    return
+                restored_count = self.__restore_records(snapshot)
+                self.__logger.info("Restored %d records from report strategy data cache snapshot", restored_count)
+            except Exception as e:
+                self.__logger.error("Error while loading report strategy data cache snapshot: %s", e)
+
+    def __restore_records(self, snapshot) -> int:
+        current_monotonic = monotonic()
+        downtime = max(time() * 1000 - snapshot["ts"], 0)
+        strategies = [self.__strategy_from_list(strategy) for strategy in snapshot["strategies"]]
+        datapoint_keys = {}
+        restored_count = 0
+        for (key, key_strategy_index, record_strategy_index, device_name, device_type, connector_name, connector_id,
+             is_telemetry, value, ts, last_report_age, ttl_left) in snapshot["records"]:
+            expire_ts = 0
+            if ttl_left:
+                ttl_left -= downtime / 1000
+                if ttl_left <= 0:
+                    continue
+                expire_ts = current_monotonic + ttl_left
+
+            key_strategy = strategies[key_strategy_index] if key_strategy_index >= 0 else None
+            datapoint_key = datapoint_keys.get((key, key_strategy_index))
+            if datapoint_key is None:
+                datapoint_key = DatapointKey(key, key_strategy)
+                datapoint_keys[(key, key_strategy_index)] = datapoint_key
+
+            report_strategy = strategies[record_strategy_index]
+            record = ReportStrategyDataRecord(value, device_name, device_type, connector_name,
+                                              connector_id, report_strategy, is_telemetry)
+            record.update_ts(ts)
+            if last_report_age is not None:
+                record.update_last_report_time(int(current_monotonic * 1000 - last_report_age - downtime))
+            cache_key = (datapoint_key, device_name, connector_id)
+            self._data_cache[cache_key] = (record, expire_ts)
+            if report_strategy.report_strategy in STRATEGIES_WITH_REPORT_PERIOD:
+                self._restored_keys_to_report_periodically.append(cache_key)
+            restored_count += 1
+        return restored_count
+
+    @staticmethod
+    def __strategy_to_list(report_strategy: ReportStrategyConfig):
+        return [report_strategy.report_strategy.value, report_strategy.report_period,
+                report_strategy.ttl, report_strategy.aggregation_function]
+
+    @staticmethod
+    def __strategy_from_list(strategy):
+        report_strategy_type, report_period, ttl, aggregation_function = strategy
+        config = {TYPE_PARAMETER: report_strategy_type, TTL_PARAMETER: ttl}
+        if report_period is not None:
+            config[REPORT_PERIOD_PARAMETER] = report_period
+        if aggregation_function is not None:
+            config[AGGREGATION_FUNCTION_PARAMETER] = aggregation_function
+        return ReportStrategyConfig(config)
+
     def stop(self):
         self._stop_event.set()
         self._cleanup_thread.join()
+        self.save_snapshot()
 
     def _cleanup_loop(self):
         while not self._stop_event.wait(1):
             self.__data_cache_current_ts = monotonic()
+            if (self._snapshot_path is not None and self._snapshot_interval > 0
+                    and self.__data_cache_current_ts - self.__previous_snapshot_time >= self._snapshot_interval):
+                self.__previous_snapshot_time = self.__data_cache_current_ts
+                self.save_snapshot()
             if self.__previous_cleanup_time - self.__data_cache_current_ts >= self._cleanup_interval:
                 self.__previous_cleanup_time = monotonic()
                 with self._lock:
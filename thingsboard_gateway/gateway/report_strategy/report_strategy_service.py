@@ -19,12 +19,14 @@ from typing import Dict, Set, Union, TYPE_CHECKING
 
 from thingsboard_gateway.gateway.constants import DEFAULT_REPORT_STRATEGY_CONFIG, \
     ReportStrategy, DEVICE_NAME_PARAMETER, DEVICE_TYPE_PARAMETER, REPORT_STRATEGY_PARAMETER, \
-    STRATEGIES_WITH_REPORT_PERIOD
+    STRATEGIES_WITH_REPORT_PERIOD, REPORT_STRATEGY_DATA_CACHE_FILENAME, LATENCY_TIMESTAMPS_PARAMETER
+from thingsboard_gateway.gateway.entities.columnar_converted_data import ColumnarConvertedData
 from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
 from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
 from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
 from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
 from thingsboard_gateway.gateway.report_strategy.report_strategy_data_cache import ReportStrategyDataCache
+from thingsboard_gateway.gateway.statistics.latency_statistics import LatencyStatistics, REPORT_STRATEGY_STAGE
 from thingsboard_gateway.tb_utility.tb_logger import TbLogger
 if TYPE_CHECKING:
     from thingsboard_gateway.gateway.tb_gateway_service import TBGatewayService
@@ -38,7 +40,10 @@ class ReportStrategyService:
         self._logger = logger
         report_strategy = config.get(REPORT_STRATEGY_PARAMETER, {})
         self.main_report_strategy = ReportStrategyConfig(report_strategy, DEFAULT_REPORT_STRATEGY_CONFIG)
-        self._report_strategy_data_cache = ReportStrategyDataCache(config, self._logger)
+        snapshot_path = None
+        if config.get("persistReportStrategyDataCache", False):
+            snapshot_path = gateway._config_dir + REPORT_STRATEGY_DATA_CACHE_FILENAME
+        self._report_strategy_data_cache = ReportStrategyDataCache(config, self._logger, snapshot_path)
         self._connectors_report_strategies: Dict[str, ReportStrategyConfig] = {}
         self.__keys_to_report_periodically: Set[DatapointKey, str, str] = set()
         self.__periodical_reporting_thread = Thread(target=self.__periodical_reporting,
@@ -49,6 +54,9 @@ class ReportStrategyService:
     def get_main_report_strategy(self):
         return self.main_report_strategy
 
+    def get_data_cache_size(self) -> int:
+        return self._report_strategy_data_cache.size()
+
     def register_connector_report_strategy(self, connector_name: str,
                                            connector_id: str,
                                            report_strategy_config: ReportStrategyConfig):
@@ -66,9 +74,11 @@ class ReportStrategyService:
             for ts_kv in data.get("telemetry", []):
                 data_to_send.add_to_telemetry(ts_kv)
             data_to_send.add_to_attributes(data.get("attributes", {}))
-        converted_data_to_send = ConvertedData(device_name=data_to_send.device_name,
-                                               device_type=data_to_send.device_type,
-                                               metadata=data_to_send.metadata)
+        is_columnar_data = isinstance(data_to_send, ColumnarConvertedData)
+        converted_data_class = ColumnarConvertedData if is_columnar_data else ConvertedData
+        converted_data_to_send = converted_data_class(device_name=data_to_send.device_name,
+                                                      device_type=data_to_send.device_type,
+                                                      metadata=data_to_send.metadata)
 
         if self._connectors_report_strategies.get(connector_id) is not None:
             report_strategy_config = self._connectors_report_strategies.get(connector_id)
@@ -77,7 +87,25 @@ class ReportStrategyService:
         else:
             report_strategy_config = self.main_report_strategy
 
-        if data_to_send.telemetry:
+        if is_columnar_data:
+            for datapoint_key, value, ts in data_to_send.iter_telemetry():
+                report_strategy = report_strategy_config
+
+                if isinstance(datapoint_key, str):
+                    datapoint_key = DatapointKey.intern(datapoint_key)
+
+                if datapoint_key.report_strategy is not None:
+                    report_strategy = datapoint_key.report_strategy
+                if self.filter_datapoint_and_cache(datapoint_key,
+                                                   (value, ts),
+                                                   data_to_send.device_name,
+                                                   data_to_send.device_type,
+                                                   connector_name,
+                                                   connector_id,
+                                                   report_strategy,
+                                                   True):
+                    converted_data_to_send.add_telemetry_datapoint(datapoint_key, value, ts)
+        elif data_to_send.telemetry:
             telemetry_to_send = []
             original_telemetry = data_to_send.telemetry
             for ts_kv in original_telemetry:
@@ -124,7 +152,10 @@ class ReportStrategyService:
                     attributes_to_send[datapoint_key] = value
             if attributes_to_send:
                 converted_data_to_send.add_to_attributes(attributes_to_send)
-        if converted_data_to_send.telemetry or converted_data_to_send.attributes:
+        if converted_data_to_send.telemetry_datapoints_count or converted_data_to_send.attributes:
+            if LatencyStatistics.ENABLED:
+                LatencyStatistics.checkpoint(converted_data_to_send.metadata.get(LATENCY_TIMESTAMPS_PARAMETER),
+                                             REPORT_STRATEGY_STAGE)
             self.__send_data_queue.put_nowait((connector_name, connector_id, converted_data_to_send))
 
     def filter_datapoint_and_cache(self, datapoint_key: DatapointKey, data, device_name, device_type,
@@ -197,6 +228,8 @@ class ReportStrategyService:
         to_removal_by_expiration = []
         while not self.__gateway.stop_event.is_set() and not self.stop_event.is_set():
             try:
+                self.__keys_to_report_periodically.update(
+                    self._report_strategy_data_cache.pop_restored_keys_to_report_periodically())
                 if not self.__keys_to_report_periodically:
                     self.__gateway.stop_event.wait(1)
                     continue
@@ -280,6 +313,10 @@ class ReportStrategyService:
         self._connectors_report_strategies.pop(connector_id, None)
         self._connectors_report_strategies.pop(connector_name, None)
 
+    def stop(self):
+        self.stop_event.set()
+        self._report_strategy_data_cache.stop()
+
     def clear_cache(self):
         self._report_strategy_data_cache.clear()
         self.__keys_to_report_periodically.clear()
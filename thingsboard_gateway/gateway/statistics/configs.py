@@ -49,6 +49,18 @@ SERVICE_STATS_CONFIG = [
     {
         "function": StatisticsServiceFunctions.platform_ts_produced,
         "attributeOnGateway": "platformTsProduced"
+    },
+    {
+        "function": StatisticsServiceFunctions.platform_coalesced_msgs_pushed,
+        "attributeOnGateway": "platformCoalescedMsgPushed"
+    },
+    {
+        "function": StatisticsServiceFunctions.platform_coalesced_devices,
+        "attributeOnGateway": "platformCoalescedDevices"
+    },
+    {
+        "function": StatisticsServiceFunctions.platform_published_bytes,
+        "attributeOnGateway": "platformPublishedBytes"
     }
 ]
 
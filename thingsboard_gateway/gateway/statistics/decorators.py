@@ -12,6 +12,8 @@
 #      See the License for the specific language governing permissions and
 #      limitations under the License.
 
+from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.gateway.statistics.latency_statistics import LatencyStatistics
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
 
 
@@ -28,7 +30,10 @@ class CollectStatistics:
             except ValueError:
                 pass
 
+            conversion_start_ts = LatencyStatistics.get_conversion_start_ts() if LatencyStatistics.ENABLED else None
             result = func(*args, **kwargs)
+            if conversion_start_ts is not None and isinstance(result, ConvertedData):
+                LatencyStatistics.add_conversion_start_ts(result.metadata, conversion_start_ts)
             if result and self.end_stat_type:
                 self.collect(self.end_stat_type, result)
 
@@ -38,8 +43,8 @@ class CollectStatistics:
 
     @staticmethod
     def collect(stat_type, data):
-        bytes_count = str(data).__sizeof__()
-        StatisticsService.add_bytes(stat_type, bytes_count)
+        if StatisticsService.ENABLED:
+            StatisticsService.add_bytes(stat_type, StatisticsService.get_bytes_count(data, stat_type))
 
 
 class CollectAllReceivedBytesStatistics(CollectStatistics):
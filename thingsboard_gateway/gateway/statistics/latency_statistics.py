@@ -0,0 +1,207 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from threading import Lock
+from time import time_ns
+from typing import Dict, Iterable, Optional, Tuple
+
+from thingsboard_gateway.gateway.constants import LATENCY_TIMESTAMPS_PARAMETER
+
+CONVERTER_STAGE = "converter"
+REPORT_STRATEGY_STAGE = "reportStrategy"
+CONVERTED_DATA_QUEUE_STAGE = "convertedDataQueue"
+STORAGE_FILL_STAGE = "storageFill"
+EVENT_STORAGE_STAGE = "eventStorage"
+READ_PACK_STAGE = "readPack"
+PUBLISH_STAGE = "publish"
+ACK_STAGE = "ack"
+TOTAL_STAGE = "total"
+
+LATENCY_CONNECTOR_PARAMETER = "connector"
+LATENCY_FIRST_TS_PARAMETER = "firstTs"
+LATENCY_LAST_TS_PARAMETER = "lastTs"
+
+REPORTED_PERCENTILES = (50, 90, 99)
+
+
+class LatencyHistogram:
+    """
+    Histogram of durations in microseconds with HDR-like log-linear buckets: values below 32 have own buckets,
+    every next power of two range is split into 16 buckets, so the relative error of reported values is below 6.25%.
+    """
+
+    SUB_BUCKETS_BITS = 4
+    SUB_BUCKETS_COUNT = 1 << SUB_BUCKETS_BITS
+    MAX_SHIFT = 36
+
+    __slots__ = ['counts', 'count', 'total', 'max', '_lock']
+
+    def __init__(self):
+        self.counts = [0] * ((self.MAX_SHIFT + 2) * self.SUB_BUCKETS_COUNT)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self._lock = Lock()
+
+    @classmethod
+    def get_bucket_index(cls, value: int) -> int:
+        shift = value.bit_length() - cls.SUB_BUCKETS_BITS - 1
+        if shift <= 0:
+            return value
+        if shift > cls.MAX_SHIFT:
+            return ((cls.MAX_SHIFT + 2) << cls.SUB_BUCKETS_BITS) - 1
+        return ((shift + 1) << cls.SUB_BUCKETS_BITS) + (value >> shift) - cls.SUB_BUCKETS_COUNT
+
+    @classmethod
+    def get_bucket_upper_value(cls, index: int) -> int:
+        if index < cls.SUB_BUCKETS_COUNT * 2:
+            return index
+        shift = (index >> cls.SUB_BUCKETS_BITS) - 1
+        sub_bucket = (index & (cls.SUB_BUCKETS_COUNT - 1)) + cls.SUB_BUCKETS_COUNT
+        return ((sub_bucket + 1) << shift) - 1
+
+    def record(self, value: int):
+        if value < 0:
+            value = 0
+        index = self.get_bucket_index(value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value
+            if value > self.max:
+                self.max = value
+
+    def get_percentile(self, percentile: float) -> int:
+        with self._lock:
+            if not self.count:
+                return 0
+            rank = max(1, -(-self.count * percentile // 100))
+            seen = 0
+            for index, bucket_count in enumerate(self.counts):
+                seen += bucket_count
+                if seen >= rank:
+                    return min(self.get_bucket_upper_value(index), self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        """Summary in milliseconds."""
+        summary = {"count": self.count, "avg": round(self.total / self.count / 1000, 3) if self.count else 0}
+        for percentile in REPORTED_PERCENTILES:
+            summary["p%d" % percentile] = round(self.get_percentile(percentile) / 1000, 3)
+        summary["max"] = round(self.max / 1000, 3)
+        return summary
+
+
+class LatencyStatistics:
+    """
+    Dwell time of sampled messages in every stage of the pipeline, per connector:
+    converter -> report strategy -> converted data queue -> storage fill -> event storage -> read pack
+    -> publish -> ack, and the total time.
+    Every SAMPLING_INTERVAL-th message gets a dict with timestamps in its metadata (LATENCY_TIMESTAMPS_PARAMETER),
+    the dict travels with the message through the event storage and every checkpoint records the time
+    since the previous one. Other messages pay only for the absent metadata key lookup.
+    """
+
+    ENABLED = False
+    SAMPLING_INTERVAL = 100
+
+    __HISTOGRAMS: Dict[Tuple[str, str], LatencyHistogram] = {}
+    __LOCK = Lock()
+    __messages_count = 0
+
+    @classmethod
+    def configure(cls, config: Optional[dict]):
+        config = config or {}
+        cls.ENABLED = config.get("enable", False)
+        cls.SAMPLING_INTERVAL = max(1, int(config.get("samplingInterval", 100)))
+
+    @classmethod
+    def get_conversion_start_ts(cls) -> Optional[int]:
+        """Timestamp for the converter stage, if the next message will be sampled."""
+        if cls.ENABLED and not cls.__messages_count % cls.SAMPLING_INTERVAL:
+            return time_ns() // 1000
+        return None
+
+    @classmethod
+    def add_conversion_start_ts(cls, metadata: dict, start_ts: int):
+        metadata[LATENCY_TIMESTAMPS_PARAMETER] = {LATENCY_FIRST_TS_PARAMETER: start_ts,
+                                                  LATENCY_LAST_TS_PARAMETER: start_ts}
+
+    @classmethod
+    def start(cls, metadata: dict, connector_name: str) -> Optional[dict]:
+        """
+        Called when the message comes from the connector, makes the message sampled if it is its turn
+        or if its conversion was measured. Returns the timestamps dict of sampled messages.
+        """
+        if not cls.ENABLED:
+            return None
+        # Not locked, a race can only shift the sampling a bit
+        messages_count = cls.__messages_count
+        cls.__messages_count = messages_count + 1
+
+        latency_timestamps = metadata.get(LATENCY_TIMESTAMPS_PARAMETER) if metadata else None
+        if latency_timestamps is not None:
+            cls.checkpoint(latency_timestamps, CONVERTER_STAGE, connector_name)
+            return latency_timestamps
+        if messages_count % cls.SAMPLING_INTERVAL:
+            return None
+        start_ts = time_ns() // 1000
+        latency_timestamps = {LATENCY_FIRST_TS_PARAMETER: start_ts, LATENCY_LAST_TS_PARAMETER: start_ts,
+                              LATENCY_CONNECTOR_PARAMETER: connector_name}
+        metadata[LATENCY_TIMESTAMPS_PARAMETER] = latency_timestamps
+        return latency_timestamps
+
+    @classmethod
+    def checkpoint(cls, latency_timestamps: Optional[dict], stage: str, connector_name: Optional[str] = None,
+                   current_ts: Optional[int] = None):
+        """Records the time since the previous checkpoint as the dwell time of the stage."""
+        if latency_timestamps is None or not cls.ENABLED:
+            return
+        if current_ts is None:
+            current_ts = time_ns() // 1000
+        if connector_name is not None:
+            latency_timestamps[LATENCY_CONNECTOR_PARAMETER] = connector_name
+        connector_name = latency_timestamps.get(LATENCY_CONNECTOR_PARAMETER)
+        if connector_name is not None:
+            cls.__get_histogram(connector_name, stage).record(
+                current_ts - latency_timestamps[LATENCY_LAST_TS_PARAMETER])
+            if stage == ACK_STAGE:
+                cls.__get_histogram(connector_name, TOTAL_STAGE).record(
+                    current_ts - latency_timestamps[LATENCY_FIRST_TS_PARAMETER])
+        latency_timestamps[LATENCY_LAST_TS_PARAMETER] = current_ts
+
+    @classmethod
+    def checkpoint_all(cls, latency_timestamps_list: Iterable[dict], stage: str):
+        current_ts = time_ns() // 1000
+        for latency_timestamps in latency_timestamps_list:
+            cls.checkpoint(latency_timestamps, stage, current_ts=current_ts)
+
+    @classmethod
+    def get_statistics(cls, reset=False) -> Dict[str, Dict[str, dict]]:
+        with cls.__LOCK:
+            histograms = cls.__HISTOGRAMS
+            if reset:
+                cls.__HISTOGRAMS = {}
+        statistics = {}
+        for (connector_name, stage), histogram in histograms.items():
+            statistics.setdefault(connector_name, {})[stage] = histogram.to_dict()
+        return statistics
+
+    @classmethod
+    def __get_histogram(cls, connector_name: str, stage: str) -> LatencyHistogram:
+        histogram = cls.__HISTOGRAMS.get((connector_name, stage))
+        if histogram is None:
+            with cls.__LOCK:
+                histogram = cls.__HISTOGRAMS.setdefault((connector_name, stage), LatencyHistogram())
+        return histogram
@@ -0,0 +1,164 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from re import compile as compile_regex
+from threading import Thread
+from typing import Iterable, List, Tuple
+
+from thingsboard_gateway.gateway.statistics.latency_statistics import LatencyStatistics, REPORTED_PERCENTILES
+from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
+
+METRICS_PREFIX = "tb_gateway_"
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+DEFAULT_METRICS_ENDPOINT_CONFIG = {
+    "enable": False,
+    "host": "127.0.0.1",
+    "port": 9464,
+    "path": "/metrics"
+}
+CAMEL_CASE_BOUNDARY_PATTERN = compile_regex(r'(?<=[a-z0-9])(?=[A-Z])')
+
+Sample = Tuple[str, dict, float]
+
+
+class MetricsEndpoint:
+    """
+    Local HTTP endpoint that exposes the gateway internals in the OpenMetrics text format,
+    so they can be scraped even when the connection to the platform is the bottleneck.
+    Nothing is collected between scrapes, metrics are read from the gateway on every request.
+    Message and byte counters are available when the general statistics are enabled,
+    stage latencies when the latency statistics are enabled.
+    """
+
+    def __init__(self, config: dict, gateway, log):
+        self._gateway = gateway
+        self._log = log
+        config = {**DEFAULT_METRICS_ENDPOINT_CONFIG, **(config or {})}
+        self.__path = config["path"]
+        self.__server = ThreadingHTTPServer((config["host"], int(config["port"])), self.__create_request_handler())
+        self.__server.daemon_threads = True
+        self.__thread = Thread(target=self.__server.serve_forever, name="Metrics Endpoint Thread", daemon=True)
+        self.__thread.start()
+        self._log.info("Metrics endpoint started on http://%s:%i%s", config["host"], self.port, self.__path)
+
+    @property
+    def port(self) -> int:
+        return self.__server.server_address[1]
+
+    def stop(self):
+        self.__server.shutdown()
+        self.__server.server_close()
+        self.__thread.join()
+
+    def collect_metrics(self) -> str:
+        lines = []
+        self.__add_gateway_metrics(lines)
+        self.__add_statistics_counters(lines)
+        self.__add_latency_metrics(lines)
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def __add_gateway_metrics(self, lines: List[str]):
+        gateway = self._gateway
+        add_metric(lines, "queue_size", "gauge", "Messages waiting in the internal queues.",
+                   (("", {"queue": queue}, size) for queue, size in gateway.get_internal_queues_sizes().items()))
+        add_metric(lines, "rpc_requests_in_progress", "gauge", "RPC requests to devices waiting for a reply.",
+                   (("", {}, gateway.get_rpc_requests_in_progress_count()),))
+        add_metric(lines, "storage_events", "gauge",
+                   "Backlog of the event storage, for the file storage it is the count of data files.",
+                   (("", {"storage": gateway.get_storage_name()}, gateway.get_storage_events_count()),))
+        report_strategy_service = gateway.get_report_strategy_service()
+        if report_strategy_service is not None:
+            add_metric(lines, "report_strategy_cache_size", "gauge", "Datapoints cached by the report strategy.",
+                       (("", {}, report_strategy_service.get_data_cache_size()),))
+
+    @staticmethod
+    def __add_statistics_counters(lines: List[str]):
+        counters_samples = {}
+        for key, count in sorted(StatisticsService.get_total_counters().items(), key=str):
+            if isinstance(key, tuple):
+                connector_name, statistic_name = key
+                counters_samples.setdefault(statistic_name, []).append(("_total", {"connector": connector_name},
+                                                                        count))
+            else:
+                counters_samples.setdefault(key, []).append(("_total", {}, count))
+        for statistic_name, samples in counters_samples.items():
+            add_metric(lines, to_metric_name(statistic_name), "counter", "Statistic %s." % statistic_name, samples)
+
+    @staticmethod
+    def __add_latency_metrics(lines: List[str]):
+        if not LatencyStatistics.ENABLED:
+            return
+        samples = []
+        for connector_name, stages in LatencyStatistics.get_statistics().items():
+            for stage, summary in stages.items():
+                for percentile in REPORTED_PERCENTILES:
+                    samples.append(("", {"connector": connector_name, "stage": stage,
+                                         "quantile": str(percentile / 100)}, summary["p%d" % percentile] / 1000))
+        add_metric(lines, "stage_latency_seconds", "gauge",
+                   "Dwell time of sampled messages in the pipeline stages since the last statistics report.", samples)
+
+    def __create_request_handler(self):
+        endpoint = self
+        metrics_path = self.__path
+
+        class MetricsRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):  # noqa
+                if self.path.split("?", 1)[0] != metrics_path:
+                    self.send_error(404)
+                    return
+                try:
+                    body = endpoint.collect_metrics().encode("utf-8")
+                except Exception as e:
+                    endpoint._log.error("Failed to collect metrics", exc_info=e)
+                    self.send_error(500)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):  # noqa
+                endpoint._log.debug("Metrics endpoint: " + format, *args)
+
+        return MetricsRequestHandler
+
+
+def to_metric_name(statistic_name: str) -> str:
+    return CAMEL_CASE_BOUNDARY_PATTERN.sub("_", statistic_name).lower()
+
+
+def add_metric(lines: List[str], name: str, metric_type: str, help_text: str, samples: Iterable[Sample]):
+    name = METRICS_PREFIX + name
+    lines.append("# TYPE %s %s" % (name, metric_type))
+    lines.append("# HELP %s %s" % (name, help_text))
+    for suffix, labels, value in samples:
+        if labels:
+            labels_str = ",".join('%s="%s"' % (label, escape_label_value(label_value))
+                                  for label, label_value in labels.items())
+            lines.append("%s%s{%s} %s" % (name, suffix, labels_str, format_value(value)))
+        else:
+            lines.append("%s%s %s" % (name, suffix, format_value(value)))
+
+
+def escape_label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_value(value) -> str:
+    if isinstance(value, float):
+        return repr(value)
+    return str(int(value))
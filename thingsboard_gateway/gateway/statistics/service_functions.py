@@ -108,3 +108,15 @@ class StatisticsServiceFunctions:
     @staticmethod
     def platform_ts_produced(_):
         return statistics_service.StatisticsService.STATISTICS_STORAGE.get('platformTsProduced')
+
+    @staticmethod
+    def platform_coalesced_msgs_pushed(_):
+        return statistics_service.StatisticsService.STATISTICS_STORAGE.get('platformCoalescedMsgPushed')
+
+    @staticmethod
+    def platform_coalesced_devices(_):
+        return statistics_service.StatisticsService.STATISTICS_STORAGE.get('platformCoalescedDevices')
+
+    @staticmethod
+    def platform_published_bytes(_):
+        return statistics_service.StatisticsService.STATISTICS_STORAGE.get('platformPublishedBytes')
@@ -0,0 +1,82 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from threading import Lock
+from time import monotonic
+from typing import Callable, Dict, List
+
+# Callers schedule collections by whole seconds of the monotonic clock, so the time between two calls for the same
+# period may be up to a second shorter than the period
+REFRESH_PERIOD_TOLERANCE = 1.0
+
+
+class StatisticsCollector:
+    """
+    Collects statistics values concurrently in a bounded thread pool and caches them.
+    A value is collected again when its refresh period ("refreshPeriodInSeconds" of the attribute config)
+    has passed since its previous collection was started and that collection is finished, so a slow collector
+    never runs twice at the same time. Periods are compared with REFRESH_PERIOD_TOLERANCE, so a value with
+    the same refresh period as the caller's cadence is collected on every call.
+    collect waits for the started collections at most wait_timeout seconds, values that are not ready
+    by then are taken from the cache and get reported by the next call.
+    """
+
+    def __init__(self, log, max_workers: int, name: str):
+        self._log = log
+        self.__executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix=name)
+        self.__lock = Lock()
+        self.__values = {}
+        self.__started_at: Dict[str, float] = {}
+        self.__futures: Dict[str, Future] = {}
+
+    def collect(self, attributes: List[dict], collect_function: Callable[[dict], object],
+                default_refresh_period: float = 0, wait_timeout: float = 0) -> dict:
+        current_monotonic = monotonic()
+        started_futures = []
+        for attribute in attributes:
+            attribute_name = attribute['attributeOnGateway']
+            future = self.__futures.get(attribute_name)
+            if future is not None and not future.done():
+                continue
+            started_at = self.__started_at.get(attribute_name)
+            refresh_period = attribute.get('refreshPeriodInSeconds', default_refresh_period)
+            if started_at is not None and current_monotonic - started_at < refresh_period - REFRESH_PERIOD_TOLERANCE:
+                continue
+            self.__started_at[attribute_name] = current_monotonic
+            future = self.__executor.submit(self.__collect_value, attribute_name, attribute, collect_function)
+            self.__futures[attribute_name] = future
+            started_futures.append(future)
+
+        if started_futures and wait_timeout > 0:
+            wait(started_futures, timeout=wait_timeout)
+
+        with self.__lock:
+            return {attribute['attributeOnGateway']: self.__values[attribute['attributeOnGateway']]
+                    for attribute in attributes if attribute['attributeOnGateway'] in self.__values}
+
+    def stop(self):
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+
+    def __collect_value(self, attribute_name: str, attribute: dict, collect_function: Callable[[dict], object]):
+        try:
+            value = collect_function(attribute)
+        except Exception as e:
+            self._log.warning("Statistic parameter %s raise the exception: %s", attribute_name, e)
+            value = None
+        with self.__lock:
+            if value is None or value == '':
+                self.__values.pop(attribute_name, None)
+            else:
+                self.__values[attribute_name] = value
@@ -14,7 +14,7 @@
 
 import datetime
 import subprocess
-from threading import Thread, RLock, Event
+from threading import Thread, RLock, Event, current_thread, local
 from time import monotonic, sleep
 from platform import system as platform_system
 
@@ -22,6 +22,8 @@ import simplejson
 
 from thingsboard_gateway.gateway.statistics.configs import ONCE_SEND_STATISTICS_CONFIG, SERVICE_STATS_CONFIG, \
     MACHINE_STATS_CONFIG
+from thingsboard_gateway.gateway.statistics.latency_statistics import LatencyStatistics
+from thingsboard_gateway.gateway.statistics.statistics_collector import StatisticsCollector
 
 
 class StatisticsService(Thread):
@@ -41,6 +43,9 @@ class StatisticsService(Thread):
         'platformMsgPushed': 0,
         'platformAttrProduced': 0,
         'platformTsProduced': 0,
+        'platformCoalescedMsgPushed': 0,
+        'platformCoalescedDevices': 0,
+        'platformPublishedBytes': 0,
     }
 
     # This is a dictionary that stores the statistics for each connector
@@ -56,6 +61,24 @@ class StatisticsService(Thread):
     CONNECTOR_STATISTICS_STORAGE = {}
     __LOCK = RLock()
 
+    # Counters are incremented in a separate shard for every thread, so increments from different threads
+    # never overwrite each other and do not wait for a lock. Shards are summed up only when statistics are sent,
+    # values in the storages above are the differences with the totals of the previous report.
+    # Keys of the shards are statistic names and (connector name, statistic name) tuples.
+    __SHARD = local()
+    __SHARDS = []
+    __FINISHED_THREADS_COUNTERS = {}
+    __REPORTED_COUNTERS = {}
+
+    # Sizes of messages without a raw payload are measured for every BYTES_COUNT_SAMPLING_INTERVAL-th message
+    # of the statistic, other messages are counted with the average of the measured ones.
+    BYTES_COUNT_SAMPLING_INTERVAL = 16
+    __BYTES_COUNT_SAMPLES = {}
+
+    # The send cycle waits for the collections started by it at most this time, slower collectors are reported
+    # with the values collected before
+    COLLECTION_WAIT_TIMEOUT = 1
+
     def __init__(self, statistics_configuration, gateway, log, config_path=None):
         stats_send_period_in_seconds = statistics_configuration['statsSendPeriodInSeconds']
         self._custom_stats_send_period_in_seconds = statistics_configuration.get('customStatsSendPeriodInSeconds', 300)
@@ -69,6 +92,10 @@ class StatisticsService(Thread):
         self._gateway = gateway
         self._log = log
         self._custom_command_config = self._load_config()
+        self.__machine_stats_collector = StatisticsCollector(log, max_workers=2, name='Machine Statistics Collector')
+        self.__custom_command_collector = StatisticsCollector(
+            log, max_workers=statistics_configuration.get('customStatsMaxWorkers', 4),
+            name='Custom Statistics Collector')
         self.__install_required_tools()
         self._last_service_poll = 0
         self._last_custom_command_poll = 0
@@ -78,6 +105,8 @@ class StatisticsService(Thread):
 
     def stop(self):
         self._stopped.set()
+        self.__machine_stats_collector.stop()
+        self.__custom_command_collector.stop()
 
     def _load_config(self):
         config = []
@@ -117,24 +146,85 @@ class StatisticsService(Thread):
     @classmethod
     def add_count(cls, stat_key, count=1, stat_parameter_name=None, statistics_type='STATISTICS_STORAGE'):
         if StatisticsService.ENABLED:
+            counters = getattr(cls.__SHARD, 'counters', None)
+            if counters is None:
+                counters = cls.__add_shard()
             if statistics_type == 'CONNECTOR_STATISTICS_STORAGE':
-                try:
-                    if cls.CONNECTOR_STATISTICS_STORAGE.get(stat_key) is None:
-                        cls.CONNECTOR_STATISTICS_STORAGE[stat_key] = {}
+                stat_key = (stat_key, stat_parameter_name)
+            counters[stat_key] = counters.get(stat_key, 0) + count
 
-                    cls.CONNECTOR_STATISTICS_STORAGE[stat_key][stat_parameter_name] += count
-                except KeyError:
-                    cls.CONNECTOR_STATISTICS_STORAGE[stat_key].update({stat_parameter_name: count})
+    @classmethod
+    def __add_shard(cls):
+        counters = {}
+        with cls.__LOCK:
+            cls.__SHARDS.append((current_thread(), counters))
+        cls.__SHARD.counters = counters
+        return counters
+
+    @classmethod
+    def aggregate_statistics(cls):
+        """
+        Sums up the counters of all threads and puts the values counted since the previous clearing
+        to STATISTICS_STORAGE and CONNECTOR_STATISTICS_STORAGE. Returns the totals to pass to clear_statistics.
+        """
+        with cls.__LOCK:
+            totals = cls.__sum_shards()
+            for key in cls.STATISTICS_STORAGE:
+                cls.STATISTICS_STORAGE[key] = 0
+            connector_statistics = {}
+            for key, total in totals.items():
+                count = total - cls.__REPORTED_COUNTERS.get(key, 0)
+                if isinstance(key, tuple):
+                    if count:
+                        connector_statistics.setdefault(key[0], {})[key[1]] = count
+                else:
+                    cls.STATISTICS_STORAGE[key] = count
+            cls.CONNECTOR_STATISTICS_STORAGE = connector_statistics
+            return totals
+
+    @classmethod
+    def get_total_counters(cls):
+        """
+        Returns everything counted since the start, general statistics by their names
+        and connector statistics by (connector name, statistic name) tuples.
+        """
+        with cls.__LOCK:
+            return cls.__sum_shards()
+
+    @classmethod
+    def __sum_shards(cls):
+        totals = dict(cls.__FINISHED_THREADS_COUNTERS)
+        active_shards = []
+        for thread, counters in cls.__SHARDS:
+            # Checked before copying: counters of a finished thread are final only if it finished before the copy
+            is_thread_alive = thread.is_alive()
+            # Copying of a dict is atomic, the owning thread may keep incrementing the counters meanwhile
+            shard_counters = counters.copy()
+            if is_thread_alive:
+                active_shards.append((thread, counters))
             else:
-                cls.STATISTICS_STORAGE[stat_key] += count
+                cls.__add_counters(cls.__FINISHED_THREADS_COUNTERS, shard_counters)
+            cls.__add_counters(totals, shard_counters)
+        cls.__SHARDS = active_shards
+        return totals
 
     @classmethod
-    def clear_statistics(cls):
+    def clear_statistics(cls, reported_totals=None):
+        """
+        Starts counting from zero. Counts made after reported_totals were aggregated are kept for the next report,
+        without reported_totals everything counted so far is dropped.
+        """
         with cls.__LOCK:
+            cls.__REPORTED_COUNTERS = reported_totals if reported_totals is not None else cls.aggregate_statistics()
             for key in cls.STATISTICS_STORAGE:
                 cls.STATISTICS_STORAGE[key] = 0
             cls.CONNECTOR_STATISTICS_STORAGE = {}
 
+    @staticmethod
+    def __add_counters(totals, counters):
+        for key, count in counters.items():
+            totals[key] = totals.get(key, 0) + count
+
     @staticmethod
     def count_connector_message(connector_name, stat_parameter_name, count=1):
         if StatisticsService.ENABLED:
@@ -142,12 +232,43 @@ class StatisticsService(Thread):
                                         statistics_type='CONNECTOR_STATISTICS_STORAGE', count=count)
 
     @staticmethod
-    def count_connector_bytes(connector_name, msg, stat_parameter_name):
+    def count_connector_bytes(connector_name, msg, stat_parameter_name, bytes_count=None):
         if StatisticsService.ENABLED:
-            bytes_count = str(msg).__sizeof__()
+            if bytes_count is None:
+                bytes_count = StatisticsService.get_bytes_count(msg, (connector_name, stat_parameter_name))
             StatisticsService.add_bytes(connector_name, bytes_count, stat_parameter_name,
                                         statistics_type='CONNECTOR_STATISTICS_STORAGE')
 
+    @classmethod
+    def get_bytes_count(cls, data, sample_key) -> int:
+        """
+        Length of the raw payload for bytes, strings and messages with a bytes payload (e.g. MQTT messages).
+        Sizes of other objects are sampled per sample_key, see BYTES_COUNT_SAMPLING_INTERVAL.
+        """
+        data_type = type(data)
+        if data_type is bytes or data_type is bytearray:
+            return len(data)
+        if data_type is str:
+            return len(data) if data.isascii() else len(data.encode('utf-8'))
+        payload = getattr(data, 'payload', None)
+        if isinstance(payload, (bytes, bytearray)):
+            return len(payload)
+        if data_type is memoryview:
+            return data.nbytes
+
+        # Counts and averages are not locked, races can only make the estimation a bit less precise
+        sample = cls.__BYTES_COUNT_SAMPLES.get(sample_key)
+        if sample is None:
+            sample = cls.__BYTES_COUNT_SAMPLES[sample_key] = [0, 0]
+        messages_count, average_bytes_count = sample
+        sample[0] = messages_count + 1
+        if messages_count % cls.BYTES_COUNT_SAMPLING_INTERVAL:
+            return int(average_bytes_count)
+        bytes_count = len(str(data))
+        measurements_count = messages_count // cls.BYTES_COUNT_SAMPLING_INTERVAL + 1
+        sample[1] = average_bytes_count + (bytes_count - average_bytes_count) / min(measurements_count, 16)
+        return bytes_count
+
     def __install_required_tools(self):
         if self._custom_command_config:
             for attribute in self._custom_command_config:
@@ -164,36 +285,37 @@ class StatisticsService(Thread):
                         self._log.error("Error while executing installation command '%s': %s", installation_command, e)
 
     def __collect_custom_command_statistics(self):
-        message = {}
-        for attribute in self._custom_command_config:
-            try:
-                if attribute.get('command') is not None:
-                    if platform_system() == 'Windows':
-                        process = subprocess.run(attribute['command'], stdout=subprocess.PIPE,
-                                                 stderr=subprocess.PIPE,
-                                                 encoding='utf-8', timeout=attribute['timeout'])
-                    else:
-                        process = subprocess.run(['/bin/sh', '-c', attribute['command']],
-                                                 stdout=subprocess.PIPE,
-                                                 stderr=subprocess.PIPE,
-                                                 encoding='utf-8', timeout=attribute['timeout'])
-
-                    value = process.stdout
-                else:
-                    value = attribute['function'](self._gateway)
-                if not value:
-                    continue
-                try:
-                    value = float(value)
-                except ValueError:
-                    pass
-            except Exception as e:
-                self._log.warning("Statistic parameter %s raise the exception: %s",
-                                  attribute['attributeOnGateway'], e)
-                continue
-            message[attribute['attributeOnGateway']] = value
+        return self.__custom_command_collector.collect(self._custom_command_config, self.__collect_custom_command_value,
+                                                       default_refresh_period=self._custom_stats_send_period_in_seconds,
+                                                       wait_timeout=self.COLLECTION_WAIT_TIMEOUT)
+
+    def __collect_custom_command_value(self, attribute):
+        if attribute.get('command') is not None:
+            if platform_system() == 'Windows':
+                process = subprocess.run(attribute['command'], stdout=subprocess.PIPE,
+                                         stderr=subprocess.PIPE,
+                                         encoding='utf-8', timeout=attribute['timeout'])
+            else:
+                process = subprocess.run(['/bin/sh', '-c', attribute['command']],
+                                         stdout=subprocess.PIPE,
+                                         stderr=subprocess.PIPE,
+                                         encoding='utf-8', timeout=attribute['timeout'])
 
-        return message
+            value = process.stdout
+        else:
+            value = attribute['function'](self._gateway)
+        if not value:
+            return None
+        try:
+            value = float(value)
+        except ValueError:
+            pass
+        return value
+
+    def __collect_machine_statistics(self):
+        return self.__machine_stats_collector.collect(MACHINE_STATS_CONFIG,
+                                                      lambda attribute: attribute['function'](self._gateway),
+                                                      wait_timeout=self.COLLECTION_WAIT_TIMEOUT)
 
     def __collect_statistics_from_config(self, statistics_config):
         message = {}
@@ -228,15 +350,18 @@ class StatisticsService(Thread):
                 self._gateway.send_telemetry(custom_command_statistics_message)
 
     def __send_statistics(self):
-        statistics_message = {'machineStats': self.__collect_statistics_from_config(MACHINE_STATS_CONFIG),
+        reported_totals = self.aggregate_statistics()
+        statistics_message = {'machineStats': self.__collect_machine_statistics(),
                               'serviceStats': self.__collect_service_statistics(),
                               'connectorsStats': self.CONNECTOR_STATISTICS_STORAGE}
+        if LatencyStatistics.ENABLED:
+            statistics_message['latencyStats'] = LatencyStatistics.get_statistics(reset=True)
         self._log.info('Collected regular statistics: %s', statistics_message)
         if StatisticsService.ENABLED:
             self._gateway.send_telemetry(statistics_message)
         else:
             self._log.debug('Statistics are disabled. Not sending collected statistics.')
-        self.clear_statistics()
+        self.clear_statistics(reported_totals)
 
     def __send_general_machine_state(self):
         message = self.__collect_statistics_from_config(ONCE_SEND_STATISTICS_CONFIG)
@@ -25,19 +25,21 @@ from sys import path
 from ssl import CERT_REQUIRED
 from copy import deepcopy
 from time import sleep, time
-from typing import Union
+from typing import List, Union
 import socks
 
 from simplejson import dumps, load
 
 from thingsboard_gateway.gateway.constants import DEV_MODE_PARAMETER_NAME, PROVISIONED_CREDENTIALS_FILENAME
+from thingsboard_gateway.gateway.publish_coalescer import CoalescedPayload, TELEMETRY_DATA_TYPE
+from thingsboard_gateway.gateway.uplink_shards import ConsistentHashRing, UplinkShard
 from thingsboard_gateway.tb_utility.tb_utility import TBUtility
 
 try:
     if environ.get(DEV_MODE_PARAMETER_NAME) is not None and environ.get(DEV_MODE_PARAMETER_NAME).lower() == 'true':
         raise ImportError
     from tb_gateway_mqtt import TBGatewayMqttClient, TBDeviceMqttClient, \
-        GATEWAY_ATTRIBUTES_RESPONSE_TOPIC, GATEWAY_ATTRIBUTES_TOPIC
+        GATEWAY_ATTRIBUTES_RESPONSE_TOPIC, GATEWAY_ATTRIBUTES_TOPIC, GATEWAY_TELEMETRY_TOPIC
     import tb_device_mqtt
 except ImportError:
     mqtt_client_path = abspath(join(dirname(__file__), '..', '..', 'tb_mqtt_client'))
@@ -45,13 +47,13 @@ except ImportError:
     if exists(mqtt_client_path) and TBUtility.str_to_bool(environ.get(DEV_MODE_PARAMETER_NAME, 'false')):
         path.insert(0, mqtt_client_path)
         from tb_gateway_mqtt import TBGatewayMqttClient, TBDeviceMqttClient, \
-            GATEWAY_ATTRIBUTES_RESPONSE_TOPIC, GATEWAY_ATTRIBUTES_TOPIC
+            GATEWAY_ATTRIBUTES_RESPONSE_TOPIC, GATEWAY_ATTRIBUTES_TOPIC, GATEWAY_TELEMETRY_TOPIC
         import tb_device_mqtt
     else:
         print("tb-mqtt-client library not found - installing...")
         TBUtility.install_package('tb-mqtt-client')
         from tb_gateway_mqtt import TBGatewayMqttClient, TBDeviceMqttClient, \
-            GATEWAY_ATTRIBUTES_RESPONSE_TOPIC, GATEWAY_ATTRIBUTES_TOPIC
+            GATEWAY_ATTRIBUTES_RESPONSE_TOPIC, GATEWAY_ATTRIBUTES_TOPIC, GATEWAY_TELEMETRY_TOPIC
         import tb_device_mqtt
 
 tb_device_mqtt.DEFAULT_TIMEOUT = 3
@@ -153,6 +155,11 @@ class TBClient(threading.Thread):
         self.client._client._on_connect = self._on_connect  # noqa pylint: disable=protected-access
         self.client._client._on_disconnect = self._on_disconnect  # noqa pylint: disable=protected-access
         # self.client._client._on_log = self._on_log  # noqa pylint: disable=protected-access
+
+        # Additional connections publishing data of the devices assigned to them, shard 0 is the main connection
+        self.__uplink_shards: List[UplinkShard] = []
+        self.__uplink_shards_ring = None
+        self.__create_uplink_shards(config.get('uplinkShards', {}))
         self.start()
 
     # def _on_log(self, *args):
@@ -247,6 +254,53 @@ class TBClient(threading.Thread):
             else:
                 self.client._client.proxy_set(proxy_type=socks.HTTP, proxy_addr=self.__proxy_host)
 
+    def __create_uplink_shards(self, uplink_shards_config):
+        shards_count = int(uplink_shards_config.get('count', 1))
+        if shards_count <= 1:
+            return
+        if self.__client_id:
+            # The platform checks the client id of MQTT basic credentials, the shards can not have the same one,
+            # as connections with the same client id disconnect each other
+            self.__logger.error("Uplink shards can not be used with MQTT basic credentials that have clientId, "
+                                "data will be published through the main connection only")
+            return
+        # pylint: disable=protected-access
+        mqtt_client = self.client._client  # noqa pylint: disable=protected-access
+        max_inflight_messages = uplink_shards_config.get('maxInflightMessages', mqtt_client._max_inflight_messages)
+        for index in range(1, shards_count):
+            # Empty client id is generated by the client
+            self.__uplink_shards.append(UplinkShard(index, '', self.__username, self.__password,
+                                                    max_inflight_messages, self.__logger,
+                                                    protocol=mqtt_client.protocol))
+        self.__uplink_shards_ring = ConsistentHashRing(shards_count)
+        self.__logger.info("Data will be published through %i connections", shards_count)
+
+    def __start_uplink_shards(self):
+        # pylint: disable=protected-access
+        mqtt_client = self.client._client  # noqa pylint: disable=protected-access
+        ssl_context = mqtt_client._ssl_context if mqtt_client._ssl else None  # noqa pylint: disable=protected-access
+        for uplink_shard in self.__uplink_shards:
+            uplink_shard.start(self.__host, self.__port, self.__config.get("keep_alive", 120),
+                               ssl_context=ssl_context,
+                               tls_insecure=mqtt_client._tls_insecure,  # noqa pylint: disable=protected-access
+                               proxy=mqtt_client._proxy)  # noqa pylint: disable=protected-access
+
+    def __stop_uplink_shards(self):
+        for uplink_shard in self.__uplink_shards:
+            uplink_shard.stop()
+
+    def __is_uplink_shard_connected(self, shard):
+        return shard == 0 or self.__uplink_shards[shard - 1].is_connected()
+
+    def get_uplink_shards_count(self):
+        return len(self.__uplink_shards) + 1
+
+    def get_uplink_shard(self, device_name):
+        """Returns the connection for data of the device, devices of disconnected shards are moved to others."""
+        if self.__uplink_shards_ring is None:
+            return 0
+        return self.__uplink_shards_ring.get_shard(device_name, self.__is_uplink_shard_connected)
+
     def __get_rate_limit_config(self):
         rate_limits_config = {}
         if self.__config.get('messagesRateLimits'):
@@ -343,6 +397,7 @@ class TBClient(threading.Thread):
                 # TODO: move to high priority.
             else:
                 self.__initial_connection_done = True
+            self.__start_uplink_shards()
         # pylint: disable=protected-access
         self.client._on_connect(client, userdata, flags, result_code, parameters, *extra_params) # noqa pylint: disable=protected-access
         try:
@@ -376,12 +431,14 @@ class TBClient(threading.Thread):
 
     def stop(self):
         # self.disconnect()
+        self.__stop_uplink_shards()
         self.client.stop()
         self.__stopped = True
         self.__stop_event.set()
 
     def disconnect(self):
         self.__paused = True
+        self.__stop_uplink_shards()
         self.unsubscribe('*')
         return self.client.disconnect()
 
@@ -479,6 +536,42 @@ class TBClient(threading.Thread):
     def get_max_payload_size(self):
         return self.client.max_payload_size # noqa pylint: disable=protected-access
 
+    def get_max_datapoints_per_message(self):
+        minimal_limit = self.client._devices_connected_through_gateway_telemetry_datapoints_rate_limit.get_minimal_limit()  # noqa pylint: disable=protected-access
+        return int(minimal_limit) if minimal_limit != float('inf') else 0
+
+    def get_gateway_telemetry_rate_limits(self):
+        """Returns the messages and datapoints rate limits applied to messages published by publish_coalesced."""
+        return (self.client._devices_connected_through_gateway_telemetry_messages_rate_limit,  # noqa pylint: disable=protected-access
+                self.client._devices_connected_through_gateway_telemetry_datapoints_rate_limit)  # noqa pylint: disable=protected-access
+
+    def publish_coalesced(self, payload: CoalescedPayload, quality_of_service, compression=None, shard=0):
+        """
+        Publishes a gateway API message with data of several devices, prepared by PublishCoalescer.
+        Compressed messages are published to the gateway topic with the compression name suffix,
+        e.g. v1/gateway/telemetry/zlib.
+        The message is published through the uplink shard connection, when shard is not 0. The rate limits
+        are shared by all connections, as the platform applies them to the gateway.
+        """
+        topic = GATEWAY_TELEMETRY_TOPIC if payload.data_type == TELEMETRY_DATA_TYPE else GATEWAY_ATTRIBUTES_TOPIC
+        if compression:
+            topic += '/' + compression
+
+        # The payload is ready to be sent, so the rate limits are applied here instead of the client publish method
+        msg_rate_limit = self.client._devices_connected_through_gateway_telemetry_messages_rate_limit  # noqa pylint: disable=protected-access
+        dp_rate_limit = self.client._devices_connected_through_gateway_telemetry_datapoints_rate_limit  # noqa pylint: disable=protected-access
+        if msg_rate_limit.has_limit() or dp_rate_limit.has_limit():
+            rate_limited = self.client._wait_for_rate_limit_released(tb_device_mqtt.DEFAULT_TIMEOUT, msg_rate_limit,  # noqa pylint: disable=protected-access
+                                                                     dp_rate_limit, amount=payload.datapoints)
+            if rate_limited:
+                return rate_limited
+            msg_rate_limit.increase_rate_limit_counter()
+            dp_rate_limit.increase_rate_limit_counter(payload.datapoints)
+
+        mqtt_client = self.client._client if shard == 0 else self.__uplink_shards[shard - 1]  # noqa pylint: disable=protected-access
+        result = mqtt_client.publish(topic, payload.payload, qos=quality_of_service)
+        return tb_device_mqtt.TBPublishInfo(result)
+
     def update_logger(self):
         self.__logger.setLevel(getLogger("tb_connection").level)
         self.__logger.handlers = getLogger("tb_connection").handlers
@@ -41,15 +41,21 @@ from thingsboard_gateway.gateway.constants import DEFAULT_CONNECTORS, CONNECTED_
     CONNECTOR_ID_PARAMETER, ATTRIBUTES_FOR_REQUEST, CONFIG_VERSION_PARAMETER, CONFIG_SECTION_PARAMETER, \
     DEBUG_METADATA_TEMPLATE_SIZE, SEND_TO_STORAGE_TS_PARAMETER, DATA_RETRIEVING_STARTED, ReportStrategy, \
     REPORT_STRATEGY_PARAMETER, DEFAULT_STATISTIC, DEFAULT_DEVICE_FILTER, CUSTOM_RPC_DIR, DISCONNECTED_PARAMETER, \
-    PROVISIONED_CREDENTIALS_FILENAME
+    PROVISIONED_CREDENTIALS_FILENAME, LATENCY_TIMESTAMPS_PARAMETER
 from thingsboard_gateway.gateway.device_filter import DeviceFilter
+from thingsboard_gateway.gateway.entities.connector_storage_context import ConnectorStorageContext
 from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
 from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
 from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
+from thingsboard_gateway.gateway.publish_coalescer import COMPRESSION_NONE, PublishCoalescer
+from thingsboard_gateway.gateway.publish_scheduler import PublishScheduler
 from thingsboard_gateway.gateway.report_strategy.report_strategy_service import ReportStrategyService
 from thingsboard_gateway.gateway.shell.proxy import AutoProxy
 from thingsboard_gateway.gateway.statistics.decorators import CountMessage, CollectStorageEventsStatistics, \
     CollectAllSentTBBytesStatistics, CollectRPCReplyStatistics
+from thingsboard_gateway.gateway.statistics.latency_statistics import LatencyStatistics, ACK_STAGE, \
+    CONVERTED_DATA_QUEUE_STAGE, EVENT_STORAGE_STAGE, PUBLISH_STAGE, READ_PACK_STAGE, STORAGE_FILL_STAGE
+from thingsboard_gateway.gateway.statistics.metrics_endpoint import MetricsEndpoint
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
 from thingsboard_gateway.gateway.tb_client import TBClient
 from thingsboard_gateway.storage.file.file_event_storage import FileEventStorage
@@ -60,6 +66,7 @@ from thingsboard_gateway.tb_utility.tb_handler import TBRemoteLoggerHandler
 from thingsboard_gateway.tb_utility.tb_loader import TBModuleLoader
 from thingsboard_gateway.tb_utility.tb_logger import TbLogger
 from thingsboard_gateway.tb_utility.tb_remote_shell import RemoteShell
+from thingsboard_gateway.tb_utility.tb_sampling_profiler import PROFILER_RPC_CONFIG_OVERRIDES, TBSamplingProfiler
 from thingsboard_gateway.tb_utility.tb_updater import TBUpdater
 from thingsboard_gateway.tb_utility.tb_utility import TBUtility
 
@@ -201,11 +208,14 @@ class TBGatewayService:
 
         self.__debug_log_enabled = log.isEnabledFor(10)
         self.update_loggers()
+        self.__devices_idle_checker = self.__config['thingsboard'].get('checkingDeviceActivity', {})
+        self.__check_devices_idle = self.__devices_idle_checker.get('checkDeviceInactivity', False)
         self.__save_converted_data_thread = Thread(name="Storage fill thread", daemon=True,
                                                    target=self.__send_to_storage)
         self.__save_converted_data_thread.start()
 
         self.init_remote_shell(self.__config["thingsboard"].get("remoteShell"))
+        self.init_profiler(self.__config["thingsboard"].get("profiler"))
         self.__rpc_processing_thread = Thread(target=self.__send_rpc_reply_processing, daemon=True,
                                               name="RPC processing thread")
         self.__rpc_processing_thread.start()
@@ -219,8 +229,6 @@ class TBGatewayService:
 
         self.init_grpc_service(self.__config.get('grpc'))
 
-        self.__devices_idle_checker = self.__config['thingsboard'].get('checkingDeviceActivity', {})
-        self.__check_devices_idle = self.__devices_idle_checker.get('checkDeviceInactivity', False)
         if self.__check_devices_idle:
             thread = Thread(name='Checking devices idle time', target=self.__check_devices_idle_time, daemon=True)
             thread.start()
@@ -233,6 +241,36 @@ class TBGatewayService:
         self.__min_pack_size_to_send = self.__config['thingsboard'].get('minPackSizeToSend', 500)
         self.__max_payload_size_in_bytes = self.__config["thingsboard"].get("maxPayloadSizeBytes", 8196)
 
+        # Data of many devices is sent in fewer, larger messages when configured
+        self.__publish_coalescer = None
+        publish_coalescing_config = self.__config["thingsboard"].get("publishCoalescing", {})
+        if publish_coalescing_config.get("enabled", False):
+            if publish_coalescing_config.get("compression", COMPRESSION_NONE).lower() != COMPRESSION_NONE:
+                # The platform does not announce support of compressed gateway messages, compressed messages
+                # would be acknowledged by the broker and dropped by the platform
+                log.error("Compression of published messages is not supported by the platform, "
+                          "messages will be sent uncompressed")
+                publish_coalescing_config = {**publish_coalescing_config, "compression": COMPRESSION_NONE}
+            self.__publish_coalescer = PublishCoalescer(publish_coalescing_config, log)
+            log.info("Publish coalescing is enabled, compression: %s", self.__publish_coalescer.compression)
+
+        # Coalesced messages are shaped to the rate limits before publishing instead of waiting in the client
+        # (one scheduler per uplink shard, created on the first data of the shard)
+        self.__publish_scheduler_config = None
+        self.__publish_schedulers = {}
+        self.__scheduled_pack_incomplete = False
+        publish_scheduler_config = self.__config["thingsboard"].get("publishScheduler", {})
+        if publish_scheduler_config.get("enabled", False):
+            if self.__publish_coalescer is None:
+                self.__publish_coalescer = PublishCoalescer({}, log)
+            self.__publish_scheduler_config = publish_scheduler_config
+            log.info("Rate limit aware publish scheduler is enabled")
+
+        # Data of devices is published through several connections, every device is assigned to one of them
+        uplink_shards_count = self.__config["thingsboard"].get("uplinkShards", {}).get("count", 1)
+        if self.__publish_coalescer is None and uplink_shards_count > 1:
+            self.__publish_coalescer = PublishCoalescer({}, log)
+
         self._send_thread = Thread(target=self.__read_data_from_storage, daemon=True,
                                    name="Send data to Thingsboard Thread")
         self._send_thread.start()
@@ -302,6 +340,9 @@ class TBGatewayService:
         self.__remote_shell = None
         self.__statistics = None
         self.__statistics_service = None
+        self.__metrics_endpoint = None
+        self.__profiler_config = None
+        self.__profiler = None
         self.__grpc_config = None
         self.__grpc_connectors = None
         self.__grpc_manager = None
@@ -317,7 +358,8 @@ class TBGatewayService:
         self.available_connectors_by_name: dict[str, Connector] = {}
         self.available_connectors_by_id: dict[str, Connector] = {}
         self.__devices_shared_attributes = {}
-        self.__connector_incoming_messages = {}
+        self.__connectors_storage_contexts: dict[tuple, ConnectorStorageContext] = {}
+        self.__check_devices_idle = False
         self.__connected_devices = {}
         self.__renamed_devices = {}
         self.__saved_devices = {}
@@ -355,6 +397,7 @@ class TBGatewayService:
             "device_renamed": self.__process_renamed_gateway_devices,
             "device_deleted": self.__process_deleted_gateway_devices,
             "remove_provisioned_credentials": self.__process_remove_provisioned_credentials,
+            "profiler": self.__rpc_profiler,
         }
         self.load_custom_rpc_methods(CUSTOM_RPC_DIR)
         self.__rpc_scheduled_methods_functions = {
@@ -404,6 +447,7 @@ class TBGatewayService:
 
     def init_statistics_service(self, config):
         self.__statistics = config # noqa
+        LatencyStatistics.configure(self.__statistics.get('latencyStats'))
         if isinstance(self.__statistics_service, StatisticsService):
             self.__statistics_service.stop()
         if self.__statistics.get('enable', False) or self.__statistics.get('enableCustom', False):
@@ -429,6 +473,17 @@ class TBGatewayService:
             StatisticsService.disable_statistics()
             StatisticsService.disable_custom_statistics()
             log.debug('Statistics service disabled')
+        self.__init_metrics_endpoint(self.__statistics.get('metricsEndpoint'))
+
+    def __init_metrics_endpoint(self, config):
+        if self.__metrics_endpoint is not None:
+            self.__metrics_endpoint.stop()
+            self.__metrics_endpoint = None
+        if config is not None and config.get('enable', False):
+            try:
+                self.__metrics_endpoint = MetricsEndpoint(config, self, log)
+            except OSError as e:
+                log.error('Cannot start metrics endpoint: %s', e)
 
     def init_device_filtering(self, config):
         self.__device_filter_config = config  # noqa
@@ -444,6 +499,20 @@ class TBGatewayService:
                                               release=self.__updater.get_release(),
                                               logger=log) # noqa
 
+    def init_profiler(self, config):
+        self.__profiler_config = config or {} # noqa
+        if self.__profiler is not None:
+            self.__profiler.stop()
+            self.__profiler = None
+        if self.__profiler_config.get('enable', False):
+            self.__start_profiler()
+
+    def __start_profiler(self, config=None):
+        self.__profiler = TBSamplingProfiler({**self.__profiler_config, **(config or {})}, log)
+        self.__profiler.start()
+        log.info("Sampling profiler started with sampling interval %r ms",
+                 self.__profiler.sampling_interval * 1000)
+
     @property
     def event_storage_types(self):
         return self._event_storage_types
@@ -611,12 +680,18 @@ class TBGatewayService:
 
         if hasattr(self, "_TBGatewayService__statistics_service") and self.__statistics_service is not None:
             self.__statistics_service.stop()
+        if hasattr(self, "_TBGatewayService__metrics_endpoint") and self.__metrics_endpoint is not None:
+            self.__metrics_endpoint.stop()
+        if hasattr(self, "_TBGatewayService__profiler") and self.__profiler is not None:
+            self.__profiler.stop()
 
         if hasattr(self, "_TBGatewayService__grpc_manager") and self.__grpc_manager is not None:
             self.__grpc_manager.stop()
         if os.path.exists("/tmp/gateway"):
             os.remove("/tmp/gateway")
         self.__close_connectors()
+        if hasattr(self, "_report_strategy_service") and self._report_strategy_service is not None:
+            self._report_strategy_service.stop()
         if hasattr(self, "_event_storage") and self._event_storage is not None:
             self._event_storage.stop()
         log.info("The gateway has been stopped.")
@@ -1159,6 +1234,8 @@ class TBGatewayService:
             # else:
             #     filtered_data = data
             if isinstance(data, ConvertedData):
+                if LatencyStatistics.ENABLED:
+                    LatencyStatistics.start(data.metadata, connector_name)
                 if data.metadata and self.__latency_debug_mode:
                     data.add_to_metadata({SEND_TO_STORAGE_TS_PARAMETER: int(time() * 1000),
                                           CONNECTOR_PARAMETER: connector_name})
@@ -1200,6 +1277,9 @@ class TBGatewayService:
         converted_data_format = isinstance(event, ConvertedData)
         data_array = event if isinstance(event, list) else [event]
         if converted_data_format:
+            if LatencyStatistics.ENABLED:
+                LatencyStatistics.checkpoint(event.metadata.get(LATENCY_TIMESTAMPS_PARAMETER),
+                                             CONVERTED_DATA_QUEUE_STAGE)
             if self.__latency_debug_mode:
                 event.add_to_metadata({"getFromConvertedDataQueueTs": int(time() * 1000),
                                        "connector": connector_name})
@@ -1215,58 +1295,73 @@ class TBGatewayService:
         else:
             self.__send_to_storage_old_formatted_data(connector_name, connector_id, data_array)
 
+    def __get_connector_storage_context(self, connector_name, connector_id) -> ConnectorStorageContext:
+        context = self.__connectors_storage_contexts.get((connector_name, connector_id))
+        if context is None:
+            context = ConnectorStorageContext(connector_name, connector_id,
+                                              is_gateway=connector_name == self.name,
+                                              track_devices_activity=self.__check_devices_idle)
+            self.__connectors_storage_contexts[(connector_name, connector_id)] = context
+        return context
+
+    def __resolve_connector(self, context: ConnectorStorageContext):
+        connector = self.available_connectors_by_id.get(context.connector_id)
+        if connector is None:
+            connector = self.available_connectors_by_name.get(context.connector_name)
+        return connector
+
     def __send_to_storage_new_formatted_data(self, connector_name, connector_id, data_array: List[ConvertedData]):
+        context = self.__get_connector_storage_context(connector_name, connector_id)
+        latency_debug_mode = self.__latency_debug_mode
         max_data_size = self.get_max_payload_size_bytes()
-        pack_processing_time = 0
+        if latency_debug_mode:
+            max_data_size = max_data_size - DEBUG_METADATA_TEMPLATE_SIZE - len(connector_name)
         for data in data_array:
-            if not self.__latency_debug_mode:
-                data.metadata = {}
-            if connector_name == self.name:
+            if not latency_debug_mode:
+                latency_timestamps = data.metadata.get(LATENCY_TIMESTAMPS_PARAMETER) if data.metadata else None
+                data.metadata = {} if latency_timestamps is None else {LATENCY_TIMESTAMPS_PARAMETER: latency_timestamps}
+            if context.is_gateway:
                 data.device_name = "currentThingsBoardGateway"
                 data.device_type = "gateway"
-            else:
-                if not TBUtility.validate_converted_data(data):
-                    log.error("[%r] Data from %s connector is invalid.", connector_id, connector_name)
+                continue
+
+            if not TBUtility.validate_converted_data(data):
+                log.error("[%r] Data from %s connector is invalid.", connector_id, connector_name)
+                continue
+            renamed_device_name = self.__renamed_devices.get(data.device_name)
+            if renamed_device_name is not None:
+                data.device_name = renamed_device_name
+
+            device = self.__connected_devices.get(data.device_name)
+            if device is None and self.tb_client.is_connected():
+                connector = self.__resolve_connector(context)
+                if connector is None:
+                    log.trace("Connector %s is not available, probably it was disabled, skipping data...",
+                              connector_name)
                     continue
-                if data.device_name in self.__renamed_devices:
-                    data.device_name = self.__renamed_devices[data.device_name]
-                if self.tb_client.is_connected() and (data.device_name not in self.get_devices() or
-                                                      data.device_name not in self.__connected_devices):
-                    if self.available_connectors_by_id.get(connector_id) is not None:
-                        self.add_device(data.device_name,
-                                        {CONNECTOR_PARAMETER: self.available_connectors_by_id[connector_id]},
-                                        device_type=data.device_type)
-                    elif self.available_connectors_by_name.get(connector_name) is not None:
-                        self.add_device(data.device_name,
-                                        {CONNECTOR_PARAMETER: self.available_connectors_by_name[connector_name]},
-                                        device_type=data.device_type)
-                    else:
-                        log.trace("Connector %s is not available, probably it was disabled, skipping data...", connector_name)
-                        continue
+                self.add_device(data.device_name, {CONNECTOR_PARAMETER: connector}, device_type=data.device_type)
+                device = self.__connected_devices.get(data.device_name)
 
-                if not self.__connector_incoming_messages.get(connector_id):
-                    self.__connector_incoming_messages[connector_id] = 0
-                else:
-                    self.__connector_incoming_messages[connector_id] += 1
+            context.incoming_messages += 1
 
-                if hasattr(self, "__check_devices_idle") and self.__check_devices_idle:
-                    self.__connected_devices[data['deviceName']]['last_receiving_data'] = time()
+            if context.track_devices_activity and device is not None:
+                device['last_receiving_data'] = time()
 
-                adopted_data_max_entry_size = max_data_size - DEBUG_METADATA_TEMPLATE_SIZE - len(connector_name) \
-                    if self.__latency_debug_mode else max_data_size
+            if latency_debug_mode:
                 start_splitting = int(time() * 1000)
-                adopted_data: List[ConvertedData] = data.convert_to_objects_with_maximal_size(adopted_data_max_entry_size) # noqa
+                adopted_data: List[ConvertedData] = data.convert_to_objects_with_maximal_size(max_data_size)
                 end_splitting = int(time() * 1000)
-                if self.__latency_debug_mode:
-                    log.trace("Data splitting took %r ms, telemetry datapoints count: %r, attributes count: %r",
-                              end_splitting - start_splitting,
-                              data.telemetry_datapoints_count,
-                              data.attributes_datapoints_count)
-                if self.__latency_debug_mode and data.metadata.get("receivedTs"):
+                log.trace("Data splitting took %r ms, telemetry datapoints count: %r, attributes count: %r",
+                          end_splitting - start_splitting,
+                          data.telemetry_datapoints_count,
+                          data.attributes_datapoints_count)
+                if data.metadata.get("receivedTs"):
                     log.debug("Data processing before sending to storage took %r ms",
                               end_splitting - data.metadata.get("receivedTs", 0))
-                for adopted_data_entry in adopted_data:
-                    self.__send_data_pack_to_storage(adopted_data_entry, connector_name, connector_id)
+            else:
+                adopted_data: List[ConvertedData] = data.convert_to_objects_with_maximal_size(max_data_size)
+            for adopted_data_entry in adopted_data:
+                self.__send_data_pack_to_storage(adopted_data_entry, connector_name, connector_id)
 
     def __send_to_storage_old_formatted_data(self, connector_name, connector_id, data_array):
         max_data_size = self.get_max_payload_size_bytes()
@@ -1284,8 +1379,7 @@ class TBGatewayService:
                     data['deviceType'] = self.__get_device_type_for_device(device_name)
                 if data["deviceName"] in self.__renamed_devices:
                     data["deviceName"] = self.__renamed_devices[data["deviceName"]]
-                if self.tb_client.is_connected() and (data["deviceName"] not in self.get_devices() or
-                                                      data["deviceName"] not in self.__connected_devices):
+                if self.tb_client.is_connected() and data["deviceName"] not in self.__connected_devices:
                     if self.available_connectors_by_id.get(connector_id) is not None:
                         self.add_device(data["deviceName"],
                                         {CONNECTOR_PARAMETER: self.available_connectors_by_id[connector_id]},
@@ -1297,17 +1391,14 @@ class TBGatewayService:
                     else:
                         log.error("Connector %s is not available!", connector_name)
 
-                if not self.__connector_incoming_messages.get(connector_id):
-                    self.__connector_incoming_messages[connector_id] = 0
-                else:
-                    self.__connector_incoming_messages[connector_id] += 1
+                context = self.__get_connector_storage_context(connector_name, connector_id)
+                context.incoming_messages += 1
+                if context.track_devices_activity and data["deviceName"] in self.__connected_devices:
+                    self.__connected_devices[data["deviceName"]]['last_receiving_data'] = time()
             else:
                 data["deviceName"] = "currentThingsBoardGateway"
                 data['deviceType'] = "gateway"
 
-            if hasattr(self, "__check_devices_idle") and self.__check_devices_idle:
-                self.__connected_devices[data['deviceName']]['last_receiving_data'] = time()
-
             data = self.__convert_telemetry_to_ts(data)
             if TBUtility.get_data_size(data) >= max_data_size:
                 # Data is too large, so we will attempt to send in pieces
@@ -1396,9 +1487,15 @@ class TBGatewayService:
     @CollectStorageEventsStatistics('storageMsgPushed')
     def __send_data_pack_to_storage(self, data, connector_name, connector_id=None):
         if isinstance(data, ConvertedData):
+            # Split data shares the metadata, so only the first part carries the sampled latency timestamps
+            latency_timestamps = data.metadata.pop(LATENCY_TIMESTAMPS_PARAMETER, None) if data.metadata else None
             if self.__latency_debug_mode:
                 data.add_to_metadata({"putToStorageTs": int(time() * 1000)})
-            json_data = dumps(data.to_dict(self.__latency_debug_mode),
+            data_dict = data.to_dict(self.__latency_debug_mode)
+            if latency_timestamps is not None:
+                LatencyStatistics.checkpoint(latency_timestamps, STORAGE_FILL_STAGE)
+                data_dict[LATENCY_TIMESTAMPS_PARAMETER] = latency_timestamps
+            json_data = dumps(data_dict,
                               separators=(',', ':'),
                               skipkeys=True,
                               ignore_nan=True)
@@ -1439,6 +1536,7 @@ class TBGatewayService:
                   self.tb_client.client._client._max_queued_messages) # noqa pylint: disable=protected-access
         current_event_pack_data_size = 0
         logger_get_time = 0
+        latency_timestamps_in_pack = []
 
         while not self.stopped:
             try:
@@ -1462,6 +1560,8 @@ class TBGatewayService:
                         if self.__latency_debug_mode and events_len > 100:
                             log.debug("Retrieved %r events from the storage.", events_len)
                         start_pack_processing = time()
+                        latency_timestamps_in_pack = []
+                        self.__scheduled_pack_incomplete = False
                         for event in events:
                             try:
                                 current_event = loads(event)
@@ -1470,6 +1570,11 @@ class TBGatewayService:
                                           exc_info=e)
                                 continue
 
+                            latency_timestamps = current_event.pop(LATENCY_TIMESTAMPS_PARAMETER, None)
+                            if latency_timestamps is not None:
+                                LatencyStatistics.checkpoint(latency_timestamps, EVENT_STORAGE_STAGE)
+                                latency_timestamps_in_pack.append(latency_timestamps)
+
                             if not devices_data_in_event_pack.get(current_event["deviceName"]): # noqa
                                 devices_data_in_event_pack[current_event["deviceName"]] = {"telemetry": [],
                                                                                            "attributes": {}}
@@ -1532,15 +1637,25 @@ class TBGatewayService:
                                           pack_processing_time,
                                           average_event_processing_time_str) # noqa
 
+                            if latency_timestamps_in_pack:
+                                LatencyStatistics.checkpoint_all(latency_timestamps_in_pack, READ_PACK_STAGE)
                             self.__send_data(devices_data_in_event_pack) # noqa
+                            if latency_timestamps_in_pack:
+                                LatencyStatistics.checkpoint_all(latency_timestamps_in_pack, PUBLISH_STAGE)
                             current_event_pack_data_size = 0
 
                         if self.tb_client.is_connected() and (
                                 self.__remote_configurator is None or not self.__remote_configurator.in_process):
 
                             success = self.__handle_published_events()
+                            if self.__scheduled_pack_incomplete:
+                                # The pack was not sent completely, it will be read from the storage again
+                                success = False
 
                             if success and self.tb_client.is_connected():
+                                if latency_timestamps_in_pack:
+                                    LatencyStatistics.checkpoint_all(latency_timestamps_in_pack, ACK_STAGE)
+                                    latency_timestamps_in_pack = []
                                 self._event_storage.event_pack_processing_done()
                                 del devices_data_in_event_pack
                                 devices_data_in_event_pack = {}
@@ -1605,6 +1720,9 @@ class TBGatewayService:
     @CollectAllSentTBBytesStatistics(start_stat_type='allBytesSentToTB')
     def __send_data(self, devices_data_in_event_pack):
         try:
+            if self.__publish_coalescer is not None:
+                self.__send_coalesced_data(devices_data_in_event_pack)
+                return
             for device in devices_data_in_event_pack:
                 final_device_name = device if self.__renamed_devices.get(device) is None else self.__renamed_devices[
                     device]
@@ -1629,6 +1747,90 @@ class TBGatewayService:
         except Exception as e:
             log.error("Error while sending data to ThingsBoard, it will be resent.", exc_info=e)
 
+    def __send_coalesced_data(self, devices_data_in_event_pack):
+        devices_data = {}
+        for device, device_data in devices_data_in_event_pack.items():
+            if device == self.name or device == "currentThingsBoardGateway":
+                if device_data.get("attributes"):
+                    self._published_events.put(self.send_attributes(device_data["attributes"]))
+                if device_data.get("telemetry"):
+                    self._published_events.put(self.send_telemetry(device_data["telemetry"]))
+                continue
+            final_device_name = device if self.__renamed_devices.get(device) is None else self.__renamed_devices[
+                device]
+            devices_data[final_device_name] = device_data
+
+        devices_data_by_shard = self.__split_devices_data_by_uplink_shard(devices_data)
+        if self.__publish_scheduler_config is not None:
+            oversized_devices_data = self.__send_scheduled_data(devices_data_by_shard)
+        else:
+            oversized_devices_data = {}
+            for shard, shard_devices_data in devices_data_by_shard.items():
+                payloads, shard_oversized_devices_data = self.__publish_coalescer.coalesce(
+                    shard_devices_data, self.get_max_payload_size_bytes(),
+                    self.tb_client.get_max_datapoints_per_message())
+                for payload in payloads:
+                    self._published_events.put(self.publish_coalesced(payload, shard))
+                oversized_devices_data.update(shard_oversized_devices_data)
+
+        # Data of a device larger than a message is split by the client
+        for device, device_data in oversized_devices_data.items():
+            if device_data.get("attributes"):
+                self._published_events.put(self.gw_send_attributes(device, device_data["attributes"]))
+            if device_data.get("telemetry"):
+                self._published_events.put(self.gw_send_telemetry(device, device_data["telemetry"]))
+
+        for device in devices_data_in_event_pack:
+            devices_data_in_event_pack[device] = {"telemetry": [], "attributes": {}}
+
+    def __split_devices_data_by_uplink_shard(self, devices_data):
+        if self.tb_client.get_uplink_shards_count() == 1:
+            return {0: devices_data}
+        devices_data_by_shard = {}
+        for device, device_data in devices_data.items():
+            shard = self.tb_client.get_uplink_shard(device)
+            shard_devices_data = devices_data_by_shard.get(shard)
+            if shard_devices_data is None:
+                shard_devices_data = devices_data_by_shard[shard] = {}
+            shard_devices_data[device] = device_data
+        return devices_data_by_shard
+
+    def __send_scheduled_data(self, devices_data_by_shard):
+        for shard, shard_devices_data in devices_data_by_shard.items():
+            scheduler = self.__publish_schedulers.get(shard)
+            if scheduler is None:
+                scheduler = self.__publish_schedulers[shard] = PublishScheduler(self.__publish_coalescer,
+                                                                                self.__publish_scheduler_config)
+            scheduler.add(shard_devices_data)
+        max_payload_size = self.get_max_payload_size_bytes()
+        schedulers = [(shard, scheduler) for shard, scheduler in self.__publish_schedulers.items()
+                      if not scheduler.is_empty()]
+        while schedulers and not self.stopped and self.tb_client.is_connected():
+            wait_time = None
+            for shard, scheduler in schedulers:
+                payload = scheduler.poll(self.tb_client, max_payload_size)
+                if payload is None:
+                    wait_time = scheduler.get_wait_time() if wait_time is None else min(wait_time,
+                                                                                       scheduler.get_wait_time())
+                    continue
+                self._published_events.put(self.publish_coalesced(payload, shard))
+                wait_time = 0
+            if wait_time:
+                self.stop_event.wait(wait_time)
+            schedulers = [(shard, scheduler) for shard, scheduler in schedulers if not scheduler.is_empty()]
+
+        if any(not scheduler.is_empty() for scheduler in self.__publish_schedulers.values()):
+            # The pack is read from the storage again, so nothing left from it may be sent with the next read
+            for scheduler in self.__publish_schedulers.values():
+                scheduler.clear()
+            self.__scheduled_pack_incomplete = True
+            return {}
+
+        oversized_devices_data = {}
+        for scheduler in self.__publish_schedulers.values():
+            oversized_devices_data.update(scheduler.pop_oversized_devices_data())
+        return oversized_devices_data
+
     @CountMessage('msgsReceivedFromPlatform')
     def _rpc_request_handler(self, request_id, content):
         try:
@@ -1766,6 +1968,40 @@ class TBGatewayService:
             result = {"error": str(e), "code": 500}
         return result
 
+    def __rpc_profiler(self, *args):
+        """
+        Controls the sampling profiler, params: "start", "stop", "stacks", "dump" or a dict with "command"
+        and optionally "threadName" (for stacks) and sampling config overrides (for start).
+        Stacks are dumped only to the dumpFile from the gateway configuration, the file is not taken from the request.
+        """
+        log.debug("Profiler RPC request received with arguments %s", args)
+        params = args[0] if args else {}
+        if isinstance(params, str):
+            params = {"command": params}
+        command = params.get("command", "stacks")
+        profiler = self.__profiler
+
+        if command == "start":
+            if profiler is not None and profiler.is_alive():
+                return {"code": 200, "resp": "Profiler is already running"}
+            self.__start_profiler({key: value for key, value in params.items()
+                                   if key in PROFILER_RPC_CONFIG_OVERRIDES})
+            return {"code": 200, "resp": "Profiler started"}
+        if profiler is None:
+            return {"error": "Profiler is not started", "code": 400}
+        if command == "stop":
+            profiler.stop()
+            return {"code": 200, "resp": {"samples": profiler.samples_count,
+                                          "overheadPercent": round(profiler.overhead * 100, 3)}}
+        if command == "stacks":
+            return {"code": 200, "resp": profiler.get_collapsed_stacks(params.get("threadName"))}
+        if command == "dump":
+            dump_file = profiler.dump()
+            if dump_file is None:
+                return {"error": "Dump file is not configured or cannot be written", "code": 500}
+            return {"code": 200, "resp": dump_file}
+        return {"error": "Unknown profiler command %s" % command, "code": 400}
+
     def is_rpc_in_progress(self, topic):
         return topic in self.__rpc_requests_in_progress
 
@@ -2226,6 +2462,15 @@ class TBGatewayService:
                                                        telemetry,
                                                        quality_of_service=self.quality_of_service)
 
+    @CountMessage('msgsSentToPlatform')
+    def publish_coalesced(self, payload, shard=0):
+        if StatisticsService.ENABLED:
+            StatisticsService.add_count('platformCoalescedMsgPushed')
+            StatisticsService.add_count('platformCoalescedDevices', count=payload.devices_count)
+            StatisticsService.add_count('platformPublishedBytes', count=len(payload.payload))
+        compression = self.__publish_coalescer.compression if self.__publish_coalescer.is_compressed else None
+        return self.tb_client.publish_coalesced(payload, self.quality_of_service, compression, shard)
+
     @CountMessage('msgsSentToPlatform')
     def send_attributes(self, attributes, wait_for_publish=True):
         return self.tb_client.client.send_attributes(attributes,
@@ -2288,6 +2533,15 @@ class TBGatewayService:
     def get_converted_data_queue(self):
         return self.__converted_data_queue
 
+    def get_internal_queues_sizes(self):
+        return {'convertedData': self.__converted_data_queue.qsize(),
+                'publishedEvents': self._published_events.qsize(),
+                'rpcToDevices': self.__rpc_to_devices_queue.qsize(),
+                'rpcProcessing': self.__rpc_processing_queue.qsize()}
+
+    def get_rpc_requests_in_progress_count(self):
+        return len(self.__rpc_requests_in_progress)
+
     # ----------------------------
     # Storage --------------------
     def get_storage_name(self):
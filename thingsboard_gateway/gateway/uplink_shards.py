@@ -0,0 +1,111 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from bisect import bisect
+from hashlib import md5
+from logging import getLogger
+from typing import Callable, Union
+
+from paho.mqtt.client import Client, MQTTv5, CallbackAPIVersion
+
+VIRTUAL_NODES_PER_SHARD = 64
+
+
+def hash_key(key: str) -> int:
+    return int.from_bytes(md5(key.encode('utf-8'), usedforsecurity=False).digest()[:8], 'big')
+
+
+class ConsistentHashRing:
+    """
+    Maps keys (device names) to shards 0..shards_count - 1 by their positions on a hash ring.
+    A key is always mapped to the same shard, also after the gateway restart. When a shard is not available,
+    only its keys move to the next shards on the ring, the keys of other shards stay in place.
+    """
+
+    def __init__(self, shards_count: int, virtual_nodes: int = VIRTUAL_NODES_PER_SHARD):
+        ring = sorted((hash_key('shard-%i-%i' % (shard, virtual_node)), shard)
+                      for shard in range(shards_count)
+                      for virtual_node in range(virtual_nodes))
+        self.__positions = [position for position, _ in ring]
+        self.__shards = [shard for _, shard in ring]
+
+    def get_shard(self, key: str, is_available: Callable[[int], bool] = None) -> Union[int, None]:
+        ring_size = len(self.__shards)
+        index = bisect(self.__positions, hash_key(key)) % ring_size
+        if is_available is None:
+            return self.__shards[index]
+        checked_shards = set()
+        for offset in range(ring_size):
+            shard = self.__shards[(index + offset) % ring_size]
+            if shard in checked_shards:
+                continue
+            if is_available(shard):
+                return shard
+            checked_shards.add(shard)
+        return None
+
+
+class UplinkShard:
+    """
+    Additional connection of the gateway to the platform, used only to publish data of the devices assigned to it.
+    Connects with the gateway credentials, the protocol version of the main connection and own client id,
+    the number of messages waiting for acknowledgement on the connection is limited by max_inflight_messages.
+    Reconnects are handled by the paho network loop.
+    """
+
+    def __init__(self, index, client_id, username, password, max_inflight_messages, logger=None, protocol=MQTTv5):
+        self.index = index
+        self.__log = logger or getLogger('tb_connection')
+        self.__client = Client(callback_api_version=CallbackAPIVersion.VERSION2, client_id=client_id,
+                               protocol=protocol)
+        if username is not None:
+            self.__client.username_pw_set(username, password)
+        self.__client.max_inflight_messages_set(max_inflight_messages)
+        self.__client.on_connect = self.__on_connect
+        self.__client.on_disconnect = self.__on_disconnect
+        self.__started = False
+
+    def start(self, host, port, keepalive, ssl_context=None, tls_insecure=False, proxy=None):
+        if self.__started:
+            return
+        self.__started = True
+        if ssl_context is not None:
+            self.__client.tls_set_context(ssl_context)
+            self.__client.tls_insecure_set(tls_insecure)
+        if proxy:
+            self.__client.proxy_set(**proxy)
+        self.__client.connect_async(host, port, keepalive=keepalive)
+        self.__client.loop_start()
+
+    def stop(self):
+        if not self.__started:
+            return
+        self.__started = False
+        self.__client.disconnect()
+        self.__client.loop_stop()
+
+    def is_connected(self):
+        return self.__client.is_connected()
+
+    def publish(self, topic, payload, qos):
+        return self.__client.publish(topic, payload, qos=qos)
+
+    def __on_connect(self, client, userdata, flags, reason_code, properties):
+        if reason_code == 0:
+            self.__log.info("Uplink shard %i connected to platform", self.index)
+        else:
+            self.__log.error("Uplink shard %i connection failed: %s", self.index, reason_code)
+
+    def __on_disconnect(self, client, userdata, flags, reason_code, properties):
+        self.__log.info("Uplink shard %i disconnected from platform: %s", self.index, reason_code)
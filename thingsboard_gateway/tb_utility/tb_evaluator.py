@@ -0,0 +1,132 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import ast
+from typing import Optional
+
+MAX_RESULT_BITS = 65536
+MAX_SEQUENCE_LENGTH = 1048576
+
+
+def _safe_pow(base, exponent, modulo=None):
+    if modulo is None and isinstance(base, int) and isinstance(exponent, int) and exponent > 0 \
+            and base.bit_length() * exponent > MAX_RESULT_BITS:
+        raise ValueError("Result of %r ** %r is too large" % (base, exponent))
+    return pow(base, exponent, modulo)
+
+
+def _safe_lshift(value, shift):
+    if isinstance(shift, int) and shift > MAX_RESULT_BITS:
+        raise ValueError("Result of %r << %r is too large" % (value, shift))
+    return value << shift
+
+
+def _safe_mul(left, right):
+    if isinstance(left, int) and hasattr(right, '__len__'):
+        left, right = right, left
+    if hasattr(left, '__len__') and isinstance(right, int) and len(left) * right > MAX_SEQUENCE_LENGTH:
+        raise ValueError("Result of sequence multiplication is too large")
+    return left * right
+
+
+GUARDED_OPERATORS = {
+    ast.Pow: ('__tb_pow', _safe_pow),
+    ast.LShift: ('__tb_lshift', _safe_lshift),
+    ast.Mult: ('__tb_mul', _safe_mul)
+}
+
+ALLOWED_NODES = (
+    ast.Expression, ast.Constant, ast.Name, ast.Load, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.IfExp,
+    ast.Subscript, ast.Slice, ast.Tuple, ast.List, ast.Call, ast.keyword,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.LShift, ast.RShift,
+    ast.BitOr, ast.BitXor, ast.BitAnd, ast.Invert, ast.Not, ast.UAdd, ast.USub, ast.And, ast.Or,
+    ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.In, ast.NotIn, ast.Is, ast.IsNot
+)
+
+
+class CompiledExpression:
+    __slots__ = ['source', 'code', 'global_namespace', 'error']
+
+    def __init__(self, source, code=None, global_namespace=None, error: Optional[str] = None):
+        self.source = source
+        self.code = code
+        self.global_namespace = global_namespace
+        self.error = error
+
+    def evaluate(self, local_namespace: Optional[dict] = None):
+        if self.code is None:
+            raise ValueError(self.error)
+        return eval(self.code, self.global_namespace, local_namespace if local_namespace is not None else {}) # noqa
+
+    def __repr__(self):
+        return 'CompiledExpression(%r)' % self.source
+
+
+class TBEvaluator:
+    """
+    Compiles expressions, so owners of configurations compile them once and evaluate the compiled code
+    for every message. There is no shared cache, expressions built from message content are compiled every time.
+    Safe expressions may use only literals, variables, arithmetic, bit, comparison and boolean operators,
+    conditional expressions, subscripts and, unless disabled, calls of SAFE_FUNCTIONS.
+    Attribute access, comprehensions, lambdas and names starting with "__" are rejected,
+    "**", "<<" and sequence "*" refuse too large results.
+    Trusted expressions are full Python expressions evaluated with the given globals, like eval() does.
+    """
+
+    SAFE_FUNCTIONS = {
+        "abs": abs, "bool": bool, "float": float, "int": int, "str": str, "len": len, "min": min, "max": max,
+        "pow": _safe_pow, "round": round, "sum": sum, "hex": hex, "bin": bin, "ord": ord, "chr": chr
+    }
+
+    @classmethod
+    def compile_safe(cls, source: str, allow_functions: bool = True) -> CompiledExpression:
+        functions = cls.SAFE_FUNCTIONS if allow_functions else {}
+        global_namespace = {"__builtins__": {}, **functions}
+        global_namespace.update(guarded_operator for guarded_operator in GUARDED_OPERATORS.values())
+        try:
+            tree = ast.parse(source, mode='eval')
+            cls.__validate(tree, functions)
+            tree = ast.fix_missing_locations(_GuardedOperatorsTransformer().visit(tree))
+            return CompiledExpression(source, compile(tree, '<expression>', 'eval'), global_namespace)
+        except (SyntaxError, ValueError, TypeError) as e:
+            return CompiledExpression(source, error="Invalid expression %r: %s" % (source, e))
+
+    @staticmethod
+    def compile_trusted(source: str, global_namespace: dict) -> CompiledExpression:
+        try:
+            return CompiledExpression(source, compile(source, '<expression>', 'eval'), global_namespace)
+        except (SyntaxError, ValueError, TypeError) as e:
+            return CompiledExpression(source, error="Invalid expression %r: %s" % (source, e))
+
+    @staticmethod
+    def __validate(tree, functions):
+        for node in ast.walk(tree):
+            if not isinstance(node, ALLOWED_NODES):
+                raise ValueError("%s is not allowed" % type(node).__name__)
+            if isinstance(node, ast.Name) and node.id.startswith('__'):
+                raise ValueError("name %r is not allowed" % node.id)
+            if isinstance(node, ast.Call) and (not isinstance(node.func, ast.Name) or node.func.id not in functions):
+                raise ValueError("call of %s is not allowed" % ast.unparse(node.func))
+            if isinstance(node, ast.keyword) and node.arg is None:
+                raise ValueError("keyword arguments unpacking is not allowed")
+
+
+class _GuardedOperatorsTransformer(ast.NodeTransformer):
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        guarded_operator = GUARDED_OPERATORS.get(type(node.op))
+        if guarded_operator is None:
+            return node
+        return ast.copy_location(ast.Call(func=ast.Name(id=guarded_operator[0], ctx=ast.Load()),
+                                          args=[node.left, node.right], keywords=[]), node)
@@ -0,0 +1,141 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from re import compile as compile_regex
+from typing import Dict, Iterable, Optional, Tuple
+
+from jsonpath_rw import parse
+from jsonpath_rw.jsonpath import Child, Fields
+from orjson import loads
+
+from thingsboard_gateway.tb_utility.tb_utility import TBUtility
+
+TAG_PATTERN = compile_regex(r'\$\{([${A-Za-z0-9. ^\]\[*_:"-]*)\}')
+
+
+class TBExpression:
+    """
+    Expression with "${...}" tags, parsed once and evaluated against many messages.
+    The literal prefix, suffix and parts between the tags are kept as is, every tag is resolved
+    by dict indexing when it is a plain key or a path of plain keys, and by a jsonpath compiled
+    together with the expression otherwise.
+    Rendering gives the same result as replacing the tags from TBUtility.get_values(..., get_tag=True)
+    with the values from TBUtility.get_values(...) in the expression.
+    """
+
+    __slots__ = ['expression', 'tags', 'prefix', 'suffix', 'is_template', 'is_single_tag', '_segments', '_lookups']
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        parts = TAG_PATTERN.split(expression) if '${' in expression and '}' in expression else [expression]
+        self.tags: Tuple[str, ...] = tuple(parts[1::2])
+        self.is_template = bool(self.tags)
+        self.prefix = parts[0]
+        self.suffix = parts[-1]
+        self.is_single_tag = len(self.tags) == 1 and not self.prefix and not self.suffix
+        self._segments: Tuple[str, ...] = tuple(parts[2:-1:2])
+        self._lookups: Tuple[_TagLookup, ...] = tuple(_TagLookup(tag) for tag in self.tags)
+
+    @classmethod
+    def compile_all(cls, expressions: Iterable[Optional[str]]) -> Dict[str, 'TBExpression']:
+        """
+        Compiles expressions from the converter configuration, values that are not strings are skipped.
+        The result is kept by the converter, so expressions live as long as the configuration they come from.
+        """
+        return {expression: cls(expression) for expression in expressions if isinstance(expression, str)}
+
+    def render(self, body, expression_instead_none=False) -> str:
+        if not self.is_template:
+            return self.expression
+        if isinstance(body, str):
+            body = loads(body)
+
+        lookups = self._lookups
+        if len(lookups) == 1:
+            return self.prefix + str(lookups[0].evaluate(body, expression_instead_none)) + self.suffix
+
+        result = [self.prefix, str(lookups[0].evaluate(body, expression_instead_none))]
+        for segment, lookup in zip(self._segments, lookups[1:]):
+            result.append(segment)
+            result.append(str(lookup.evaluate(body, expression_instead_none)))
+        result.append(self.suffix)
+        return ''.join(result)
+
+    def evaluate(self, body, expression_instead_none=False):
+        """Value of the only tag of a single tag expression, not converted to a string."""
+        if isinstance(body, str):
+            body = loads(body)
+        return self._lookups[0].evaluate(body, expression_instead_none)
+
+    def __repr__(self):
+        return 'TBExpression(%r)' % self.expression
+
+
+class _TagLookup:
+    __slots__ = ['tag_expression', 'key', 'path', 'jsonpath']
+
+    def __init__(self, tag: str):
+        self.tag_expression = '${' + tag + '}'
+        words = tag.split()
+        self.key: Optional[str] = words[0] if words else None
+        self.path: Optional[Tuple[str, ...]] = None
+        self.jsonpath = None
+        if self.key is None:
+            return
+
+        if " " in tag:
+            tag = '.'.join('"' + section_key + '"' if " " in section_key else section_key
+                           for section_key in tag.split('.'))
+        try:
+            self.jsonpath = parse(tag)
+        except Exception:
+            # Resolved by TBUtility.get_value, to keep its error reporting
+            return
+        self.path = self.__get_fields_path(self.jsonpath)
+
+    def evaluate(self, body, expression_instead_none):
+        if self.jsonpath is None or not isinstance(body, (dict, list)):
+            return TBUtility.get_value(self.tag_expression, body, expression_instead_none=expression_instead_none)
+
+        value = None
+        if isinstance(body, dict) and self.key in body:
+            value = body[self.key]
+        elif self.path is not None:
+            value = body
+            for field in self.path:
+                if not isinstance(value, dict) or field not in value:
+                    value = None
+                    break
+                value = value[field]
+        else:
+            jsonpath_match = self.jsonpath.find(body)
+            if jsonpath_match:
+                value = jsonpath_match[0].value
+
+        if value is None and expression_instead_none:
+            return self.tag_expression
+        return value
+
+    @staticmethod
+    def __get_fields_path(jsonpath) -> Optional[Tuple[str, ...]]:
+        if type(jsonpath) is Fields:
+            if len(jsonpath.fields) == 1 and jsonpath.fields[0] != '*':
+                return jsonpath.fields
+            return None
+        if type(jsonpath) is Child:
+            left_path = _TagLookup.__get_fields_path(jsonpath.left)
+            right_path = _TagLookup.__get_fields_path(jsonpath.right)
+            if left_path is not None and right_path is not None:
+                return left_path + right_path
+        return None
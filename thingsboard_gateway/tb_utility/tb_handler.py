@@ -87,6 +87,8 @@ class TBRemoteLoggerHandler(logging.Handler):
                     sleep(1)
                     continue
                 logs_for_sending_list = []
+                # Size of the serialized list: brackets, messages and commas between them
+                logs_for_sending_size = 2
                 log_msg = self._logs_queue.get_nowait()
 
                 count = 1
@@ -104,11 +106,14 @@ class TBRemoteLoggerHandler(logging.Handler):
                             print(log_msg)
                             continue
 
-                        if TBUtility.get_data_size(logs_for_sending_list) + logs_msg_size > self.__gateway.get_max_payload_size_bytes(): # noqa
+                        separator_size = 1 if logs_for_sending_list else 0
+                        if logs_for_sending_size + separator_size + logs_msg_size > self.__gateway.get_max_payload_size_bytes(): # noqa
                             self.__gateway.send_telemetry(logs_for_sending_list)
                             logs_for_sending_list = [log_msg]
+                            logs_for_sending_size = logs_msg_size + 2
                         else:
                             logs_for_sending_list.append(log_msg)
+                            logs_for_sending_size += separator_size + logs_msg_size
                         log_msg = None
                         count += 1
                     except Empty:
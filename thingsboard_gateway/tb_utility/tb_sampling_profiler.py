@@ -0,0 +1,160 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from logging import getLogger
+from os import makedirs, path, replace
+from sys import _current_frames  # noqa
+from threading import Event, Lock, Thread, enumerate as enumerate_threads, get_ident
+from time import monotonic, perf_counter
+from typing import Dict, Optional, Tuple
+
+TRUNCATED_STACK = ("[truncated]",)
+
+DEFAULT_PROFILER_CONFIG = {
+    "enable": False,
+    "samplingIntervalMs": 10,
+    "maxOverheadPercent": 1,
+    "maxStackDepth": 64,
+    "maxStacks": 10000,
+    "dumpFile": None,
+    "dumpPeriodInSeconds": 60
+}
+
+# Config parameters which may be changed when the profiler is started by the platform RPC,
+# the dump file is taken only from the gateway configuration
+PROFILER_RPC_CONFIG_OVERRIDES = ("samplingIntervalMs", "maxOverheadPercent", "maxStackDepth", "maxStacks",
+                                 "dumpPeriodInSeconds")
+
+
+class TBSamplingProfiler(Thread):
+    """
+    Sampling profiler for the gateway process. Stacks of all threads are taken with sys._current_frames
+    every samplingIntervalMs and counted per thread name in the collapsed stack format
+    ("thread;outer_function (file);...;inner_function (file) count"), which is the input of flamegraph tools.
+    The sampling pause is extended when a sample takes longer than maxOverheadPercent of the interval,
+    so the overhead stays bounded for any count of threads.
+    """
+
+    MAX_CACHED_FRAME_NAMES = 10000
+
+    def __init__(self, config: Optional[dict] = None, logger=None):
+        super().__init__(name="Sampling Profiler", daemon=True)
+        config = {**DEFAULT_PROFILER_CONFIG, **(config or {})}
+        self._log = logger if logger is not None else getLogger("service")
+        self.sampling_interval = max(float(config["samplingIntervalMs"]), .1) / 1000
+        self.max_overhead = max(float(config["maxOverheadPercent"]), .01) / 100
+        self.max_stack_depth = int(config["maxStackDepth"])
+        self.max_stacks = int(config["maxStacks"])
+        self.dump_file = config["dumpFile"]
+        self.dump_period = config["dumpPeriodInSeconds"]
+        self.samples_count = 0
+        self.sampling_time = 0.0
+        self.__stopped = Event()
+        self.__lock = Lock()
+        self.__stacks: Dict[Tuple[str, ...], int] = {}
+        self.__frame_names = {}
+        self.__started_at = None
+        self.__stopped_at = None
+
+    @property
+    def overhead(self) -> float:
+        """Part of the profiling time spent on sampling."""
+        if self.__started_at is None:
+            return 0.0
+        elapsed = (self.__stopped_at or perf_counter()) - self.__started_at
+        return self.sampling_time / elapsed if elapsed > 0 else 0.0
+
+    def stop(self):
+        self.__stopped.set()
+
+    def run(self):
+        self.__started_at = perf_counter()
+        last_dump_time = monotonic()
+        while not self.__stopped.is_set():
+            sample_started_at = perf_counter()
+            self.take_sample()
+            sample_duration = perf_counter() - sample_started_at
+            self.sampling_time += sample_duration
+            if self.dump_file and monotonic() - last_dump_time >= self.dump_period:
+                last_dump_time = monotonic()
+                self.dump()
+            self.__stopped.wait(max(self.sampling_interval, sample_duration / self.max_overhead - sample_duration))
+        self.__stopped_at = perf_counter()
+        if self.dump_file:
+            self.dump()
+
+    def take_sample(self):
+        own_thread_id = get_ident()
+        thread_names = {thread.ident: thread.name for thread in enumerate_threads()}
+        frame_names = self.__frame_names
+        if len(frame_names) >= self.MAX_CACHED_FRAME_NAMES:
+            frame_names.clear()
+        samples = []
+        frame = None
+        for thread_id, frame in _current_frames().items():
+            if thread_id == own_thread_id:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_stack_depth:
+                code = frame.f_code
+                frame_name = frame_names.get(code)
+                if frame_name is None:
+                    frame_name = frame_names[code] = "%s (%s)" % (code.co_name, path.basename(code.co_filename))
+                stack.append(frame_name)
+                frame = frame.f_back
+            stack.append(thread_names.get(thread_id, "Thread-%s" % thread_id).replace(";", ":"))
+            stack.reverse()
+            samples.append(tuple(stack))
+        del frame
+
+        with self.__lock:
+            stacks = self.__stacks
+            for stack in samples:
+                if stack not in stacks and len(stacks) >= self.max_stacks:
+                    stack = (stack[0],) + TRUNCATED_STACK
+                stacks[stack] = stacks.get(stack, 0) + 1
+            self.samples_count += 1
+
+    def get_collapsed_stacks(self, thread_name: Optional[str] = None) -> str:
+        with self.__lock:
+            stacks = sorted(self.__stacks.items())
+        return "".join("%s %i\n" % (";".join(stack), count)
+                       for stack, count in stacks if thread_name is None or stack[0] == thread_name)
+
+    def get_thread_samples_count(self) -> Dict[str, int]:
+        counts = {}
+        with self.__lock:
+            for stack, count in self.__stacks.items():
+                counts[stack[0]] = counts.get(stack[0], 0) + count
+        return counts
+
+    def clear(self):
+        with self.__lock:
+            self.__stacks = {}
+
+    def dump(self, file_path: Optional[str] = None) -> Optional[str]:
+        file_path = file_path or self.dump_file
+        if not file_path:
+            return None
+        try:
+            directory = path.dirname(path.abspath(file_path))
+            makedirs(directory, exist_ok=True)
+            temporary_file_path = file_path + ".tmp"
+            with open(temporary_file_path, "w") as file:
+                file.write(self.get_collapsed_stacks())
+            replace(temporary_file_path, file_path)
+            return file_path
+        except OSError as e:
+            self._log.error("Cannot dump profiler stacks to %s: %s", file_path, e)
+            return None
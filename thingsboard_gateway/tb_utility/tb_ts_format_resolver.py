@@ -0,0 +1,180 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from datetime import datetime
+from re import compile as compile_regex, escape
+from typing import Callable, Optional
+
+from dateutil import parser
+
+DATE_PATTERNS = ("%Y-%m-%d", "%Y/%m/%d", "%Y.%m.%d", "%d.%m.%Y", "%m.%d.%Y", "%d/%m/%Y", "%m/%d/%Y", "%d-%m-%Y",
+                 "%m-%d-%Y", "%d.%m.%y", "%m.%d.%y", "%d/%m/%y", "%m/%d/%y", "%d-%m-%y", "%m-%d-%y", "%y-%m-%d",
+                 "%y/%m/%d", "%y.%m.%d")
+TIME_PATTERNS = ("", " %H:%M", " %H:%M:%S", " %H:%M:%S.%f", "T%H:%M", "T%H:%M:%S", "T%H:%M:%S.%f")
+PATTERN_DIRECTIVES = {
+    "Y": r"(?P<Y>\d{4})", "y": r"(?P<y>\d{2})", "m": r"(?P<m>\d{1,2})", "d": r"(?P<d>\d{1,2})",
+    "H": r"(?P<H>\d{1,2})", "M": r"(?P<M>\d{2})", "S": r"(?P<S>\d{2})", "f": r"(?P<f>\d{1,6})"
+}
+# Values on both sides of the ambiguity boundaries dateutil uses to tell days, months and years apart
+PROBE_DATETIMES = tuple(datetime(year, month, day, 9, 5, 7, 123000)
+                        for year in (2003, 2020, 2045, 1999) for month in (2, 11) for day in (1, 13, 28))
+TS_FIELD_TAG_PATTERN = compile_regex(r'\${(?:(.*))}')
+EPOCH_SECONDS_LIMIT = 10 ** 11
+EPOCH_MILLISECONDS_LIMIT = 10 ** 14
+EPOCH_MICROSECONDS_LIMIT = 10 ** 17
+
+
+class PatternTsFormat:
+    """strptime-like pattern, compiled to a regular expression that builds the datetime directly."""
+
+    __slots__ = ['pattern', '_regex']
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        regex = ''
+        position = 0
+        while position < len(pattern):
+            if pattern[position] == '%':
+                regex += PATTERN_DIRECTIVES[pattern[position + 1]]
+                position += 2
+            else:
+                regex += escape(pattern[position])
+                position += 1
+        self._regex = compile_regex(regex)
+
+    def __call__(self, value: str) -> datetime:
+        match = self._regex.fullmatch(value)
+        if match is None:
+            raise ValueError("%r does not match %r" % (value, self.pattern))
+        fields = match.groupdict()
+        if fields.get('Y') is not None:
+            year = int(fields['Y'])
+        else:
+            year = self.convert_two_digit_year(int(fields['y']))
+        fraction = fields.get('f')
+        return datetime(year, int(fields['m']), int(fields['d']), int(fields.get('H') or 0),
+                        int(fields.get('M') or 0), int(fields.get('S') or 0),
+                        int(fraction.ljust(6, '0')) if fraction else 0)
+
+    @staticmethod
+    def convert_two_digit_year(year: int) -> int:
+        # The same century choice as dateutil makes
+        current_year = datetime.now().year
+        year += current_year // 100 * 100
+        if year >= current_year + 50:
+            year -= 100
+        elif year < current_year - 50:
+            year += 100
+        return year
+
+    def __repr__(self):
+        return 'PatternTsFormat(%r)' % self.pattern
+
+
+PATTERN_TS_FORMATS = tuple(PatternTsFormat(date_pattern + time_pattern)
+                           for date_pattern in DATE_PATTERNS for time_pattern in TIME_PATTERNS)
+
+
+class TBTsFormatResolver:
+    """
+    Converts values of the configured tsField to milliseconds.
+    Numbers are treated as an epoch in seconds, milliseconds, microseconds or nanoseconds, depending on
+    their magnitude. For strings the format is inferred on the first value that dateutil parses: ISO 8601
+    or one of PATTERN_TS_FORMATS, accepted only when it gives the same datetime as dateutil.
+    Next values are parsed with the inferred format, dateutil is used again only if the value does not match.
+    The inferred format is kept by the resolver, so it is created once for the key configuration by its converter.
+    """
+
+    MAX_INFERENCE_ATTEMPTS = 3
+
+    __slots__ = ['ts_field_key', 'dayfirst', 'yearfirst', '_ts_format', '_inference_attempts']
+
+    def __init__(self, ts_field_key: str, dayfirst: bool = False, yearfirst: bool = False, infer_format: bool = True):
+        self.ts_field_key = ts_field_key
+        self.dayfirst = dayfirst
+        self.yearfirst = yearfirst
+        self._ts_format: Optional[Callable[[str], datetime]] = None
+        # Inference pays off only for a resolver used for many values
+        self._inference_attempts = 0 if infer_format else self.MAX_INFERENCE_ATTEMPTS
+
+    @classmethod
+    def from_config(cls, config: dict, infer_format: bool = True) -> Optional['TBTsFormatResolver']:
+        """Creates the resolver for the tsField of the key configuration, None if it is not configured."""
+        ts_field_expression = config.get('tsField')
+        if not isinstance(ts_field_expression, str):
+            return None
+        ts_field_tag = TS_FIELD_TAG_PATTERN.search(ts_field_expression)
+        return cls(ts_field_tag.group(1) if ts_field_tag is not None else ts_field_expression,
+                   config.get('dayfirst', False), config.get('yearfirst', False), infer_format)
+
+    @property
+    def ts_format(self):
+        return self._ts_format
+
+    def to_milliseconds(self, value) -> int:
+        if isinstance(value, str):
+            if self._ts_format is not None:
+                try:
+                    return int(self._ts_format(value).timestamp() * 1000)
+                except (ValueError, TypeError, OverflowError):
+                    pass
+            parsed_value = parser.parse(value, dayfirst=self.dayfirst, yearfirst=self.yearfirst)
+            if self._inference_attempts < self.MAX_INFERENCE_ATTEMPTS:
+                self._inference_attempts += 1
+                self._ts_format = self.__infer_format(value, parsed_value)
+            return int(parsed_value.timestamp() * 1000)
+
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            magnitude = abs(value)
+            if magnitude < EPOCH_SECONDS_LIMIT:
+                return int(value * 1000)
+            if magnitude < EPOCH_MILLISECONDS_LIMIT:
+                return int(value)
+            if magnitude < EPOCH_MICROSECONDS_LIMIT:
+                return int(value // 1000)
+            return int(value // 1000000)
+
+        parsed_value = parser.parse(value, dayfirst=self.dayfirst, yearfirst=self.yearfirst)
+        return int(parsed_value.timestamp() * 1000)
+
+    def __infer_format(self, value: str, parsed_value: datetime) -> Optional[Callable[[str], datetime]]:
+        if not self.dayfirst:
+            # With dayfirst dateutil swaps month and day of ISO dates too, when the day is not greater than 12
+            try:
+                if datetime.fromisoformat(value) == parsed_value:
+                    return datetime.fromisoformat
+            except ValueError:
+                pass
+        if parsed_value.tzinfo is not None:
+            return None
+        for ts_format in PATTERN_TS_FORMATS:
+            try:
+                if ts_format(value) != parsed_value:
+                    continue
+            except ValueError:
+                continue
+            if self.__agrees_with_dateutil(ts_format):
+                return ts_format
+        return None
+
+    def __agrees_with_dateutil(self, ts_format: PatternTsFormat) -> bool:
+        for probe_datetime in PROBE_DATETIMES:
+            probe_value = probe_datetime.strftime(ts_format.pattern)
+            try:
+                if ts_format(probe_value) != parser.parse(probe_value, dayfirst=self.dayfirst,
+                                                          yearfirst=self.yearfirst):
+                    return False
+            except (ValueError, OverflowError):
+                return False
+        return True
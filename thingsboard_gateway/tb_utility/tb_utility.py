@@ -19,7 +19,7 @@ from os import environ
 from platform import system as platform_system
 from re import search, findall
 from time import monotonic, sleep
-from typing import Union, TYPE_CHECKING
+from typing import Optional, Union, TYPE_CHECKING
 from uuid import uuid4
 
 from cachetools import TTLCache
@@ -27,14 +27,15 @@ from cryptography import x509
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.x509.oid import NameOID
-from dateutil import parser
 from jsonpath_rw import parse
 from orjson import JSONDecodeError, dumps, loads, OPT_NON_STR_KEYS
 
 from thingsboard_gateway.gateway.constants import SECURITY_VAR, REPORT_STRATEGY_PARAMETER
 from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
 from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
+from thingsboard_gateway.tb_utility.tb_evaluator import TBEvaluator
 from thingsboard_gateway.tb_utility.tb_logger import TbLogger
+from thingsboard_gateway.tb_utility.tb_ts_format_resolver import TBTsFormatResolver
 
 if TYPE_CHECKING:
     from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
@@ -79,7 +80,7 @@ class TBUtility:
         if isinstance(data, ConvertedData):
             if data.device_name is None:
                 errors.append('deviceName is empty')
-            if not data.telemetry and not data.attributes:
+            if not data.telemetry_datapoints_count and not data.telemetry and not data.attributes:
                 errors.append('No telemetry and attributes')
         else:
             if not data.get('deviceName'):
@@ -227,7 +228,7 @@ class TBUtility:
         if current_type.__name__ in new_type:
             return data
 
-        evaluated_data = eval(data, globals(), {}) if use_eval else data
+        evaluated_data = TBEvaluator.compile_safe(data).evaluate() if use_eval else data
         try:
             if 'int' in new_type or 'long' in new_type:
                 return int(float(evaluated_data))
@@ -251,7 +252,7 @@ class TBUtility:
             except ValueError:
                 if logger is not None:
                     logger.trace("Report strategy config is not specified for key %s", key)
-        return DatapointKey(key, key_report_strategy)
+        return DatapointKey.intern(key, key_report_strategy)
 
     # Service methods
 
@@ -366,19 +367,24 @@ class TBUtility:
         return config
 
     @staticmethod
-    def resolve_different_ts_formats(data: dict, config: dict, logger, default_ts: bool = True):
+    def resolve_different_ts_formats(data: dict, config: dict, logger, default_ts: bool = True,
+                                     ts_format_resolver: Optional[TBTsFormatResolver] = None):
+        """
+        ts_format_resolver is the resolver the converter keeps for the key configuration,
+        without it the value is parsed without the format inference.
+        """
         ts_field_expression = config.get('tsField')
         if ts_field_expression is not None:
             ts_field_key = None
             try:
-                ts_field_key = TBUtility.get_value(ts_field_expression, data, get_tag=True)
+                if ts_format_resolver is None:
+                    ts_format_resolver = TBTsFormatResolver.from_config(config, infer_format=False)
+                ts_field_key = ts_format_resolver.ts_field_key
 
-                if data.get(ts_field_key) is not None:
-                    parsed_configuration_data = parser.parse(data[ts_field_key], dayfirst=config.get('dayfirst', False), yearfirst=config.get('yearfirst', False))
-                    return int(parsed_configuration_data.timestamp() * 1000)
+                ts_value = data.get(ts_field_key)
+                if ts_value is not None:
+                    return ts_format_resolver.to_milliseconds(ts_value)
                 return data.get(ts_field_expression)
-
-
             except Exception as e:
                 logger.debug("Error while parsing timestamp %s: %s with configured tsField: %s",
                              ts_field_key, e, config['tsField'])